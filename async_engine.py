@@ -0,0 +1,442 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import aiohttp
+except ImportError: # Dependency opsional, hanya untuk engine asyncio
+    aiohttp = None
+
+from checksum import ChecksumMismatch, hash_file, new_hasher
+from engine import (DownloadEngine, DownloadJob, raise_segment_errors, RESOLVE_LOOKAHEAD, SIDECAR_SAVE_INTERVAL,
+                    PROGRESS_INTERVAL, CHECKSUM_MISMATCH, URL_EXPIRED)
+from extractor import PageScanner, READ_CHUNK_SIZE
+from jobstore import RESOLVING
+from metrics import JobMetrics
+from resume import (PART_SUFFIX, RESUME_SUFFIX, load_resume_info, save_resume_info, save_segment_progress,
+                    segmented_resume, resume_headers, segment_headers, part_complete, parse_resume_response)
+from transport import (HEADERS, FILE_HEADERS, DEFAULT_TIMEOUT, RETRY_STATUSES, MAX_RETRIES, PER_HOST_LIMIT,
+                       RangeNotSupported, RequestStats, backoff_delay)
+from writer import READ_SIZE_MAX, preallocate
+
+ASYNC_MAX_WORKERS = 64 # Batas download bersamaan untuk engine asyncio
+WRITE_THREADS = 4 # Thread untuk menulis (dan meng-hash) ke disk agar event loop tidak terblokir
+# Setara STALL_ERRORS: koneksi file macet/putus, resolve ulang lalu lanjutkan
+ASYNC_STALL_ERRORS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) if aiohttp else ()
+
+
+class DownloadCancelled(Exception):
+    """Stop/Skip di dalam coroutine (StopIteration tidak boleh dilempar dari coroutine)."""
+
+
+class AsyncDownloadEngine(DownloadEngine):
+    """DownloadEngine dengan resolve dan download di satu event loop asyncio (aiohttp).
+       Konkurensi dibatasi jumlah task download (`workers`), bukan jumlah thread, jadi cocok untuk
+       ratusan part sekaligus. Job store, listener, progress(), Stop/Skip, resume, segmen,
+       checksum dan metrik sama dengan engine thread: bagian yang tidak bergantung pada library HTTP
+       memakai method DownloadEngine, dan yang menyentuh job store, cache atau disk dijalankan lewat
+       asyncio.to_thread agar event loop tidak terblokir.
+    """
+    def __init__(self, *args, **kwargs):
+        if aiohttp is None:
+            raise ImportError("The asyncio engine needs aiohttp (pip install aiohttp)")
+        super().__init__(*args, **kwargs)
+        self.request_stats = RequestStats()
+        self.write_pool = None
+        self.throttle_pool = None
+
+    # --- Loop Utama ---
+
+    def run_workers(self, links, worker_count):
+        asyncio.run(self.run_loop(links, worker_count))
+
+    async def run_loop(self, links, worker_count):
+        """Task resolver (look-ahead) mengisi antrian job terbatas, `worker_count` task mendownload."""
+        connector = aiohttp.TCPConnector(limit=worker_count * self.segments_per_file + RESOLVE_LOOKAHEAD,
+                                         limit_per_host=PER_HOST_LIMIT)
+        timeout = aiohttp.ClientTimeout(sock_connect=DEFAULT_TIMEOUT[0], sock_read=DEFAULT_TIMEOUT[1])
+        self.write_pool = ThreadPoolExecutor(max_workers=WRITE_THREADS)
+        # Menunggu token rate limiter (blocking) di luar event loop, satu thread per stream yang mungkin menunggu
+        self.throttle_pool = ThreadPoolExecutor(max_workers=worker_count * self.segments_per_file)
+        try:
+            async with aiohttp.ClientSession(headers=HEADERS, connector=connector, timeout=timeout) as session:
+                job_queue = asyncio.Queue(maxsize=worker_count + RESOLVE_LOOKAHEAD)
+                resolvers = [asyncio.create_task(self.resolve_task(session, job_queue))
+                             for _ in range(min(RESOLVE_LOOKAHEAD, len(links)))]
+                downloaders = [asyncio.create_task(self.download_task(session, slot, job_queue))
+                               for slot in range(worker_count)]
+                await asyncio.gather(*resolvers)
+                for _ in downloaders:
+                    await self.put_until_stopped_async(job_queue, None)
+                await asyncio.gather(*downloaders)
+        finally:
+            self.write_pool.shutdown()
+            self.throttle_pool.shutdown()
+
+    async def put_until_stopped_async(self, job_queue, item):
+        while not self.should_stop:
+            try:
+                await asyncio.wait_for(job_queue.put(item), 0.5)
+                return True
+            except asyncio.TimeoutError:
+                continue
+        return False
+
+    # --- HTTP ---
+
+    def http_stats(self):
+        """Statistik request aiohttp, ditambah jumlah request thread (pre-flight) dari HttpTransport."""
+        counters = self.request_stats.summary()
+        for name, value in self.transport.stats().items():
+            if name != 'avg_latency_ms':
+                counters[name] += value
+        return counters
+
+    async def request_async(self, session, method, url, headers=None, metrics=None):
+        """Seperti HttpTransport.request: retry untuk 429/5xx dan koneksi putus dengan backoff + jitter.
+           Pemanggil harus memanggil `response.release()`.
+        """
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = await session.request(method, url, headers=headers, allow_redirects=True)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self.request_stats.count('requests')
+                if attempt >= MAX_RETRIES:
+                    self.request_stats.count('failures')
+                    raise
+                await self.backoff(attempt, None, metrics)
+                attempt += 1
+                continue
+
+            self.request_stats.count('requests')
+            self.request_stats.count('responses')
+            self.request_stats.count('latency_total', time.perf_counter() - started)
+            if response.status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                retry_after = response.headers.get('retry-after')
+                response.release()
+                await self.backoff(attempt, retry_after, metrics)
+                attempt += 1
+                continue
+            if response.status >= 400:
+                self.request_stats.count('failures')
+            return response
+
+    async def backoff(self, attempt, retry_after, metrics):
+        """Menunggu sebelum percobaan ulang tanpa memblokir event loop (lihat backoff_delay)."""
+        self.request_stats.count('retries')
+        if metrics:
+            metrics.add_retry()
+        await asyncio.sleep(backoff_delay(attempt, retry_after))
+
+    @staticmethod
+    def raise_for_status(response):
+        if response.status >= 400:
+            response.release()
+            response.raise_for_status()
+
+    # --- Resolve ---
+
+    async def resolve_task(self, session, job_queue):
+        while not self.should_stop:
+            link = self.next_queued_link() # Dibagi semua task resolver, aman karena satu thread
+            if link is None:
+                break
+            if not link:
+                await asyncio.sleep(PROGRESS_INTERVAL)
+                continue
+            await asyncio.to_thread(self.jobs.set_state, link, RESOLVING)
+            job = await self.resolve_link_async(session, link)
+            if not await asyncio.to_thread(self.record_resolve, link, job):
+                continue
+            if not await self.put_until_stopped_async(job_queue, job):
+                break
+
+    async def resolve_link_async(self, session, link):
+        """Versi asyncio resolve_link: cache, lalu halaman dibaca bertahap dengan PageScanner dan HEAD file."""
+        cached = self.cached_job(link)
+        if cached:
+            return cached
+
+        metrics = JobMetrics(link)
+        try:
+            requested = time.perf_counter()
+            response = await self.request_async(session, 'GET', link, metrics=metrics)
+            metrics.page_latency = time.perf_counter() - requested
+            if response.status != 200:
+                response.release()
+                self.log.error("Failed to fetch page", f"{link} (Status: {response.status})")
+                return None
+
+            parse_started = time.perf_counter()
+            scanner = PageScanner(response.charset)
+            try:
+                async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+                    if scanner.feed(chunk):
+                        file_name_raw, download_url = scanner.title, scanner.download_url
+                        break
+                else:
+                    file_name_raw, download_url = scanner.finish()
+            finally:
+                response.release()
+            metrics.parse_time = time.perf_counter() - parse_started
+            if not download_url:
+                self.log.error("No download URL found", link)
+                return None
+
+            self.log.info("Found URL", f"{download_url[:50]}...")
+            job = DownloadJob(link, download_url, file_name_raw, await self.fetch_file_size_async(session, download_url),
+                              metrics)
+            await asyncio.to_thread(self.resolve_cache.put, job)
+            return job
+
+        except Exception as e:
+            self.log.error(f"Failed processing link {link}", str(e))
+            return None
+
+    async def fetch_file_size_async(self, session, download_url):
+        try:
+            response = await self.request_async(session, 'HEAD', download_url)
+            response.release()
+            if response.status == 200 and response.headers.get('content-length'):
+                return int(response.headers['content-length'])
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            pass
+        return None
+
+    # --- Download ---
+
+    async def download_task(self, session, slot, job_queue):
+        """Setara download_worker: `slot` menentukan baris progress dan Event skip yang dipakai."""
+        while not self.should_stop and not (self.jobs_drained and self.worker_parked(slot)):
+            if self.worker_parked(slot):
+                await asyncio.sleep(0.5)
+                continue
+            try:
+                job = await asyncio.wait_for(job_queue.get(), 0.5)
+            except asyncio.TimeoutError:
+                continue
+            if job is None:
+                self.jobs_drained = True
+                break
+            output_path = await asyncio.to_thread(self.start_job, job, slot)
+            if output_path is None:
+                continue
+
+            link = job.link
+            attempts = {CHECKSUM_MISMATCH: 0, URL_EXPIRED: 0}
+            metrics = job.metrics
+            while job is not None:
+                outcome = await self.download_and_record_async(session, job, output_path, slot, metrics)
+                if not await asyncio.to_thread(self.retry_allowed, job, outcome, attempts):
+                    break
+                metrics = JobMetrics(link, metrics.attempt + 1)
+                resolved = await self.resolve_link_async(session, link) if outcome == URL_EXPIRED else None
+                job = await asyncio.to_thread(self.next_attempt, job, outcome, resolved, metrics)
+            self.finish_job(link, slot)
+
+        if self.should_stop:
+            self.log.error(f"Global stop received by worker #{slot + 1}.", "Stopping link processing.")
+
+    async def download_and_record_async(self, session, job, output_path, slot, metrics):
+        await asyncio.to_thread(self.begin_attempt, job, slot, metrics)
+        outcome = await self.download_file_async(session, job.download_url, output_path, job.file_name_raw,
+                                                 job.link, slot, metrics)
+        await asyncio.to_thread(self.record_attempt, job, slot, metrics, outcome)
+        return outcome
+
+    async def download_file_async(self, session, download_url, output_path, file_name_raw, link_to_remove, slot,
+                                  metrics):
+        """Versi asyncio download_file (resume, segmen, checksum). Mengembalikan CHECKSUM_MISMATCH,
+           URL_EXPIRED atau None seperti download_file.
+        """
+        part_path = output_path + PART_SUFFIX
+        meta_path = part_path + RESUME_SUFFIX
+        expected_md5 = self.checksums.get(os.path.basename(output_path).lower())
+        hasher = None
+        try:
+            start_time = time.time()
+            resume_info = load_resume_info(meta_path)
+            resume_from = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+
+            if segmented_resume(resume_info, resume_from):
+                total_size = self.resume_segmented(resume_info, file_name_raw)
+                try:
+                    downloaded_size = await self.download_segmented_async(
+                        session, download_url, part_path, meta_path, total_size, resume_info.get('etag'),
+                        resume_info['segments'], None, slot, file_name_raw)
+                except RangeNotSupported:
+                    self.discard_partial(part_path, file_name_raw)
+                    return await self.download_file_async(session, download_url, output_path, file_name_raw,
+                                                          link_to_remove, slot, metrics)
+            else:
+                request_headers = dict(FILE_HEADERS, **resume_headers(resume_info, resume_from,
+                                                                      self.segments_per_file > 1))
+                requested = time.perf_counter()
+                response = await self.request_async(session, 'GET', download_url, request_headers, metrics)
+                metrics.ttfb = time.perf_counter() - requested
+
+                try:
+                    if part_complete(response.status, resume_info, resume_from):
+                        total_size = resume_from
+                        downloaded_size = 0
+                    else:
+                        self.raise_for_status(response)
+                        parsed = parse_resume_response(response.status, response.headers, resume_info, resume_from)
+                        if parsed is None:
+                            response.release()
+                            response = await self.request_async(session, 'GET', download_url, FILE_HEADERS, metrics)
+                            self.raise_for_status(response)
+                            parsed = (int(response.headers.get('content-length', 0)), 0)
+                        total_size, resume_from = parsed
+                        etag = response.headers.get('etag')
+                        segments = self.plan_transfer(file_name_raw, resume_info, request_headers, resume_from,
+                                                      total_size, response.status)
+                        if segments:
+                            downloaded_size = await self.download_segmented_async(
+                                session, download_url, part_path, meta_path, total_size, etag, segments, response,
+                                slot, file_name_raw)
+                        else:
+                            save_resume_info(meta_path, download_url, total_size, etag)
+                            hasher = new_hasher() if expected_md5 else None
+                            downloaded_size = await self.download_single_async(response, part_path, resume_from,
+                                                                               total_size, slot, file_name_raw, hasher)
+                finally:
+                    response.release() # Juga saat error setelah respons dibuka
+
+            # MD5 dari disk, rename dan update job store berjalan di thread
+            await asyncio.to_thread(self.finish_download, link_to_remove, output_path, file_name_raw, expected_md5,
+                                    hasher, total_size, downloaded_size, start_time)
+
+        except ChecksumMismatch as e:
+            return await asyncio.to_thread(self.checksum_failed, link_to_remove, part_path, file_name_raw, e)
+        except DownloadCancelled:
+            await asyncio.to_thread(self.download_cancelled, link_to_remove, part_path, file_name_raw, slot)
+        except (aiohttp.ClientError, asyncio.TimeoutError, RangeNotSupported) as e:
+            return await asyncio.to_thread(self.download_failed, link_to_remove, part_path, file_name_raw, e,
+                                           getattr(e, 'status', None), isinstance(e, ASYNC_STALL_ERRORS))
+        except Exception as e:
+            await asyncio.to_thread(self.write_failed, link_to_remove, part_path, file_name_raw, e)
+        return None
+
+    async def download_single_async(self, response, part_path, resume_from, total_size, slot, file_name_raw,
+                                    hasher=None):
+        counters = [resume_from]
+        state = self.set_worker_file(slot, file_name_raw, total_size, counters)
+        try:
+            if hasher and resume_from > 0:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(self.write_pool, hash_file, part_path, hasher, resume_from)
+            with open(part_path, 'ab' if resume_from > 0 else 'wb') as f:
+                # Pesan sisa ukuran file tanpa mengubah ukurannya (posisi resume = ukuran file)
+                preallocate(f, resume_from, total_size - resume_from, keep_size=True)
+                await self.copy_async(response, f, counters, 0, state,
+                                      total_size - resume_from if total_size > 0 else None, hasher)
+        finally:
+            response.release()
+
+        if total_size > 0 and counters[0] < total_size:
+            raise aiohttp.ClientPayloadError(f"Connection closed at {counters[0]} of {total_size} bytes")
+        return counters[0] - resume_from
+
+    async def download_segmented_async(self, session, download_url, part_path, meta_path, total_size, etag,
+                                       segments, first_response, slot, file_name_raw):
+        """Setiap segmen adalah satu coroutine dengan request Range dan file handle sendiri."""
+        counters = await asyncio.to_thread(self.prepare_segmented, part_path, meta_path, download_url, total_size,
+                                           etag, segments)
+        already_done = sum(counters)
+        state = self.set_worker_file(slot, file_name_raw, total_size, counters)
+
+        async def fetch_segment(index, response):
+            start, end, _ = segments[index]
+            try:
+                if counters[index] > end - start:
+                    return
+                if response is None:
+                    range_headers = dict(FILE_HEADERS, **segment_headers(segments[index], counters[index], etag))
+                    response = await self.request_async(session, 'GET', download_url, range_headers,
+                                                        state['metrics'])
+                    self.raise_for_status(response)
+                    if response.status != 206:
+                        raise RangeNotSupported(f"Server ignored Range for segment {index + 1}")
+
+                with open(part_path, 'r+b') as f:
+                    f.seek(start + counters[index])
+                    await self.copy_async(response, f, counters, index, state, end - start + 1 - counters[index])
+
+                if counters[index] < end - start + 1:
+                    raise aiohttp.ClientPayloadError(
+                        f"Segment {index + 1} closed at {counters[index]} of {end - start + 1} bytes")
+            finally:
+                if response is not None:
+                    response.release()
+
+        async def save_periodically():
+            while True:
+                await asyncio.sleep(SIDECAR_SAVE_INTERVAL)
+                save_segment_progress(meta_path, download_url, total_size, etag, segments, counters)
+
+        saver = asyncio.create_task(save_periodically())
+        try:
+            results = await asyncio.gather(*(fetch_segment(index, first_response if index == 0 else None)
+                                             for index in range(len(segments))), return_exceptions=True)
+        finally:
+            saver.cancel()
+        save_segment_progress(meta_path, download_url, total_size, etag, segments, counters)
+
+        raise_segment_errors([result for result in results if isinstance(result, BaseException)], state,
+                             DownloadCancelled)
+        return sum(counters) - already_done
+
+    async def copy_async(self, response, f, counters, index, state, limit=None, hasher=None):
+        """Membaca body per READ_SIZE_MAX dan menulisnya di thread pool. Satu tulisan boleh berjalan
+           selagi potongan berikutnya dibaca; `counters[index]` bertambah setelah data ditulis.
+           Saat rate limiter aktif, ukuran baca mengikuti token yang diberikan limiter.
+        """
+        loop = asyncio.get_running_loop()
+        metrics = state['metrics']
+        share = state['share']
+        pending = None
+        blocked = 0.0
+
+        def write(data):
+            f.write(data)
+            if hasher:
+                hasher.update(data)
+            counters[index] += len(data)
+
+        try:
+            while limit is None or limit > 0:
+                if state['abort']:
+                    raise DownloadCancelled("Download cancelled.")
+                wanted = READ_SIZE_MAX if limit is None else min(READ_SIZE_MAX, limit)
+                if share and self.limiter.rate > 0:
+                    wanted = await loop.run_in_executor(self.throttle_pool, share.acquire, wanted)
+                try:
+                    if limit is None:
+                        data = await response.content.read(wanted)
+                    else:
+                        data = await response.content.readexactly(wanted)
+                except asyncio.IncompleteReadError as e:
+                    data = e.partial # Koneksi putus: tulis yang sudah diterima, pemanggil melempar error
+                    limit = 0
+                if share and len(data) < wanted:
+                    share.refund(wanted - len(data))
+                if not data:
+                    break
+                if limit:
+                    limit -= len(data)
+                if pending:
+                    started = time.perf_counter()
+                    await pending
+                    blocked += time.perf_counter() - started
+                pending = loop.run_in_executor(self.write_pool, write, data)
+        finally:
+            if pending:
+                started = time.perf_counter()
+                await pending
+                blocked += time.perf_counter() - started
+            if metrics:
+                metrics.add_write_blocked(blocked)
@@ -0,0 +1,141 @@
+"""Benchmark end-to-end: DownloadEngine tanpa GUI melawan server pengganti fuckingfast.co lokal.
+
+Server berjalan di proses terpisah, jadi CPU dan memori yang diukur hanya milik engine.
+Link yang gagal (koneksi putus, 429 terus-menerus) dijalankan ulang seperti menekan Start lagi,
+sampai semua selesai atau --max-passes tercapai.
+Jalankan dari root repo:
+    python benchmarks/bench_engine.py [--engine threads|async] [--files 16] [--size-mb 64] [--workers 3]
+                                      [--connections 1] [--bandwidth-mbps 0] [--latency-ms 0]
+                                      [--drop-rate 0] [--rate-limit 0]
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from standin_server import add_arguments, config_from_args, serve_forever
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+
+class CountingLog:
+    """Logger engine yang hanya menghitung error/warning (agar output tidak mempengaruhi pengukuran)."""
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+        self.errors = 0
+
+    def _log(self, tag, message, obj):
+        if self.verbose:
+            print(f"{tag:<7} {message} : {obj}")
+
+    def success(self, message, obj):
+        self._log('success', message, obj)
+
+    def error(self, message, obj):
+        self.errors += 1
+        self._log('error', message, obj)
+
+    def done(self, message, obj):
+        self._log('done', message, obj)
+
+    def warning(self, message, obj):
+        self._log('warning', message, obj)
+
+    def info(self, message, obj):
+        self._log('info', message, obj)
+
+
+def peak_rss_mb():
+    """Puncak RSS proses ini dalam MB, atau None jika tidak didukung OS."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024 # macOS: byte, Linux: KB
+
+
+def run_benchmark(args, base_url, work_dir):
+    """Menjalankan engine sampai semua link selesai. Mengembalikan dict hasil."""
+    from engine import DownloadEngine
+    from jobstore import JobStore
+
+    engine_class = DownloadEngine
+    if args.engine == 'async':
+        from async_engine import AsyncDownloadEngine
+        engine_class = AsyncDownloadEngine
+
+    download_folder = os.path.join(work_dir, 'Downloads')
+    jobs = JobStore(os.path.join(work_dir, 'jobs.db'))
+    jobs.import_links([f"{base_url}/page/bench{i:03d}.rar" for i in range(args.files)])
+    log = CountingLog(args.verbose)
+
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    passes = 0
+    retries = 0
+    while jobs.unfinished and passes < args.max_passes:
+        passes += 1
+        engine = engine_class(jobs, download_folder, log, workers=args.workers, segments=args.connections,
+                              input_file=None, cache_file=os.path.join(work_dir, 'resolve_cache.json'),
+                              preflight=False)
+        engine.run()
+        retries += engine.http_stats()['retries']
+    wall = time.perf_counter() - wall_started
+    cpu = time.process_time() - cpu_started
+
+    done = args.files - jobs.unfinished
+    total_bytes = sum(entry.stat().st_size for entry in os.scandir(download_folder)
+                      if entry.is_file() and entry.name.endswith('.rar'))
+    jobs.close()
+    return {'done': done, 'bytes': total_bytes, 'wall': wall, 'cpu': cpu, 'passes': passes,
+            'retries': retries, 'errors': log.errors}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=3)
+    parser.add_argument('--connections', type=int, default=1)
+    parser.add_argument('--engine', choices=('threads', 'async'), default='threads')
+    parser.add_argument('--max-passes', type=int, default=5, help="Engine runs before giving up on failed links")
+    parser.add_argument('--dir', default=None, help="Folder for the temporary download folder (disk under test)")
+    parser.add_argument('--verbose', action='store_true', help="Print the engine log")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve_forever, args=(config_from_args(args), port_queue), daemon=True)
+    server.start()
+    base_url = f"http://127.0.0.1:{port_queue.get()}"
+
+    work_dir = tempfile.mkdtemp(dir=args.dir, prefix='bench-engine-')
+    try:
+        print(f"{args.engine} engine, {args.files} files x {args.size_mb:g} MB, "
+              f"{args.workers} worker(s) x {args.connections} connection(s), "
+              f"bandwidth {args.bandwidth_mbps or 'unlimited'} MB/s, latency {args.latency_ms:g} ms, "
+              f"drop {args.drop_rate:g}, 429 {args.rate_limit:g}\n")
+        result = run_benchmark(args, base_url, work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        server.terminate()
+
+    gigabytes = result['bytes'] / 1024 ** 3
+    rss = peak_rss_mb()
+    print(f"{'files done':<14}{result['done']}/{args.files} in {result['passes']} pass(es), "
+          f"{result['retries']} HTTP retries, {result['errors']} logged errors")
+    print(f"{'files/s':<14}{result['done'] / result['wall']:.2f}")
+    print(f"{'MB/s':<14}{result['bytes'] / 1024 ** 2 / result['wall']:.1f}")
+    print(f"{'CPU s/GB':<14}{result['cpu'] / gigabytes:.3f}" if gigabytes else f"{'CPU s/GB':<14}n/a")
+    print(f"{'peak RSS MB':<14}{rss:.1f}" if rss is not None else f"{'peak RSS MB':<14}n/a")
+    print(f"{'wall s':<14}{result['wall']:.2f}")
+
+
+if __name__ == '__main__':
+    main()
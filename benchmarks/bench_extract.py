@@ -0,0 +1,88 @@
+"""Micro-benchmark: extractor streaming vs. parse penuh BeautifulSoup pada halaman contoh.
+
+Jalankan dari root repo:
+    python benchmarks/bench_extract.py [--rounds 200] [--samples benchmarks/samples]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extractor import READ_CHUNK_SIZE, extract_page_info, extract_with_soup
+
+
+class SavedPageResponse:
+    """Memutar ulang halaman yang disimpan seperti respons `requests` dengan stream=True."""
+    def __init__(self, body):
+        self.body = body
+        self.encoding = 'utf-8'
+        self.headers = {}
+        self.raw = None
+        self.bytes_read = 0
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            chunk = self.body[start:start + chunk_size]
+            self.bytes_read += len(chunk)
+            yield chunk
+
+    def close(self):
+        pass
+
+
+def run_streaming(body):
+    response = SavedPageResponse(body)
+    result = extract_page_info(response)
+    return result, response.bytes_read
+
+
+def run_soup(body):
+    # Sama seperti kode lama: seluruh body dibaca lalu di-parse
+    return extract_with_soup(body.decode('utf-8')), len(body)
+
+
+def measure(func, body, rounds):
+    """Mengembalikan (hasil, byte dibaca, rata-rata ms per halaman, puncak memori KB)."""
+    result, bytes_read = func(body) # Pemanasan dan cek hasil
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func(body)
+    elapsed_ms = (time.perf_counter() - started) * 1000 / rounds
+
+    tracemalloc.start()
+    func(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, bytes_read, elapsed_ms, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=200)
+    parser.add_argument('--samples', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'samples'))
+    args = parser.parse_args()
+
+    print(f"chunk size {READ_CHUNK_SIZE} bytes, {args.rounds} rounds per page\n")
+    print(f"{'page':<16}{'method':<11}{'size KB':>9}{'read KB':>9}{'ms/page':>10}{'peak KB':>10}{'speedup':>9}")
+    for name in sorted(os.listdir(args.samples)):
+        if not name.endswith('.html'):
+            continue
+        with open(os.path.join(args.samples, name), 'rb') as f:
+            body = f.read()
+
+        soup_result, soup_read, soup_ms, soup_peak = measure(run_soup, body, args.rounds)
+        fast_result, fast_read, fast_ms, fast_peak = measure(run_streaming, body, args.rounds)
+        if fast_result != soup_result:
+            print(f"{name}: results differ! streaming={fast_result} soup={soup_result}")
+
+        size_kb = len(body) / 1024
+        print(f"{name:<16}{'soup':<11}{size_kb:>9.1f}{soup_read / 1024:>9.1f}{soup_ms:>10.3f}{soup_peak:>10.1f}{'':>9}")
+        print(f"{'':<16}{'streaming':<11}{size_kb:>9.1f}{fast_read / 1024:>9.1f}{fast_ms:>10.3f}{fast_peak:>10.1f}"
+              f"{soup_ms / fast_ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
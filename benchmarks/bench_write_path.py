@@ -0,0 +1,125 @@
+"""Mengukur biaya CPU per GB jalur tulis download: loop lama (iter_content 8 KiB) vs. copy_to_file.
+
+Server lokal berjalan di proses terpisah, jadi CPU yang diukur hanya milik sisi download.
+Jalankan dari root repo:
+    python benchmarks/bench_write_path.py [--size-mb 1024] [--rounds 3] [--dir .]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transport import FILE_HEADERS, HttpTransport
+from writer import copy_to_file
+
+
+def serve(size, port_queue):
+    """Server yang mengirim `size` byte secepat mungkin dari memori."""
+    block = memoryview(os.urandom(1024 * 1024))
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Length', str(size))
+            self.end_headers()
+            sent = 0
+            while sent < size:
+                chunk = block[:min(len(block), size - sent)]
+                self.wfile.write(chunk)
+                sent += len(chunk)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def legacy_copy(response, f):
+    """Salinan loop download_file sebelum perubahan: cek Stop/Skip dan time.time() di setiap chunk 8 KiB."""
+    should_stop = False
+    skip_event_set = False
+    downloaded_size = 0
+    last_time = time.time()
+    for data in response.iter_content(8192):
+        if should_stop or skip_event_set:
+            raise StopIteration("Download cancelled.")
+        f.write(data)
+        downloaded_size += len(data)
+        current_time = time.time()
+        if current_time - last_time >= 0.5:
+            last_time = current_time
+    return downloaded_size
+
+
+def optimized_copy(write_behind):
+    def copy(response, f):
+        counters = [0]
+        copy_to_file(response, f, counters, 0, {'abort': False}, write_behind=write_behind)
+        return counters[0]
+    return copy
+
+
+def measure(transport, url, path, copy):
+    """Mengembalikan (byte, detik CPU, detik wall) untuk satu download."""
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    response = transport.get(url, headers=FILE_HEADERS, stream=True)
+    try:
+        with open(path, 'wb') as f:
+            size = copy(response, f)
+    finally:
+        response.close()
+    return size, time.process_time() - cpu_started, time.perf_counter() - wall_started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mb', type=int, default=1024)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--dir', default=None, help="Folder untuk file sementara (disk yang diuji)")
+    args = parser.parse_args()
+
+    size = args.size_mb * 1024 * 1024
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(size, port_queue), daemon=True)
+    server.start()
+    url = f"http://127.0.0.1:{port_queue.get()}/file.bin"
+
+    methods = [
+        ('legacy 8 KiB', legacy_copy),
+        ('readinto', optimized_copy(write_behind=False)),
+        ('write-behind', optimized_copy(write_behind=True)),
+    ]
+    transport = HttpTransport()
+    fd, path = tempfile.mkstemp(dir=args.dir, suffix='.bench')
+    os.close(fd)
+    try:
+        print(f"{args.size_mb} MB per download, best of {args.rounds}\n")
+        print(f"{'method':<14}{'CPU s/GB':>10}{'MB/s':>10}")
+        baseline = None
+        for name, copy in methods:
+            results = [measure(transport, url, path, copy) for _ in range(args.rounds)]
+            got, cpu, wall = min(results, key=lambda result: result[1])
+            assert got == size, f"{name}: got {got} of {size} bytes"
+            cpu_per_gb = cpu / (size / 1024 ** 3)
+            line = f"{name:<14}{cpu_per_gb:>10.3f}{size / wall / 1024 ** 2:>10.1f}"
+            if baseline:
+                line += f"   ({baseline / cpu_per_gb:.1f}x less CPU than legacy)"
+            baseline = baseline or cpu_per_gb
+            print(line)
+    finally:
+        os.remove(path)
+        server.terminate()
+
+
+if __name__ == '__main__':
+    main()
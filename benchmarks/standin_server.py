@@ -0,0 +1,189 @@
+"""Server lokal pengganti fuckingfast.co untuk benchmark dan uji manual.
+
+/page/<nama> mengembalikan halaman berbentuk halaman asli (meta title + `function download` dengan
+`window.open`), /file/<nama> mengembalikan body besar dengan dukungan Range. Bandwidth, latensi,
+koneksi putus dan 429 bisa diatur, dan keputusan acak memakai seed agar hasilnya bisa diulang.
+
+Jalankan sendiri (lalu isi input.txt dengan http://127.0.0.1:8000/page/file01.rar, ...):
+    python benchmarks/standin_server.py --port 8000 --size-mb 64 --bandwidth-mbps 20
+"""
+import argparse
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SAMPLE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'samples', 'typical.html')
+BLOCK_SIZE = 1024 * 1024 # Isi file adalah blok ini yang diulang
+SEND_SIZE = 64 * 1024
+
+
+class StandInConfig:
+    def __init__(self, size=64 * 1024 * 1024, bandwidth=0, latency=0.0, drop_rate=0.0, rate_limit=0.0,
+                 ranges=True, seed=1):
+        self.size = size # Byte per file
+        self.bandwidth = bandwidth # Byte/detik per koneksi, 0 = tanpa batas
+        self.latency = latency # Detik sebelum setiap respons
+        self.drop_rate = drop_rate # Peluang body file diputus di tengah jalan
+        self.rate_limit = rate_limit # Peluang request dijawab 429
+        self.ranges = ranges
+        self.seed = seed
+
+
+def page_template():
+    """Halaman contoh dengan title dan URL download diganti placeholder."""
+    with open(SAMPLE_PAGE, 'r', encoding='utf-8') as f:
+        page = f.read()
+    page = re.sub(r'(<meta name="title" content=")[^"]*', r'\1{title}', page, count=1)
+    return re.sub(r'window\.open\("[^"]*"', 'window.open("{url}"', page, count=1)
+
+
+def make_handler(config):
+    template = page_template().replace('{', '{{').replace('}', '}}')
+    template = template.replace('{{title}}', '{title}').replace('{{url}}', '{url}')
+    block = memoryview(bytes(i % 251 for i in range(BLOCK_SIZE)))
+    request_counts = {}
+    counts_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_HEAD(self):
+            self.respond(head=True)
+
+        def do_GET(self):
+            self.respond()
+
+        def chance(self):
+            """Angka acak yang sama untuk request yang sama di setiap run (seed + path + Range + urutan)."""
+            key = (self.command, self.path, self.headers.get('Range'))
+            with counts_lock:
+                request_counts[key] = request_counts.get(key, 0) + 1
+                count = request_counts[key]
+            return random.Random(f"{config.seed}:{key}:{count}")
+
+        def respond(self, head=False):
+            rng = self.chance()
+            if config.latency:
+                time.sleep(config.latency)
+            if config.rate_limit and rng.random() < config.rate_limit:
+                self.send_empty(429, {'Retry-After': '0'})
+                return
+
+            parts = self.path.strip('/').split('/')
+            if len(parts) == 2 and parts[0] == 'page':
+                host = self.headers.get('Host')
+                body = template.format(title=parts[1], url=f"http://{host}/file/{parts[1]}").encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if not head:
+                    self.wfile.write(body)
+            elif len(parts) == 2 and parts[0] == 'file':
+                self.send_file(head, rng)
+            else:
+                self.send_empty(404)
+
+        def send_empty(self, status, headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def send_file(self, head, rng):
+            size = config.size
+            start, end, status = 0, size - 1, 200
+            match = re.match(r'bytes=(\d+)-(\d*)$', self.headers.get('Range', ''))
+            if match and config.ranges:
+                start = int(match.group(1))
+                end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+                if start >= size:
+                    self.send_empty(416, {'Content-Range': f"bytes */{size}"})
+                    return
+                status = 206
+
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(end - start + 1))
+            self.send_header('Accept-Ranges', 'bytes' if config.ranges else 'none')
+            self.send_header('ETag', f'"{config.seed}-{size}"')
+            if status == 206:
+                self.send_header('Content-Range', f"bytes {start}-{end}/{size}")
+            self.end_headers()
+            if head:
+                return
+
+            drop_at = None
+            if config.drop_rate and rng.random() < config.drop_rate:
+                drop_at = start + int(rng.random() * (end - start + 1))
+            started = time.perf_counter()
+            position = start
+            try:
+                while position <= end:
+                    offset = position % BLOCK_SIZE
+                    length = min(SEND_SIZE, end - position + 1, BLOCK_SIZE - offset)
+                    if drop_at is not None and position + length > drop_at:
+                        self.wfile.write(block[offset:offset + drop_at - position])
+                        self.close_connection = True
+                        self.connection.shutdown(2) # Putus di tengah body
+                        return
+                    self.wfile.write(block[offset:offset + length])
+                    position += length
+                    if config.bandwidth:
+                        # Tunggu sampai rata-rata koneksi ini kembali di bawah batas bandwidth
+                        ahead = (position - start) / config.bandwidth - (time.perf_counter() - started)
+                        if ahead > 0:
+                            time.sleep(ahead)
+            except OSError:
+                pass # Klien menutup koneksi (Skip/Stop)
+
+    return Handler
+
+
+def serve_forever(config, port_queue, port=0):
+    """Target multiprocessing: server di proses sendiri agar CPU-nya tidak ikut terukur."""
+    server = ThreadingHTTPServer(('127.0.0.1', port), make_handler(config))
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def add_arguments(parser):
+    parser.add_argument('--size-mb', type=float, default=64, help="Size of every file")
+    parser.add_argument('--bandwidth-mbps', type=float, default=0, help="Per-connection limit in MB/s, 0 = none")
+    parser.add_argument('--latency-ms', type=float, default=0, help="Delay before every response")
+    parser.add_argument('--drop-rate', type=float, default=0, help="Chance a file body is cut off (0-1)")
+    parser.add_argument('--rate-limit', type=float, default=0, help="Chance a request gets a 429 (0-1)")
+    parser.add_argument('--no-range', action='store_true', help="Ignore Range headers")
+    parser.add_argument('--seed', type=int, default=1)
+
+
+def config_from_args(args):
+    return StandInConfig(size=int(args.size_mb * 1024 * 1024), bandwidth=int(args.bandwidth_mbps * 1024 * 1024),
+                         latency=args.latency_ms / 1000, drop_rate=args.drop_rate, rate_limit=args.rate_limit,
+                         ranges=not args.no_range, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8000)
+    add_arguments(parser)
+    args = parser.parse_args()
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(config_from_args(args)))
+    server.daemon_threads = True
+    print(f"Serving on http://127.0.0.1:{args.port}/page/<name>")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+CHECKSUM_SUFFIX = '.md5' # File checksum format md5sum: "<hash> *<nama file>"
+HASH_SLICE = 8 * 1024 * 1024 # Byte per update hash; hashlib melepas GIL, jadi thread bisa berjalan paralel
+VERIFY_WORKERS = os.cpu_count() or 2
+
+
+class ChecksumMismatch(Exception):
+    """Hash file yang didownload tidak sama dengan checksum yang diberikan."""
+
+
+def new_hasher():
+    return hashlib.md5()
+
+
+def load_checksums(paths):
+    """Membaca file checksum format md5sum. Mengembalikan dict nama file (huruf kecil) -> hash hex.
+       Baris kosong dan komentar (';' atau '#') dilewati, path di depan nama file dibuang.
+    """
+    checksums = {}
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line[0] in ';#':
+                    continue
+                parts = line.split(None, 1)
+                if len(parts) != 2 or len(parts[0]) != 32:
+                    continue
+                name = parts[1].lstrip('*').replace('\\', '/').rsplit('/', 1)[-1]
+                checksums[name.lower()] = parts[0].lower()
+    return checksums
+
+
+def find_checksum_files(folder):
+    """Semua file .md5 langsung di dalam `folder`."""
+    if not os.path.isdir(folder):
+        return []
+    return [os.path.join(folder, name) for name in sorted(os.listdir(folder))
+            if name.lower().endswith(CHECKSUM_SUFFIX)]
+
+
+def hash_file(path, hasher=None, limit=None):
+    """Meng-hash isi file (atau `limit` byte pertamanya) lewat mmap, atau buffer besar jika mmap
+       tidak bisa dipakai (file kosong, sistem file tertentu). Mengembalikan hasher.
+    """
+    hasher = hasher or new_hasher()
+    size = os.path.getsize(path)
+    length = size if limit is None else min(limit, size)
+    with open(path, 'rb') as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for start in range(0, length, HASH_SLICE):
+                        hasher.update(view[start:min(start + HASH_SLICE, length)])
+                finally:
+                    view.release()
+            return hasher
+        except (ValueError, OSError):
+            pass
+
+        buffer = bytearray(HASH_SLICE)
+        view = memoryview(buffer)
+        left = length
+        while left > 0:
+            size = f.readinto(view[:min(HASH_SLICE, left)])
+            if not size:
+                break
+            hasher.update(view[:size])
+            left -= size
+    return hasher
+
+
+def verify_folder(folder, checksums, workers=VERIFY_WORKERS, on_result=None):
+    """Meng-hash semua file di `folder` yang ada di `checksums` secara paralel.
+       `on_result(name, status)` dipanggil per file dengan status 'ok', 'mismatch' atau 'missing'.
+       Mengembalikan dict status -> daftar nama file.
+    """
+    present = {name.lower(): name for name in os.listdir(folder)} if os.path.isdir(folder) else {}
+    results = {'ok': [], 'mismatch': [], 'missing': []}
+
+    def check(key):
+        name = present.get(key)
+        if name is None:
+            return key, 'missing'
+        digest = hash_file(os.path.join(folder, name)).hexdigest()
+        return name, 'ok' if digest == checksums[key] else 'mismatch'
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for name, status in pool.map(check, sorted(checksums)):
+            results[status].append(name)
+            if on_result:
+                on_result(name, status)
+    return results
@@ -0,0 +1,215 @@
+"""Downloader tanpa GUI: menjalankan DownloadEngine yang sama dengan aplikasi Tkinter dari terminal.
+
+Contoh:
+    python cli.py input.txt -o Downloads -w 4 -c 2 --limit 5M --schedule "09:00-18:00=1M"
+    python cli.py https://fitgirl-repacks.site/<game>/ -o Downloads
+    python cli.py input.txt --on-set-complete "unrar x -o+ {first} /mnt/nas/games/"
+
+Selama berjalan, batas kecepatan bisa diubah dengan mengetik perintah di stdin:
+    limit 2M | schedule 09:00-18:00=1M,18:00-09:00=0 | priority part01 4
+"""
+import argparse
+import os
+import sys
+import threading
+from datetime import datetime
+
+from fitgirl import is_post_url
+from ratelimit import RateLimiter, parse_rate, parse_schedule
+
+# Engine (dan requests) baru diimpor setelah argumen dibaca, agar --help dan argumen salah langsung selesai
+DEFAULT_INPUT = 'input.txt'
+DEFAULT_JOBS = 'jobs.db'
+STATUS_INTERVAL = 2.0 # Detik antara baris status progress
+
+
+class ConsoleLog:
+    """Logger untuk terminal dengan API yang sama seperti GuiConsole (success/error/done/warning/info)."""
+    def __init__(self, stream=sys.stdout):
+        self.stream = stream
+        self.lock = threading.Lock()
+
+    def _log(self, tag, message, obj):
+        line = f"{datetime.now().strftime('%H:%M:%S')} » {tag.upper():<7} • {message} : {obj}\n"
+        with self.lock:
+            self.stream.write(line)
+            self.stream.flush()
+
+    def success(self, message, obj):
+        self._log('success', message, obj)
+
+    def error(self, message, obj):
+        self._log('error', message, obj)
+
+    def done(self, message, obj):
+        self._log('done', message, obj)
+
+    def warning(self, message, obj):
+        self._log('warning', message, obj)
+
+    def info(self, message, obj):
+        self._log('info', message, obj)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Download fuckingfast.co links without the GUI.")
+    parser.add_argument('input', nargs='?', default=DEFAULT_INPUT,
+                        help=f"File with one link per line, imported when it changed (default: {DEFAULT_INPUT}), "
+                             "or a fitgirl-repacks.site game page to add all of its fuckingfast.co links")
+    parser.add_argument('-o', '--output', default=os.path.join(os.getcwd(), 'Downloads'),
+                        help="Download folder (default: ./Downloads)")
+    parser.add_argument('-w', '--workers', type=int, default=None, help="Files downloaded at the same time")
+    parser.add_argument('--auto', action='store_true',
+                        help="Adjust the number of active workers from throughput and HTTP errors (AIMD), "
+                             "between --min-workers and -w")
+    parser.add_argument('--min-workers', type=int, default=1, help="Lower bound for --auto (default: 1)")
+    parser.add_argument('-c', '--connections', type=int, default=None, help="Range connections per file")
+    parser.add_argument('--engine', choices=('threads', 'async'), default='threads',
+                        help="threads: one thread per download; async: one asyncio event loop (needs aiohttp), "
+                             "for hundreds of parts at once")
+    parser.add_argument('--jobs-db', default=DEFAULT_JOBS, help=f"Job store path (default: {DEFAULT_JOBS})")
+    parser.add_argument('--checksums', default=None,
+                        help="md5sum-style checksum file (default: every .md5 file in the download folder)")
+    parser.add_argument('--verify', action='store_true',
+                        help="Only hash the files already in the download folder, delete and re-queue mismatches")
+    parser.add_argument('--no-preflight', action='store_true',
+                        help="Do not skip links whose file is already complete in the download folder")
+    parser.add_argument('--no-space-check', action='store_true',
+                        help="Start even if the queue looks larger than the free space in the download folder")
+    parser.add_argument('--metrics', default=None, metavar='FILE',
+                        help="Append per-job metrics (latency, TTFB, throughput, stalls, disk wait) as JSONL")
+    parser.add_argument('--metrics-port', type=int, default=None, metavar='PORT',
+                        help="Serve Prometheus metrics on 127.0.0.1:PORT while downloading")
+    parser.add_argument('--limit', type=parse_rate, default=0, metavar='RATE',
+                        help="Global speed limit for all downloads: 2.5 (MB/s), 500K, 2M; 0 = unlimited")
+    parser.add_argument('--schedule', type=parse_schedule, default=[], metavar='SPEC',
+                        help="Time-of-day limits overriding --limit, e.g. \"09:00-18:00=1M,18:00-09:00=0\"")
+    parser.add_argument('--priority', action='append', default=[], metavar='PATTERN=WEIGHT',
+                        help="Bandwidth weight for links containing PATTERN (default weight 1), repeatable")
+    parser.add_argument('--on-set-complete', default=None, metavar='COMMAND',
+                        help="Shell command run for each .partNN.rar set once all parts are downloaded and "
+                             "verified, while the next set keeps downloading. {first}, {files}, {set} and {folder} "
+                             "are replaced with quoted values")
+    parser.add_argument('--no-export', action='store_true', help="Do not rewrite the input file at the end")
+    parser.add_argument('-q', '--quiet', action='store_true', help="No periodic progress lines")
+    return parser.parse_args(argv)
+
+
+def print_status(engine, log):
+    """Satu baris ringkasan: link selesai, kecepatan total dan file yang sedang didownload."""
+    from engine import format_size, format_speed
+
+    states, total_speed, finished, total_links = engine.progress()
+    active = [f"{state['file']} {format_size(state['downloaded'])}/{format_size(state['total'])}"
+              for state in states if state['file'] is not None]
+    status = f"Progress {finished}/{total_links}, {format_speed(total_speed)}"
+    if engine.controller:
+        status += f", {engine.controller.status()}"
+    log.info(status, "; ".join(active) or "idle")
+
+
+def parse_priority(text):
+    """'part01=4' -> ('part01', 4.0). Melempar ValueError jika formatnya salah."""
+    pattern, _, weight = text.rpartition('=')
+    if not pattern:
+        raise ValueError(f"Invalid priority: {text!r} (expected PATTERN=WEIGHT)")
+    return pattern, float(weight)
+
+
+def apply_priority(engine, pattern, weight, log):
+    links = [link for link in engine.jobs.unfinished_links() if pattern in link]
+    for link in links:
+        engine.set_priority(link, weight)
+    log.info(f"Priority {weight:g} set for", f"{len(links)} link(s) matching {pattern}")
+
+
+def read_commands(engine, log, stream=sys.stdin):
+    """Perintah dari stdin selama download (berjalan di thread): limit, schedule dan priority."""
+    for line in stream:
+        command, _, value = line.strip().partition(' ')
+        try:
+            if command == 'limit':
+                engine.limiter.set_rate(parse_rate(value))
+                log.info("Speed limit set to", value.strip() or "unlimited")
+            elif command == 'schedule':
+                engine.limiter.set_schedule(parse_schedule(value))
+                log.info("Speed schedule set to", value.strip() or "none")
+            elif command == 'priority':
+                pattern, _, weight = value.strip().rpartition(' ')
+                apply_priority(engine, *parse_priority(f"{pattern}={weight}"), log)
+            elif command:
+                log.warning("Unknown command", f"{command} (use limit, schedule or priority)")
+        except ValueError as e:
+            log.error("Invalid command", str(e))
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        priorities = [parse_priority(text) for text in args.priority]
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    from engine import (DownloadEngine, verify_download_folder, DEFAULT_WORKERS, MAX_WORKERS,
+                        DEFAULT_SEGMENTS, MAX_SEGMENTS)
+    from jobstore import JobStore
+
+    engine_class = DownloadEngine
+    max_workers = MAX_WORKERS
+    if args.engine == 'async':
+        from async_engine import AsyncDownloadEngine, ASYNC_MAX_WORKERS, aiohttp
+        if aiohttp is None:
+            print("The async engine needs aiohttp: pip install aiohttp", file=sys.stderr)
+            return 2
+        engine_class = AsyncDownloadEngine
+        max_workers = ASYNC_MAX_WORKERS
+
+    workers = max(1, min(args.workers or DEFAULT_WORKERS, max_workers))
+    segments = max(1, min(args.connections or DEFAULT_SEGMENTS, MAX_SEGMENTS))
+    log = ConsoleLog()
+
+    jobs = JobStore(args.jobs_db)
+    post_url = is_post_url(args.input)
+    try:
+        if post_url:
+            jobs.append_links([args.input]) # Diganti link-linknya oleh engine sebelum download
+        elif jobs.import_if_newer(args.input) is not None:
+            log.info("Imported links from", args.input)
+        elif not os.path.exists(args.input):
+            log.warning(f"{args.input} not found,", f"using links already in {args.jobs_db}")
+
+        if args.verify:
+            results = verify_download_folder(jobs, args.output, log, args.checksums)
+            if not args.no_export and not post_url and os.path.exists(args.input):
+                jobs.export_links(args.input)
+            return 1 if results is None or results['mismatch'] else 0
+
+        engine = engine_class(jobs, args.output, log, workers=workers, segments=segments,
+                              input_file=None if args.no_export or post_url else args.input,
+                              checksum_file=args.checksums,
+                              preflight=not args.no_preflight, metrics_file=args.metrics,
+                              metrics_port=args.metrics_port, limiter=RateLimiter(args.limit, args.schedule),
+                              adaptive=args.auto, min_workers=min(args.min_workers, workers),
+                              space_check=not args.no_space_check, post_command=args.on_set_complete)
+        for pattern, weight in priorities:
+            apply_priority(engine, pattern, weight, log)
+        if sys.stdin and not sys.stdin.closed:
+            threading.Thread(target=read_commands, args=(engine, log), daemon=True).start()
+        thread = engine.start()
+        try:
+            while thread.is_alive():
+                thread.join(STATUS_INTERVAL)
+                if thread.is_alive() and not args.quiet:
+                    print_status(engine, log)
+        except KeyboardInterrupt:
+            log.error("Stop requested.", "Stopping all downloads...")
+            engine.stop()
+            thread.join()
+        return 0 if jobs.unfinished == 0 else 1
+    finally:
+        jobs.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
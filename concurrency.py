@@ -0,0 +1,59 @@
+CONTROL_INTERVAL = 5.0 # Detik antara keputusan controller (cukup lama agar download baru sempat jalan)
+MIN_GAIN = 0.05 # Tambahan worker harus menaikkan throughput minimal 5%, kalau tidak dikembalikan
+HOLD_INTERVALS = 6 # Interval bertahan setelah tambahan worker tidak membantu, sebelum mencoba lagi
+SPEED_LIMIT_MARGIN = 0.9 # Throughput di atas 90% batas kecepatan = bandwidth sudah habis
+
+INCREASE = 'increase'
+DECREASE = 'decrease'
+HOLD = 'hold'
+
+
+class AdaptiveController:
+    """Mengatur jumlah worker aktif secara AIMD dari throughput gabungan dan error HTTP.
+       Mulai dengan slow start (jumlah digandakan), lalu +1 per interval selama throughput naik.
+       Retry/gagal HTTP (429, 5xx, koneksi putus) memotong jumlahnya setengah; tambahan yang tidak
+       menaikkan throughput dikembalikan lalu ditahan beberapa interval.
+    """
+    def __init__(self, minimum, maximum):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = self.minimum
+        self.slow_start = True
+        self.last_increase = None # Throughput sebelum tambahan worker terakhir
+        self.hold = 0
+        self.decision = HOLD
+        self.reason = "starting"
+
+    def update(self, throughput, errors, rate_limit=0):
+        """Satu keputusan dari throughput rata-rata (byte/detik) dan jumlah error HTTP sejak keputusan
+           sebelumnya. `rate_limit` adalah batas kecepatan global (0 = tanpa batas). Mengembalikan limit baru.
+        """
+        speed = f"{throughput / (1024 * 1024):.1f} MB/s"
+        previous = self.last_increase
+        self.last_increase = None
+
+        if errors:
+            self.limit = max(self.minimum, self.limit // 2)
+            self.slow_start = False
+            self.decision, self.reason = DECREASE, f"{errors} HTTP error(s)/retries at {speed}"
+        elif previous is not None and throughput < previous * (1 + MIN_GAIN):
+            self.limit = max(self.minimum, self.limit - 1)
+            self.slow_start = False
+            self.hold = HOLD_INTERVALS
+            self.decision, self.reason = DECREASE, f"no gain from more workers ({speed})"
+        elif rate_limit and throughput >= rate_limit * SPEED_LIMIT_MARGIN:
+            self.decision, self.reason = HOLD, f"at speed limit ({speed})"
+        elif self.hold:
+            self.hold -= 1
+            self.decision, self.reason = HOLD, f"steady at {speed}"
+        elif self.limit >= self.maximum:
+            self.decision, self.reason = HOLD, f"at maximum ({speed})"
+        else:
+            self.last_increase = throughput
+            self.limit = min(self.maximum, self.limit * 2 if self.slow_start else self.limit + 1)
+            self.decision, self.reason = INCREASE, f"throughput {speed}"
+        return self.limit
+
+    def status(self):
+        """Teks singkat untuk GUI/CLI, misalnya 'Auto 4/8: increase (throughput 12.3 MB/s)'."""
+        return f"Auto {self.limit}/{self.maximum}: {self.decision} ({self.reason})"
@@ -0,0 +1,1306 @@
+import collections
+import errno
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from checksum import ChecksumMismatch, find_checksum_files, hash_file, load_checksums, new_hasher, verify_folder
+from concurrency import AdaptiveController, CONTROL_INTERVAL
+from extractor import extract_page_info
+from fitgirl import (archive_set, extract_post_links, group_by_archive_set, is_post_url, link_file_name, link_key,
+                     parse_part_name)
+from jobstore import PENDING, RESOLVING, DOWNLOADING, DONE, FAILED
+from metrics import JobMetrics, MetricsRecorder
+from pipeline import run_command, verify_set
+from ratelimit import RateLimiter
+from resolvecache import ResolveCache, RESOLVE_CACHE_FILE, RESOLVE_CACHE_TTL, RESOLVE_URL_MAX_AGE
+from resume import (PART_SUFFIX, RESUME_SUFFIX, load_resume_info, save_resume_info, save_segment_progress,
+                    partial_size, remove_resume_info, segmented_resume, resume_headers, segment_headers, part_complete,
+                    parse_resume_response, plan_segments)
+from transport import HttpTransport, FILE_HEADERS, RangeNotSupported, raise_for_status
+from writer import copy_to_file, preallocate
+
+INPUT_FILE = 'input.txt'
+JOBS_FILE = 'jobs.db'
+
+DEFAULT_WORKERS = 3 # Jumlah file yang didownload bersamaan
+MAX_WORKERS = 8
+RESOLVE_LOOKAHEAD = 4 # Link yang di-resolve lebih dulu selagi worker mendownload
+INVALID_URL_STATUSES = (403, 404, 410) # Status yang berarti URL download di cache sudah mati
+# Koneksi file macet/putus setelah retry transport habis: URL mungkin sudah kedaluwarsa
+STALL_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError)
+
+DEFAULT_SEGMENTS = 1 # Koneksi per file (1 = satu stream seperti biasa)
+MAX_SEGMENTS = 8
+
+PREFLIGHT_WORKERS = 8 # Link yang dicek bersamaan saat pre-flight
+MAX_CHECKSUM_ATTEMPTS = 3 # Download ulang file yang checksum-nya salah sampai batas ini
+MAX_RERESOLVE_ATTEMPTS = 3 # Resolve ulang halaman saat URL langsung mati/macet, sampai batas ini per link
+
+# Hasil download_file yang perlu percobaan lagi (None = selesai, gagal, atau dibatalkan)
+CHECKSUM_MISMATCH = 'checksum_mismatch' # File sudah dibuang, download ulang dari awal
+URL_EXPIRED = 'url_expired' # URL langsung ditolak (403/404/410) atau koneksi macet/putus, .part disimpan
+
+FREE_SPACE_MARGIN = 100 * 1024 * 1024 # Ruang disk yang tetap disisakan saat cek ruang kosong
+
+PROGRESS_INTERVAL = 0.5 # Detik antara perhitungan progress/kecepatan dan cek Stop/Skip
+SIDECAR_SAVE_INTERVAL = 2.0 # Detik antara penyimpanan posisi segmen
+
+
+# --- Fungsi Utilitas ---
+
+def format_size(size_bytes):
+    """Mengkonversi bytes menjadi string yang mudah dibaca (KB, MB, GB)."""
+    if size_bytes == 0:
+        return "0B"
+    units = ['B', 'KB', 'MB', 'GB', 'TB']
+    i = 0
+    while size_bytes >= 1024 and i < len(units) - 1:
+        size_bytes /= 1024
+        i += 1
+    return f"{size_bytes:.2f}{units[i]}"
+
+
+def format_speed(speed_bps):
+    """Mengkonversi bytes/second menjadi string yang mudah dibaca (KB/s, MB/s)."""
+    return format_size(speed_bps).replace('B', 'B/s')
+
+
+def format_eta(seconds):
+    """Mengkonversi sisa detik menjadi string singkat (45s, 3m 10s, 1h 02m), '' jika tidak diketahui."""
+    if seconds is None or seconds < 0:
+        return ""
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
+
+def idle_worker_state():
+    """State progress worker yang sedang tidak mendownload."""
+    return {'file': None, 'total': 0, 'counters': [0], 'downloaded': 0, 'last_downloaded': 0,
+            'speed': 0.0, 'abort': False, 'metrics': None, 'link': None, 'share': None}
+
+
+def raise_segment_errors(errors, state, cancelled):
+    """Melempar error dari segmen-segmen download: pembatalan (Stop/Skip, tipe `cancelled`) diutamakan,
+       lalu error pertama. Tanpa error, `cancelled` dilempar jika download dihentikan di tengah jalan.
+    """
+    for error in errors:
+        if isinstance(error, cancelled):
+            raise error
+    if errors:
+        raise errors[0]
+    if state['abort']:
+        raise cancelled("Download cancelled.")
+
+
+def verify_download_folder(jobs, folder, log, checksum_file=None):
+    """Mode verifikasi massal: meng-hash file yang sudah ada di `folder` secara paralel, menghapus
+       file yang rusak dan mengembalikannya ke antrian job store (pre-flight tidak bisa lagi menganggapnya
+       lengkap). Mengembalikan dict hasil verify_folder, atau None jika file checksum tidak bisa dibaca.
+    """
+    paths = [checksum_file] if checksum_file else find_checksum_files(folder)
+    try:
+        checksums = load_checksums(paths)
+    except OSError as e:
+        log.error("Failed to read checksum file", str(e))
+        return None
+    if not checksums:
+        log.warning("No checksums found in", checksum_file or folder)
+        return {'ok': [], 'mismatch': [], 'missing': []}
+
+    log.info(f"Verifying {len(checksums)} files with", ", ".join(paths))
+    started = time.time()
+
+    def on_result(name, status):
+        if status == 'mismatch':
+            log.error("Checksum mismatch", name)
+
+    results = verify_folder(folder, checksums, on_result=on_result)
+    removed = []
+    for name in results['mismatch']:
+        try:
+            os.remove(os.path.join(folder, name))
+            removed.append(name)
+        except OSError as e:
+            log.error("Failed to remove corrupt file", str(e))
+    requeued = jobs.requeue_files(removed)
+    log.done(f"Verified in {time.time() - started:.2f}s",
+             f"{len(results['ok'])} OK, {len(results['mismatch'])} mismatched, {len(results['missing'])} missing, "
+             f"{len(requeued)} re-queued")
+    return results
+
+
+class DownloadJob:
+    """Link fuckingfast.co yang sudah di-resolve dan siap didownload."""
+    def __init__(self, link, download_url, file_name_raw, size=None, metrics=None):
+        self.link = link
+        self.download_url = download_url
+        self.file_name_raw = file_name_raw
+        self.file_name = re.sub(r'[<>:"/\\|?*]', '_', file_name_raw)
+        self.size = size # Dari HEAD, None jika tidak diketahui
+        self.metrics = metrics or JobMetrics(link) # Metrik percobaan download pertama
+
+
+class EngineListener:
+    """Callback dari engine. Semua dipanggil dari thread engine, jadi GUI harus
+       menjadwalkan pembaruan widget ke main thread sendiri.
+    """
+    def on_progress(self, engine):
+        """Progress worker berubah (setiap PROGRESS_INTERVAL detik dan setiap link selesai diproses)."""
+
+    def on_link_done(self, link):
+        """Link selesai didownload dan sudah ditandai done di job store."""
+
+    def on_queue_changed(self):
+        """Daftar link di job store berubah di luar download biasa (halaman post diganti link-linknya)."""
+
+    def on_finished(self, cancelled):
+        """Semua worker selesai. `cancelled` True jika dihentikan dengan stop()."""
+
+
+# --- Engine Download (tanpa GUI) ---
+
+class DownloadEngine:
+    """Resolver + worker download tanpa ketergantungan pada Tkinter.
+       Link diambil dari job store, log dikirim ke `log` (objek dengan success/error/done/warning/info)
+       dan perubahan status ke `listener` (EngineListener).
+    """
+    def __init__(self, jobs, download_folder, log, listener=None, workers=DEFAULT_WORKERS,
+                 segments=DEFAULT_SEGMENTS, input_file=INPUT_FILE, cache_file=RESOLVE_CACHE_FILE,
+                 checksum_file=None, preflight=True, metrics_file=None, metrics_port=None, limiter=None,
+                 adaptive=False, min_workers=1, space_check=True, post_command=None):
+        self.jobs = jobs
+        self.download_folder = download_folder
+        self.log = log
+        self.listener = listener or EngineListener()
+        self.worker_count = workers
+        self.segments_per_file = segments
+        self.input_file = input_file # Diekspor ulang di akhir run, None = tidak diekspor
+        self.checksum_file = checksum_file # None = semua file .md5 di folder download
+        self.checksums = {} # Nama file (huruf kecil) -> MD5
+        self.preflight = preflight # Lewati link yang filenya sudah lengkap di folder download
+        self.space_check = space_check # Jangan mulai jika antrian tidak muat di disk
+        self.post_command = post_command # Perintah shell untuk setiap set arsip yang lengkap, None = tidak ada
+        self.post_pool = None # Worker perintah pasca-download (satu set sekaligus)
+        self.post_futures = []
+        self.archive_sets = {} # Nama set (huruf kecil) -> semua link part-nya, termasuk yang sudah selesai
+        self.link_sets = {} # Link -> nama set (huruf kecil)
+        self.sets_submitted = set() # Set yang sudah diserahkan ke worker pasca-download di run ini
+        self.verified_files = set() # Nama file (huruf kecil) yang MD5-nya sudah cocok selama download
+
+        self.should_stop = False
+        self.is_running = False
+        self.skip_events = [threading.Event() for _ in range(workers)] # Satu Event skip per worker
+        self.worker_states = [idle_worker_state() for _ in range(workers)] # State progress per file/worker
+        self.state_lock = threading.Lock()
+        self.resolve_cache = ResolveCache(cache_file, RESOLVE_CACHE_TTL)
+        self.resolve_metrics = {} # Link -> JobMetrics resolve sebelum download (halaman post, pre-flight, cek disk)
+        self.transport = HttpTransport() # Dipakai semua request halaman dan file
+        try:
+            self.metrics = MetricsRecorder(metrics_file, metrics_port) # JSONL per job + Prometheus opsional
+        except OSError as e:
+            # Misalnya port sudah dipakai: download tetap jalan, hanya tanpa endpoint Prometheus
+            self.log.error(f"Failed to start metrics endpoint on port {metrics_port}", str(e))
+            self.metrics = MetricsRecorder(metrics_file)
+        self.limiter = limiter or RateLimiter() # Batas kecepatan global, bisa dipakai ulang antar run
+        # Mode otomatis: `workers` menjadi batas atas dan controller menentukan berapa yang aktif
+        self.controller = AdaptiveController(min_workers, workers) if adaptive else None
+        self.jobs_drained = False # Worker sudah menerima tanda antrian habis
+        self.queued_links = collections.deque() # Link run ini yang belum diambil resolver
+        self.queue_closed = True # Resolver sudah selesai, link baru menunggu run berikutnya
+        self.active_links = set() # Link yang sedang di-resolve, menunggu worker atau didownload
+        self.skipped_links = set() # Link yang dilewati di run ini (tetap di antrian job store)
+        self.total_links = 0
+        self.finished_links = 0
+
+    # --- Kontrol ---
+
+    def start(self):
+        """Menjalankan run() di thread baru dan mengembalikan thread tersebut."""
+        self.is_running = True
+        thread = threading.Thread(target=self.run, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        """Menghentikan semua download. File .part disimpan untuk dilanjutkan nanti."""
+        self.should_stop = True
+
+    def skip_all(self):
+        """Melewati download yang sedang berjalan di semua worker."""
+        for event in self.skip_events:
+            event.set()
+
+    def skip_worker(self, worker_id):
+        """Melewati download yang sedang berjalan di satu worker saja."""
+        if worker_id < len(self.skip_events):
+            self.skip_events[worker_id].set()
+
+    def skip_link(self, link):
+        """Melewati satu link di run ini: download yang berjalan dihentikan (.part disimpan) dan link
+           yang belum mulai tidak diproses. Link tetap di antrian untuk run berikutnya.
+        """
+        with self.state_lock:
+            if link in self.queued_links:
+                self.queued_links.remove(link)
+                self.total_links -= 1
+                return
+            self.skipped_links.add(link)
+            for worker_id, state in enumerate(self.worker_states):
+                if state['link'] == link:
+                    self.skip_events[worker_id].set()
+
+    def retry_link(self, link):
+        """Mengembalikan link (gagal, dilewati atau selesai) ke antrian. Selama run, link ikut diproses
+           jika resolver belum selesai. Mengembalikan True jika link diproses di run ini; link yang sedang
+           diproses tidak diubah.
+        """
+        with self.state_lock:
+            if link in self.active_links:
+                return False
+            self.skipped_links.discard(link)
+            queued = not self.queue_closed
+            if queued and link not in self.queued_links:
+                self.queued_links.append(link)
+                self.total_links += 1
+        self.jobs.set_state(link, PENDING)
+        return queued
+
+    def set_priority(self, link, priority):
+        """Mengubah bobot bandwidth link, juga untuk download yang sedang berjalan."""
+        self.jobs.set_priority(link, priority)
+        with self.state_lock:
+            for state in self.worker_states:
+                if state['link'] == link and state['share']:
+                    state['share'].weight = priority
+
+    def progress(self):
+        """Salinan progress saat ini: (state per worker, total speed, link selesai, total link)."""
+        with self.state_lock:
+            states = [{key: state[key] for key in ('file', 'link', 'downloaded', 'total', 'speed')}
+                      for state in self.worker_states]
+            return states, sum(state['speed'] for state in states), self.finished_links, self.total_links
+
+    # --- Loop Utama ---
+
+    def run(self):
+        """Menjalankan resolver dan sejumlah worker download lalu menunggu semuanya selesai.
+           Mengembalikan jumlah link yang belum selesai.
+        """
+        self.is_running = True
+        os.makedirs(self.download_folder, exist_ok=True)
+        self.load_checksums()
+        self.resolve_metrics = {}
+
+        # Ambil link yang belum selesai dari job store (Ini adalah daftar statis untuk sesi ini)
+        links = self.jobs.unfinished_links()
+        if any(is_post_url(link) for link in links):
+            self.expand_posts([link for link in links if is_post_url(link)])
+            # Halaman yang gagal (atau tidak berisi link) tetap di job store dengan errornya,
+            # tetapi bukan link fuckingfast.co, jadi tidak ikut pre-flight, cek ruang disk dan resolver
+            links = [link for link in self.jobs.unfinished_links() if not is_post_url(link)]
+        if links and self.preflight:
+            links = self.skip_complete_files(links)
+
+        if not links:
+            self.log.warning("No links to process.", "")
+            return self.finish_without_download()
+        if self.space_check and not self.has_free_space(links):
+            return self.finish_without_download() # Link tetap di antrian
+
+        links = self.order_by_archive_set(links)
+        self.total_links = len(links)
+        self.finished_links = 0
+        self.open_queue(links)
+        worker_count = min(self.worker_count, len(links))
+        if self.controller:
+            self.log.info(f"Processing {len(links)} links with",
+                          f"{self.controller.minimum}-{worker_count} worker(s), adjusted automatically")
+        else:
+            self.log.info(f"Processing {len(links)} links with", f"{worker_count} worker(s)")
+        self.jobs_drained = False
+        self.sets_submitted, self.verified_files, self.post_futures = set(), set(), []
+        if self.post_command:
+            self.post_pool = ThreadPoolExecutor(max_workers=1)
+
+        finished_event = threading.Event()
+        ticker = threading.Thread(target=self.progress_ticker, args=(finished_event,), daemon=True)
+        ticker.start()
+        self.run_workers(links, worker_count)
+        self.finish_post_commands()
+        finished_event.set()
+        self.export_input()
+        self.save_resolve_cache()
+
+        stats = self.http_stats()
+        self.log.info("HTTP stats", f"{stats['requests']} requests, {stats['retries']} retries, "
+                                    f"{stats['failures']} failed, avg. latency {stats['avg_latency_ms']:.0f}ms")
+
+        # Penanganan Akhir Loop Download
+        if self.should_stop:
+            self.log.done("Download process cancelled by user.", "")
+        else:
+            self.log.done("All download tasks finished.", "")
+
+        self.metrics.close()
+        self.is_running = False
+        self.listener.on_finished(self.should_stop)
+        return self.jobs.unfinished
+
+    def finish_without_download(self):
+        """Mengakhiri run() sebelum ada download yang dimulai."""
+        self.export_input()
+        self.save_resolve_cache()
+        self.metrics.close()
+        self.is_running = False
+        self.listener.on_finished(False)
+        return self.jobs.unfinished
+
+    def run_workers(self, links, worker_count):
+        """Resolver thread + `worker_count` thread download. Kembali setelah semuanya selesai."""
+        # Resolver mengisi antrian job terbatas (look-ahead) selagi worker mendownload
+        job_queue = queue.Queue(maxsize=worker_count + RESOLVE_LOOKAHEAD)
+        resolver = threading.Thread(target=self.resolve_worker, args=(job_queue, worker_count), daemon=True)
+        resolver.start()
+
+        workers = [threading.Thread(target=self.download_worker, args=(worker_id, job_queue), daemon=True)
+                   for worker_id in range(worker_count)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        resolver.join()
+
+    def http_stats(self):
+        return self.transport.stats()
+
+    def open_queue(self, links):
+        """Mengisi antrian link run ini. Link bisa ditambah (retry_link) atau dibuang (skip_link) selama berjalan."""
+        with self.state_lock:
+            self.queued_links = collections.deque(links)
+            self.queue_closed = False
+            self.active_links = set()
+            self.skipped_links = set()
+
+    def next_queued_link(self):
+        """Link berikutnya untuk resolver. '' jika antrian kosong tetapi link lain masih diproses (retry_link
+           masih bisa menambah link), None (dan antrian ditutup) jika semuanya sudah selesai atau Stop ditekan.
+        """
+        with self.state_lock:
+            if not self.queued_links:
+                if self.active_links and not self.should_stop:
+                    return ''
+                self.queue_closed = True
+                return None
+            link = self.queued_links.popleft()
+            self.active_links.add(link)
+            return link
+
+    def link_skipped(self, link):
+        with self.state_lock:
+            return link in self.skipped_links
+
+    def export_input(self):
+        """Menulis ulang file input dengan link yang belum selesai."""
+        if not self.input_file:
+            return
+        try:
+            remaining = self.jobs.export_links(self.input_file)
+            self.log.info(f"Exported {remaining} remaining links to", self.input_file)
+        except Exception as e:
+            self.log.error(f"Failed to export {self.input_file}", str(e))
+
+    def save_resolve_cache(self):
+        """Menulis perubahan cache resolve yang belum tersimpan ke disk."""
+        try:
+            self.resolve_cache.flush()
+        except OSError as e:
+            self.log.error("Failed to save resolve cache", str(e))
+
+    def load_checksums(self):
+        """Memuat checksum MD5 dari file yang diberikan atau dari file .md5 di folder download."""
+        paths = [self.checksum_file] if self.checksum_file else find_checksum_files(self.download_folder)
+        try:
+            self.checksums = load_checksums(paths)
+        except OSError as e:
+            self.log.error("Failed to read checksum file", str(e))
+            self.checksums = {}
+            return
+        if self.checksums:
+            self.log.info(f"Loaded {len(self.checksums)} checksums from", ", ".join(paths))
+
+    # --- Ruang Disk ---
+
+    def has_free_space(self, links):
+        """Membandingkan sisa ukuran antrian dengan ruang kosong di folder download.
+           Ukuran part yang belum diketahui diperkirakan dari part lain di set arsipnya; hanya link tanpa
+           perkiraan yang di-resolve dulu (satu per set, bersamaan), sisanya di-resolve saat giliran download.
+           Yang tetap tidak diketahui tidak dihitung.
+        """
+        sizes = {link: self.remaining_size(link) for link in links}
+        unknown = [link for link, size in sizes.items() if size is None]
+        estimated = {}
+        if unknown:
+            names = self.known_file_names()
+            estimated = self.estimate_sizes(names, unknown)
+            wanted = {} # Set arsip (atau link tanpa set) -> link yang di-resolve
+            for link in unknown:
+                if link not in estimated:
+                    key = archive_set(names.get(link) or '')
+                    wanted.setdefault(key.lower() if key else link, link)
+            if wanted:
+                self.resolve_up_front(list(wanted.values()))
+                sizes.update((link, self.remaining_size(link)) for link in wanted.values())
+                unknown = [link for link in unknown if sizes[link] is None]
+                estimated = self.estimate_sizes(self.known_file_names(), unknown)
+            unknown = [link for link in unknown if link not in estimated]
+        needed = sum(size for size in sizes.values() if size is not None) + sum(estimated.values())
+
+        free = shutil.disk_usage(self.download_folder).free
+        detail = f"{format_size(needed)} needed, {format_size(free)} free"
+        if estimated:
+            detail += f" ({len(estimated)} part sizes estimated from their archive set)"
+        if unknown:
+            detail += f" ({len(unknown)} links with unknown size not counted)"
+        if needed + FREE_SPACE_MARGIN > free:
+            self.log.error("Not enough free disk space, not starting", f"{detail} in {self.download_folder}")
+            return False
+        self.log.info("Disk space OK", detail)
+        return True
+
+    def estimate_sizes(self, names, links):
+        """Perkiraan ukuran `links` dari part terbesar yang ukurannya diketahui di set arsip yang sama
+           (part satu set sama besar kecuali yang terakhir, jadi perkiraannya tidak terlalu kecil).
+           Mengembalikan dict link -> perkiraan, hanya untuk link yang bisa diperkirakan.
+        """
+        largest = {} # Set arsip (huruf kecil) -> ukuran part terbesar
+        for link, size in self.jobs.totals().items():
+            key = archive_set(names.get(link) or '')
+            if key and size:
+                largest[key.lower()] = max(largest.get(key.lower(), 0), size)
+        estimates = {}
+        for link in links:
+            key = archive_set(names.get(link) or '')
+            if key and key.lower() in largest:
+                estimates[link] = largest[key.lower()]
+        return estimates
+
+    def remaining_size(self, link):
+        """Byte yang masih perlu ditulis untuk `link` (ukuran dari cache resolve atau job store, dikurangi
+           ruang yang sudah dipakai file .part), atau None jika ukurannya belum diketahui.
+        """
+        record = self.jobs.get(link) or {}
+        cached = self.resolve_cache.get(link) or {}
+        size = cached.get('size') or record.get('total')
+        file_name = cached.get('file_name') or record.get('file_name')
+        if not size or not file_name:
+            return None
+        try:
+            stat = os.stat(os.path.join(self.download_folder, file_name + PART_SUFFIX))
+        except OSError:
+            return size
+        # Blok yang sudah dipesan preallocate juga dihitung, walaupun ukuran file belum sebesar itu
+        return max(0, size - max(stat.st_size, getattr(stat, 'st_blocks', 0) * 512))
+
+    def stop_if_disk_full(self, error):
+        """Disk penuh: hentikan semua download, karena link berikutnya pasti gagal juga."""
+        if isinstance(error, OSError) and error.errno == errno.ENOSPC:
+            self.log.error("Disk is full.", "Stopping all downloads; partial files are kept for resume.")
+            self.should_stop = True
+
+    # --- Halaman Post FitGirl ---
+
+    def expand_posts(self, post_urls):
+        """Mengganti setiap halaman post fitgirl-repacks.site di job store dengan semua link fuckingfast.co
+           di dalamnya (urut per part). Link yang sudah ada (antri atau selesai) dilewati, dan link baru
+           di-resolve bersamaan agar nama dan ukurannya sudah diketahui sebelum download.
+        """
+        known = {link_key(link) for link in self.jobs.all_links()}
+        for post_url in post_urls:
+            if self.should_stop:
+                break
+            try:
+                response = self.transport.get(post_url)
+                raise_for_status(response)
+                found = extract_post_links(response.text)
+            except requests.exceptions.RequestException as e:
+                self.log.error("Failed to fetch game page", f"{post_url} ({e})")
+                self.jobs.set_state(post_url, FAILED, error=str(e))
+                continue
+            if not found:
+                self.log.error("No fuckingfast.co links found on", post_url)
+                self.jobs.set_state(post_url, FAILED, error="No fuckingfast.co links found")
+                continue
+
+            added = self.jobs.replace_link(post_url, [link for link in found if link_key(link) not in known])
+            known.update(link_key(link) for link in added)
+            self.log.info(f"Expanded game page into {len(added)} links "
+                          f"({len(found) - len(added)} already queued or done)", post_url)
+            self.resolve_up_front(added)
+        self.listener.on_queue_changed()
+
+    def resolve_up_front(self, links):
+        """Me-resolve `links` bersamaan (hasilnya masuk cache resolve) dan menyimpan nama serta ukurannya."""
+        if not links:
+            return
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=PREFLIGHT_WORKERS) as pool:
+            jobs = list(pool.map(self.resolve_link, links))
+        total = 0
+        for link, job in zip(links, jobs):
+            if job is not None: # Yang gagal dicoba lagi oleh resolver saat download
+                self.jobs.set_state(link, PENDING, total=job.size, file_name=job.file_name)
+                self.resolve_metrics[link] = job.metrics
+                total += job.size or 0
+        resolved = sum(job is not None for job in jobs)
+        self.log.info(f"Resolved {resolved}/{len(links)} links in {time.time() - started:.2f}s",
+                      f"{format_size(total)} to download")
+
+    # --- Pre-flight ---
+
+    def skip_complete_files(self, links):
+        """Menandai selesai link yang filenya sudah lengkap di folder download, sebelum transfer dimulai.
+           Folder diindeks sekali (nama -> ukuran), lalu ukuran yang diharapkan diambil dari cache resolve,
+           job store, HEAD, atau resolve baru, secara bersamaan. Mengembalikan link yang masih perlu didownload.
+        """
+        with os.scandir(self.download_folder) as entries:
+            index = {entry.name.lower(): entry.stat().st_size for entry in entries if entry.is_file()}
+        if not index:
+            return links
+
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=PREFLIGHT_WORKERS) as pool:
+            sizes = list(pool.map(lambda link: self.complete_file_size(link, index), links))
+
+        remaining = []
+        skipped = 0
+        saved = 0
+        for link, size in zip(links, sizes):
+            if size is None:
+                remaining.append(link)
+                continue
+            self.jobs.set_state(link, DONE, bytes_done=size)
+            self.listener.on_link_done(link)
+            skipped += 1
+            saved += size
+        if skipped:
+            self.log.done(f"Pre-flight: {skipped} files already complete ({time.time() - started:.2f}s)",
+                          f"{format_size(saved)} not downloaded")
+        return remaining
+
+    def complete_file_size(self, link, index):
+        """Ukuran file jika `link` sudah lengkap di folder download (ada di `index`), selain itu None."""
+        if self.should_stop:
+            return None
+        record = self.jobs.get(link) or {}
+        cached = self.resolve_cache.get(link)
+        file_name = (cached or {}).get('file_name') or record.get('file_name')
+        if file_name is None:
+            job = self.resolve_link(link) # Hasilnya masuk cache, jadi resolver tidak mengulanginya
+            if job is None:
+                return None
+            self.jobs.set_state(link, PENDING, total=job.size, file_name=job.file_name)
+            self.resolve_metrics[link] = job.metrics
+            cached = {'download_url': job.download_url, 'size': job.size}
+            file_name = job.file_name
+
+        local_size = index.get(file_name.lower())
+        if local_size is None:
+            return None
+        expected = (cached or {}).get('size') or record.get('total')
+        if not expected and cached:
+            expected = self.fetch_file_size(cached['download_url'])
+        return local_size if expected and local_size == expected else None
+
+    # --- Resolve ---
+
+    def resolve_worker(self, job_queue, worker_count):
+        """Me-resolve link satu per satu ke antrian job, lalu mengirim tanda selesai ke tiap worker."""
+        while not self.should_stop:
+            link = self.next_queued_link()
+            if link is None:
+                break
+            if not link:
+                time.sleep(PROGRESS_INTERVAL)
+                continue
+            self.jobs.set_state(link, RESOLVING)
+            job = self.resolve_link(link)
+            if not self.record_resolve(link, job):
+                continue
+            if not self.put_until_stopped(job_queue, job):
+                break
+
+        for _ in range(worker_count):
+            self.put_until_stopped(job_queue, None)
+
+    def record_resolve(self, link, job):
+        """Mencatat hasil resolve di job store. Mengembalikan False jika gagal (link selesai diproses)."""
+        if job is None:
+            self.jobs.set_state(link, FAILED, error="Could not resolve link")
+            self.mark_link_finished(link)
+            return False
+        self.jobs.set_state(link, PENDING, total=job.size, file_name=job.file_name)
+        return True
+
+    def put_until_stopped(self, job_queue, item):
+        """Memasukkan item ke antrian penuh tanpa terjebak jika Stop ditekan."""
+        while not self.should_stop:
+            try:
+                job_queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker_parked(self, worker_id):
+        """True jika controller adaptif sedang tidak memakai worker ini (download berjalan tetap diselesaikan)."""
+        return self.controller is not None and worker_id >= self.controller.limit
+
+    def download_worker(self, worker_id, job_queue):
+        """Mengambil job yang sudah di-resolve dari antrian sampai habis atau Stop ditekan. (Berjalan di thread worker)"""
+        while not self.should_stop and not (self.jobs_drained and self.worker_parked(worker_id)):
+            if self.worker_parked(worker_id):
+                time.sleep(0.5)
+                continue
+            try:
+                job = job_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if job is None:
+                self.jobs_drained = True # Worker yang sedang diparkir juga boleh berhenti
+                break
+            output_path = self.start_job(job, worker_id)
+            if output_path is None:
+                continue
+
+            link = job.link
+            attempts = {CHECKSUM_MISMATCH: 0, URL_EXPIRED: 0}
+            metrics = job.metrics
+            while job is not None:
+                outcome = self.download_and_record(job, output_path, worker_id, metrics)
+                if not self.retry_allowed(job, outcome, attempts):
+                    break
+                metrics = JobMetrics(link, metrics.attempt + 1)
+                # Halaman fuckingfast.co di-resolve ulang, download lanjut dari .part yang ada
+                resolved = self.resolve_link(link) if outcome == URL_EXPIRED else None
+                job = self.next_attempt(job, outcome, resolved, metrics)
+            self.finish_job(link, worker_id)
+
+        if self.should_stop:
+            self.log.error(f"Global stop received by worker #{worker_id + 1}.", "Stopping link processing.")
+
+    def start_job(self, job, worker_id):
+        """Awal pemrosesan job oleh worker. Mengembalikan path file tujuan, atau None jika link dilewati user."""
+        if self.link_skipped(job.link):
+            self.log.warning("Link skipped by user.", job.link)
+            self.mark_link_finished(job.link)
+            return None
+        # Skip hanya berlaku untuk file yang sedang diproses worker ini
+        self.skip_events[worker_id].clear()
+        self.log.info(f"[#{worker_id + 1}] Processing", job.link)
+        self.jobs.set_state(job.link, DOWNLOADING)
+        return os.path.join(self.download_folder, job.file_name)
+
+    def finish_job(self, link, worker_id):
+        """Akhir pemrosesan link oleh worker (selesai, gagal atau dibatalkan)."""
+        with self.state_lock:
+            self.worker_states[worker_id] = idle_worker_state()
+        self.mark_link_finished(link)
+
+    def retry_allowed(self, job, outcome, attempts):
+        """Memutuskan apakah hasil download_file dicoba lagi. `attempts` menghitung percobaan ulang per jenis.
+           Setelah batasnya, link ditandai gagal.
+        """
+        if outcome is None or self.should_stop:
+            return False
+        attempts[outcome] += 1
+        if outcome == CHECKSUM_MISMATCH:
+            if attempts[outcome] >= MAX_CHECKSUM_ATTEMPTS:
+                self.jobs.set_state(job.link, FAILED, error="Checksum mismatch")
+                self.log.error(f"Giving up after {attempts[outcome]} checksum mismatches", job.file_name_raw)
+                return False
+            self.log.warning("Re-queued after checksum mismatch",
+                             f"{job.file_name_raw} (attempt {attempts[outcome] + 1}/{MAX_CHECKSUM_ATTEMPTS})")
+            return True
+
+        if attempts[outcome] > MAX_RERESOLVE_ATTEMPTS:
+            # Status FAILED dan error terakhir sudah dicatat oleh download_file
+            self.log.error(f"Giving up after {MAX_RERESOLVE_ATTEMPTS} re-resolves", job.file_name_raw)
+            return False
+        self.resolve_cache.invalidate(job.link)
+        self.log.warning("Direct URL expired or stalled, re-resolving",
+                         f"{job.file_name_raw} (attempt {attempts[outcome]}/{MAX_RERESOLVE_ATTEMPTS})")
+        return True
+
+    def reresolved_job(self, job, resolved, metrics):
+        """Job dengan URL langsung yang baru, tetapi nama file lama agar .part yang ada dilanjutkan."""
+        metrics.page_latency = resolved.metrics.page_latency
+        metrics.parse_time = resolved.metrics.parse_time
+        return DownloadJob(job.link, resolved.download_url, job.file_name_raw, resolved.size or job.size, metrics)
+
+    def next_attempt(self, job, outcome, resolved, metrics):
+        """Job untuk percobaan berikutnya setelah retry_allowed. Setelah URL_EXPIRED, `resolved` adalah hasil
+           resolve ulang (lihat reresolved_job). Mengembalikan None (link ditandai gagal) jika resolve ulang gagal.
+        """
+        if outcome == URL_EXPIRED:
+            if resolved is None:
+                self.jobs.set_state(job.link, FAILED, error="Could not re-resolve link")
+                return None
+            job = self.reresolved_job(job, resolved, metrics)
+        self.jobs.set_state(job.link, DOWNLOADING)
+        return job
+
+    def download_and_record(self, job, output_path, worker_id, metrics):
+        """Satu percobaan download_file, lalu metriknya dicatat. Mengembalikan hasil download_file."""
+        self.begin_attempt(job, worker_id, metrics)
+        outcome = self.download_file(job.download_url, output_path, job.file_name_raw, job.link, worker_id, metrics)
+        self.record_attempt(job, worker_id, metrics, outcome)
+        return outcome
+
+    def begin_attempt(self, job, worker_id, metrics):
+        """Mendaftarkan percobaan download di state worker: metrik, link dan bagian bandwidth-nya."""
+        share = self.limiter.share(self.jobs.priority(job.link))
+        with self.state_lock:
+            self.worker_states[worker_id] = idle_worker_state()
+            self.worker_states[worker_id].update({'metrics': metrics, 'link': job.link, 'share': share})
+            if job.link in self.skipped_links: # Dilewati tepat saat worker mengambilnya
+                self.skip_events[worker_id].set()
+
+    def record_attempt(self, job, worker_id, metrics, outcome):
+        """Melengkapi metrik satu percobaan download dari state worker lalu mencatatnya."""
+        with self.state_lock:
+            state = self.worker_states[worker_id]
+            if state['file'] is not None:
+                metrics.bytes_written = sum(state['counters']) - metrics.start_bytes
+        metrics.end_stall(time.time())
+
+        if outcome:
+            result = outcome # CHECKSUM_MISMATCH atau URL_EXPIRED
+        else:
+            result = {DONE: 'done', FAILED: 'failed'}.get((self.jobs.get(job.link) or {}).get('state'), 'cancelled')
+        try:
+            self.metrics.record(metrics, result)
+        except OSError as e:
+            self.log.error("Failed to write metrics", str(e))
+
+    def mark_link_finished(self, link):
+        """Menambah hitungan link yang sudah diproses dan memberi tahu listener."""
+        with self.state_lock:
+            self.finished_links += 1
+            self.active_links.discard(link)
+        self.listener.on_progress(self)
+
+    def mark_link_done(self, processed_link, size):
+        """Menandai link selesai di job store dan memberi tahu listener."""
+        try:
+            self.jobs.set_state(processed_link, DONE, bytes_done=size)
+            self.log.done("Link marked as done", f"Remaining links: {self.jobs.unfinished}")
+            self.listener.on_link_done(processed_link)
+            self.check_archive_set(processed_link)
+        except Exception as e:
+            self.log.error(f"Failed to mark link {processed_link} as done", str(e))
+
+    # --- Set Arsip ---
+
+    def order_by_archive_set(self, links):
+        """Mengelompokkan antrian per set arsip .partNN.rar agar satu set selesai sebelum set berikutnya,
+           dan mencatat semua part tiap set (juga yang sudah selesai sebelumnya) untuk check_archive_set.
+           Nama file diambil dari job store, cache resolve atau fragment link; link yang namanya belum
+           diketahui (link fuckingfast.co tanpa fragment) di-resolve dulu.
+        """
+        names = self.known_file_names()
+        unnamed = [link for link in links if not names.get(link)]
+        if unnamed:
+            self.resolve_up_front(unnamed)
+            names = self.known_file_names()
+        self.archive_sets, self.link_sets = {}, {}
+        for link, name in names.items():
+            key = archive_set(name)
+            if key:
+                self.archive_sets.setdefault(key.lower(), []).append(link)
+                self.link_sets[link] = key.lower()
+        return group_by_archive_set(links, names)
+
+    def known_file_names(self):
+        """Link -> nama file untuk semua link di job store, '' jika belum diketahui."""
+        names = {}
+        for link, name in self.jobs.file_names().items():
+            if not name:
+                name = (self.resolve_cache.get(link) or {}).get('file_name') or link_file_name(link)
+            names[link] = name
+        return names
+
+    def check_archive_set(self, link):
+        """Jika semua part set milik `link` sudah selesai, set itu dicatat di log dan diserahkan ke worker
+           perintah pasca-download, sementara set berikutnya tetap didownload.
+        """
+        key = self.link_sets.get(link)
+        if key is None:
+            return
+        members = self.jobs.get_many(self.archive_sets[key])
+        if any(job['state'] != DONE for job in members.values()):
+            return
+        with self.state_lock:
+            if key in self.sets_submitted: # Dua part terakhir bisa selesai bersamaan
+                return
+            self.sets_submitted.add(key)
+        parts = sorted(((member, job['file_name'] or link_file_name(member), job['total'] or job['bytes_done'])
+                        for member, job in members.items()), key=lambda part: parse_part_name(part[1])[1] or 0)
+        set_name = archive_set(parts[0][1]) or parts[0][1]
+        self.log.done(f"Archive set complete: {set_name}", f"{len(parts)} part(s)")
+        if self.post_pool is not None:
+            self.post_futures.append(self.post_pool.submit(self.run_post_command, key, set_name, parts))
+
+    def run_post_command(self, key, set_name, parts):
+        """Memverifikasi set (ada, ukuran, MD5) lalu menjalankan perintah pasca-download. Part yang rusak
+           dihapus dan di-retry, perintahnya dijalankan setelah set lengkap lagi. (Berjalan di worker hook)
+        """
+        if self.should_stop:
+            return
+        try:
+            broken = set(verify_set(self.download_folder, [(name, size) for _, name, size in parts],
+                                    self.checksums, self.verified_files))
+            if broken:
+                self.log.error(f"Archive set {set_name} failed verification, re-queued", ", ".join(sorted(broken)))
+                with self.state_lock:
+                    self.sets_submitted.discard(key)
+                for link, name, _ in parts:
+                    if name in broken:
+                        path = os.path.join(self.download_folder, name)
+                        if os.path.exists(path):
+                            os.remove(path)
+                        self.jobs.set_state(link, PENDING, bytes_done=0, error="Archive set verification failed")
+                        self.retry_link(link)
+                return
+
+            paths = [os.path.join(self.download_folder, name) for _, name, _ in parts]
+            self.log.info(f"Running post-download command for {set_name}", self.post_command)
+            started = time.time()
+            code, output = run_command(self.post_command, set_name, paths, self.download_folder)
+            if code == 0:
+                self.log.success(f"Post-download command finished for {set_name} ({time.time() - started:.1f}s)",
+                                 output or "no output")
+            else:
+                self.log.error(f"Post-download command failed for {set_name} (exit {code})", output or "no output")
+        except Exception as e:
+            self.log.error(f"Post-download command failed for {set_name}", str(e))
+
+    def finish_post_commands(self):
+        """Menunggu perintah pasca-download yang masih antre atau berjalan. Setelah Stop, set yang belum
+           mulai dibatalkan dan hanya perintah yang sedang berjalan ditunggu.
+        """
+        if self.post_pool is None:
+            return
+        pending = sum(1 for future in self.post_futures if not future.done())
+        if pending:
+            self.log.info(f"Waiting for {pending} post-download command(s)",
+                          "queued sets are skipped" if self.should_stop else "")
+        self.post_pool.shutdown(wait=True, cancel_futures=self.should_stop)
+        self.post_pool = None
+
+    def resolve_link(self, link):
+        """Mengambil halaman fuckingfast.co dan mencari URL download serta ukuran file.
+           Mengembalikan DownloadJob, atau None jika gagal. Link yang ada di cache tidak di-scrape lagi.
+        """
+        cached = self.cached_job(link)
+        if cached:
+            return cached
+
+        metrics = JobMetrics(link)
+        try:
+            requested = time.perf_counter()
+            response = self.transport.get(link, stream=True, metrics=metrics)
+            metrics.page_latency = time.perf_counter() - requested
+            if response.status_code != 200:
+                response.close()
+                self.log.error("Failed to fetch page", f"{link} (Status: {response.status_code})")
+                return None
+
+            # Baca halaman sampai title dan URL ketemu (BeautifulSoup hanya sebagai cadangan)
+            parse_started = time.perf_counter()
+            file_name_raw, download_url = extract_page_info(response)
+            metrics.parse_time = time.perf_counter() - parse_started
+            if not download_url:
+                self.log.error("No download URL found", link)
+                return None
+
+            self.log.info("Found URL", f"{download_url[:50]}...")
+            job = DownloadJob(link, download_url, file_name_raw, self.fetch_file_size(download_url), metrics)
+            self.resolve_cache.put(job)
+            return job
+
+        except Exception as e:
+            self.log.error(f"Failed processing link {link}", str(e))
+            return None
+
+    def cached_job(self, link):
+        """DownloadJob dari cache resolve jika URL-nya belum lebih tua dari RESOLVE_URL_MAX_AGE, selain itu None.
+           Waktu halaman dan parse dari resolve sebelumnya di run ini dipakai untuk metrik percobaan pertama.
+        """
+        cached = self.resolve_cache.get(link, max_age=RESOLVE_URL_MAX_AGE)
+        if not cached:
+            return None
+        self.log.info("Using cached URL for", cached['file_name_raw'])
+        return DownloadJob(link, cached['download_url'], cached['file_name_raw'], cached['size'],
+                           self.resolve_metrics.pop(link, None))
+
+    def fetch_file_size(self, download_url):
+        """Mengambil ukuran file lewat HEAD. Mengembalikan None jika tidak diketahui."""
+        try:
+            response = self.transport.head(download_url)
+            if response.status_code == 200 and response.headers.get('content-length'):
+                return int(response.headers['content-length'])
+        except (requests.exceptions.RequestException, ValueError):
+            pass
+        return None
+
+    # --- Download ---
+
+    def download_file(self, download_url, output_path, file_name_raw, link_to_remove, worker_id, metrics):
+        """Mendownload file ke `.part`, melanjutkan dengan Range jika ada sisa download sebelumnya,
+           memperbarui progress worker, dan menghapus link jika sukses.
+           Mengembalikan CHECKSUM_MISMATCH (file sudah dibuang) atau URL_EXPIRED (.part disimpan) jika perlu
+           dicoba lagi, selain itu None.
+        """
+        part_path = output_path + PART_SUFFIX
+        meta_path = part_path + RESUME_SUFFIX
+        expected_md5 = self.checksums.get(os.path.basename(output_path).lower())
+        hasher = None
+        try:
+            start_time = time.time()
+
+            # Cek apakah ada file .part dari sesi sebelumnya
+            resume_info = load_resume_info(meta_path)
+            resume_from = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+
+            if segmented_resume(resume_info, resume_from):
+                # Lanjutkan download bersegmen: file sudah dialokasikan penuh, progress ada di sidecar
+                total_size = self.resume_segmented(resume_info, file_name_raw)
+                try:
+                    downloaded_size = self.download_segmented(download_url, part_path, meta_path, total_size,
+                                                              resume_info.get('etag'), resume_info['segments'],
+                                                              None, worker_id, file_name_raw)
+                except RangeNotSupported:
+                    self.discard_partial(part_path, file_name_raw)
+                    return self.download_file(download_url, output_path, file_name_raw, link_to_remove, worker_id,
+                                              metrics)
+            else:
+                request_headers = dict(FILE_HEADERS, **resume_headers(resume_info, resume_from,
+                                                                      self.segments_per_file > 1))
+                requested = time.perf_counter()
+                response = self.transport.get(download_url, headers=request_headers, stream=True, metrics=metrics)
+                metrics.ttfb = time.perf_counter() - requested
+
+                try:
+                    if part_complete(response.status_code, resume_info, resume_from):
+                        # File .part sudah lengkap, tinggal diganti namanya
+                        total_size = resume_from
+                        downloaded_size = 0
+                    else:
+                        raise_for_status(response)
+                        parsed = parse_resume_response(response.status_code, response.headers, resume_info,
+                                                       resume_from)
+                        if parsed is None:
+                            # File .part tidak cocok dengan server, buang dan mulai dari awal
+                            response.close()
+                            response = self.transport.get(download_url, headers=FILE_HEADERS, stream=True)
+                            raise_for_status(response)
+                            parsed = (int(response.headers.get('content-length', 0)), 0)
+                        total_size, resume_from = parsed
+                        etag = response.headers.get('etag')
+                        segments = self.plan_transfer(file_name_raw, resume_info, request_headers, resume_from,
+                                                      total_size, response.status_code)
+                        if segments:
+                            downloaded_size = self.download_segmented(download_url, part_path, meta_path, total_size,
+                                                                      etag, segments, response, worker_id, file_name_raw)
+                        else:
+                            save_resume_info(meta_path, download_url, total_size, etag)
+                            hasher = new_hasher() if expected_md5 else None
+                            downloaded_size = self.download_single(response, part_path, resume_from, total_size,
+                                                                   worker_id, file_name_raw, hasher)
+                finally:
+                    # Juga saat error setelah respons dibuka (misalnya sidecar atau preallocate gagal),
+                    # agar slot host di transport selalu dilepas
+                    response.close()
+
+            self.finish_download(link_to_remove, output_path, file_name_raw, expected_md5, hasher, total_size,
+                                 downloaded_size, start_time)
+
+        except requests.exceptions.RequestException as e:
+            status = e.response.status_code if e.response is not None else None
+            return self.download_failed(link_to_remove, part_path, file_name_raw, e, status,
+                                        isinstance(e, STALL_ERRORS))
+        except ChecksumMismatch as e:
+            return self.checksum_failed(link_to_remove, part_path, file_name_raw, e)
+        except StopIteration:
+            self.download_cancelled(link_to_remove, part_path, file_name_raw, worker_id)
+        except Exception as e:
+            self.write_failed(link_to_remove, part_path, file_name_raw, e)
+
+    # Bagian download_file yang tidak bergantung pada library HTTP, dipakai juga oleh engine asyncio
+
+    def resume_segmented(self, resume_info, file_name_raw):
+        """Mencatat di log download bersegmen yang dilanjutkan. Mengembalikan ukuran total file."""
+        done = sum(segment[2] for segment in resume_info['segments'])
+        self.log.info(f"Resuming {file_name_raw} from", format_size(done))
+        return resume_info['size']
+
+    def discard_partial(self, part_path, file_name_raw):
+        """Membuang .part dan sidecar-nya karena server tidak bisa melanjutkan (download diulang dari awal)."""
+        self.log.warning("Server can't resume, starting over", file_name_raw)
+        os.remove(part_path)
+        remove_resume_info(part_path + RESUME_SUFFIX)
+
+    def plan_transfer(self, file_name_raw, resume_info, request_headers, resume_from, total_size, status):
+        """Mencatat di log bagaimana download dimulai (dari awal, dilanjutkan atau diulang) setelah respons
+           pertama diterima. Mengembalikan segmen untuk download bersegmen, atau None untuk satu stream.
+        """
+        if resume_info and 'Range' in request_headers and resume_from == 0:
+            self.log.warning("Server can't resume, starting over", file_name_raw)
+        elif resume_from > 0:
+            self.log.info(f"Resuming {file_name_raw} from", format_size(resume_from))
+        self.log.info(f"Downloading {file_name_raw} ({format_size(total_size)})", "...")
+
+        segments = plan_segments(total_size, self.segments_per_file)
+        if status == 206 and resume_from == 0 and len(segments) > 1:
+            return segments
+        return None
+
+    def finish_download(self, link, output_path, file_name_raw, expected_md5, hasher, total_size, downloaded_size,
+                        start_time):
+        """Memeriksa MD5 (jika ada), mengganti nama .part menjadi nama akhir dan menandai link selesai.
+           `hasher` berisi hash yang dihitung sambil download, tanpa itu file di-hash dari disk.
+           Melempar ChecksumMismatch jika MD5 tidak cocok.
+        """
+        part_path = output_path + PART_SUFFIX
+        if expected_md5:
+            # Segmen ditulis tidak berurutan, jadi hanya download satu stream yang di-hash sambil jalan
+            digest = (hasher or hash_file(part_path)).hexdigest()
+            if digest != expected_md5:
+                raise ChecksumMismatch(f"MD5 {digest}, expected {expected_md5}")
+            self.log.success("Checksum OK", file_name_raw)
+            self.verified_files.add(os.path.basename(output_path).lower())
+
+        # File lengkap: ganti nama .part menjadi nama akhir
+        os.replace(part_path, output_path)
+        remove_resume_info(part_path + RESUME_SUFFIX)
+
+        # JIKA SUKSES: Panggil fungsi penghapusan link
+        self.mark_link_done(link, total_size)
+
+        # Final logging
+        total_duration = time.time() - start_time
+        avg_speed_bps = downloaded_size / total_duration if total_duration > 0 else 0
+        self.log.success(f"Downloaded in {total_duration:.2f}s (Avg. {format_speed(avg_speed_bps)})", f"{output_path}")
+
+    def download_failed(self, link, part_path, file_name_raw, error, status, stalled):
+        """Error HTTP/koneksi: link ditandai gagal dan .part disimpan. Mengembalikan URL_EXPIRED jika URL download
+           ditolak (`status` di INVALID_URL_STATUSES) atau koneksinya macet (`stalled`), selain itu None.
+        """
+        message = str(error) or type(error).__name__
+        self.log.error(f"Download failed for {file_name_raw}", message)
+        self.log_partial_kept(part_path)
+        self.jobs.set_state(link, FAILED, bytes_done=partial_size(part_path), error=message)
+        if status in INVALID_URL_STATUSES:
+            # URL download sudah mati, resolve ulang di percobaan berikutnya
+            self.resolve_cache.invalidate(link)
+            return URL_EXPIRED
+        if stalled:
+            return URL_EXPIRED
+        return None
+
+    def checksum_failed(self, link, part_path, file_name_raw, error):
+        """MD5 tidak cocok: .part dibuang dan link kembali pending. Mengembalikan CHECKSUM_MISMATCH."""
+        self.log.error(f"Checksum mismatch for {file_name_raw}", str(error))
+        os.remove(part_path)
+        remove_resume_info(part_path + RESUME_SUFFIX)
+        self.jobs.set_state(link, PENDING, bytes_done=0, error=str(error))
+        return CHECKSUM_MISMATCH
+
+    def download_cancelled(self, link, part_path, file_name_raw, worker_id):
+        """Stop atau Skip: .part disimpan dan link tetap pending."""
+        self.log_partial_kept(part_path)
+        self.jobs.set_state(link, PENDING, bytes_done=partial_size(part_path))
+
+        skip_event = self.skip_events[worker_id]
+        if self.should_stop:
+            self.log.error("Download stopped by user.", f"Cancelled: {file_name_raw}")
+        elif skip_event.is_set():
+            self.log.warning("Download skipped by user.", f"Skipped: {file_name_raw}. Moving to next link...")
+            skip_event.clear()
+
+    def write_failed(self, link, part_path, file_name_raw, error):
+        """Error lain (biasanya disk): link ditandai gagal, dan semua download berhenti jika disk penuh."""
+        self.log.error(f"Error writing file {file_name_raw}", str(error))
+        self.stop_if_disk_full(error)
+        self.jobs.set_state(link, FAILED, bytes_done=partial_size(part_path), error=str(error))
+
+    def prepare_segmented(self, part_path, meta_path, download_url, total_size, etag, segments):
+        """Mengalokasikan file .part penuh (jika belum ada) agar tiap segmen bisa menulis di posisinya,
+           lalu menyimpan sidecar segmen. Mengembalikan counters (byte yang sudah ditulis per segmen).
+        """
+        if not os.path.exists(part_path):
+            with open(part_path, 'wb') as f:
+                preallocate(f, 0, total_size)
+        save_resume_info(meta_path, download_url, total_size, etag, segments)
+        return [segment[2] for segment in segments]
+
+    def download_single(self, response, part_path, resume_from, total_size, worker_id, file_name_raw, hasher=None):
+        """Mendownload file lewat satu koneksi. Mengembalikan jumlah byte yang didownload sesi ini.
+           `hasher` (jika ada) di-hash dengan bagian yang sudah ada di disk lalu dengan data baru sambil ditulis.
+        """
+        counters = [resume_from]
+        state = self.set_worker_file(worker_id, file_name_raw, total_size, counters)
+        try:
+            if hasher and resume_from > 0:
+                hash_file(part_path, hasher, limit=resume_from)
+            with open(part_path, 'ab' if resume_from > 0 else 'wb') as f:
+                # Pesan sisa ukuran file tanpa mengubah ukurannya (posisi resume = ukuran file)
+                preallocate(f, resume_from, total_size - resume_from, keep_size=True)
+                copy_to_file(response, f, counters, 0, state, hasher=hasher, metrics=state['metrics'],
+                             share=state['share'])
+        finally:
+            response.close()
+
+        if total_size > 0 and counters[0] < total_size:
+            raise requests.exceptions.ConnectionError(
+                f"Connection closed at {counters[0]} of {total_size} bytes")
+        return counters[0] - resume_from
+
+    def download_segmented(self, download_url, part_path, meta_path, total_size, etag, segments,
+                           first_response, worker_id, file_name_raw):
+        """Mendownload file lewat beberapa koneksi Range sekaligus ke file yang sudah dialokasikan.
+           `segments` berisi [start, end, done] per segmen; `first_response` (jika ada) dipakai untuk segmen 0.
+           Mengembalikan jumlah byte yang didownload sesi ini.
+        """
+        counters = self.prepare_segmented(part_path, meta_path, download_url, total_size, etag, segments)
+        already_done = sum(counters)
+        state = self.set_worker_file(worker_id, file_name_raw, total_size, counters)
+        errors = []
+
+        def fetch_segment(index, response):
+            start, end, _ = segments[index]
+            try:
+                if counters[index] > end - start:
+                    return
+                if response is None:
+                    range_headers = dict(FILE_HEADERS, **segment_headers(segments[index], counters[index], etag))
+                    requested = time.perf_counter()
+                    response = self.transport.get(download_url, headers=range_headers, stream=True,
+                                                  metrics=state['metrics'])
+                    if state['metrics'] and state['metrics'].ttfb is None:
+                        state['metrics'].ttfb = time.perf_counter() - requested
+                    response.raise_for_status()
+                    if response.status_code != 206:
+                        raise RangeNotSupported(f"Server ignored Range for segment {index + 1}")
+
+                # Tiap segmen punya file handle sendiri dan menulis di offset-nya masing-masing
+                with open(part_path, 'r+b') as f:
+                    f.seek(start + counters[index])
+                    copy_to_file(response, f, counters, index, state, limit=end - start + 1 - counters[index],
+                                 metrics=state['metrics'], share=state['share'])
+
+                if counters[index] < end - start + 1:
+                    raise requests.exceptions.ConnectionError(
+                        f"Segment {index + 1} closed at {counters[index]} of {end - start + 1} bytes")
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                if response is not None:
+                    response.close()
+
+        threads = []
+        for index in range(len(segments)):
+            response = first_response if index == 0 else None
+            thread = threading.Thread(target=fetch_segment, args=(index, response), daemon=True)
+            thread.start()
+            threads.append(thread)
+
+        # Simpan posisi tiap segmen ke sidecar secara berkala (progress dihitung oleh progress_ticker)
+        while True:
+            alive = [thread for thread in threads if thread.is_alive()]
+            if not alive:
+                break
+            alive[0].join(SIDECAR_SAVE_INTERVAL)
+            save_segment_progress(meta_path, download_url, total_size, etag, segments, counters)
+        save_segment_progress(meta_path, download_url, total_size, etag, segments, counters)
+
+        raise_segment_errors(errors, state, StopIteration)
+        return sum(counters) - already_done
+
+    def set_worker_file(self, worker_id, file_name_raw, total_size, counters):
+        """Mendaftarkan file yang sedang didownload worker. `counters` diisi oleh copy_to_file
+           dan dibaca oleh progress_ticker. Mengembalikan dict state worker.
+        """
+        with self.state_lock:
+            state = self.worker_states[worker_id]
+            state.update({'file': file_name_raw, 'total': total_size, 'counters': counters,
+                          'downloaded': sum(counters), 'speed': 0.0})
+            state['last_downloaded'] = state['downloaded']
+            metrics = state['metrics']
+            if metrics:
+                metrics.file_name = file_name_raw
+                metrics.start_bytes = state['downloaded']
+                metrics.started = metrics.started or time.time()
+        return state
+
+    def progress_ticker(self, finished_event):
+        """Menghitung progress, kecepatan dan status Stop/Skip setiap PROGRESS_INTERVAL detik,
+           sehingga loop download tidak perlu memeriksanya di setiap chunk. (Berjalan di thread)
+        """
+        last_time = control_time = time.time()
+        control_speeds = []
+        control_errors = self.http_errors()
+        while not finished_event.wait(PROGRESS_INTERVAL):
+            self.limiter.apply_schedule() # Pergantian jam di jadwal batas kecepatan
+            current_time = time.time()
+            delta_t = current_time - last_time
+            last_time = current_time
+            with self.state_lock:
+                for worker_id, state in enumerate(self.worker_states):
+                    if state['file'] is None:
+                        continue
+                    downloaded = sum(state['counters'])
+                    state['speed'] = (downloaded - state['last_downloaded']) / delta_t
+                    state['downloaded'] = state['last_downloaded'] = downloaded
+                    if state['metrics']:
+                        state['metrics'].add_sample(current_time, state['speed'])
+                    if self.should_stop or self.skip_events[worker_id].is_set():
+                        state['abort'] = True
+                total_speed = sum(state['speed'] for state in self.worker_states)
+                self.metrics.set_speed(total_speed)
+            if self.controller:
+                control_speeds.append(total_speed)
+                if current_time - control_time >= CONTROL_INTERVAL:
+                    errors = self.http_errors()
+                    self.adjust_workers(sum(control_speeds) / len(control_speeds), errors - control_errors)
+                    control_time, control_speeds, control_errors = current_time, [], errors
+            self.listener.on_progress(self)
+
+    def http_errors(self):
+        """Jumlah retry + request gagal sejauh ini (sinyal 429/5xx/koneksi putus untuk controller)."""
+        stats = self.http_stats()
+        return stats['retries'] + stats['failures']
+
+    def adjust_workers(self, throughput, errors):
+        """Satu keputusan controller adaptif; perubahan jumlah worker dicatat di log."""
+        old_limit = self.controller.limit
+        new_limit = self.controller.update(throughput, errors, self.limiter.rate)
+        if new_limit != old_limit:
+            self.log.info(f"Active workers {old_limit} -> {new_limit}", self.controller.reason)
+
+    def log_partial_kept(self, part_path):
+        """Memberi tahu bahwa file .part disimpan untuk dilanjutkan nanti."""
+        if os.path.exists(part_path):
+            self.log.info("Partial file kept for resume", part_path)
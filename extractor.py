@@ -0,0 +1,109 @@
+import codecs
+import html
+import re
+
+# Pola yang dicari di halaman fuckingfast.co
+META_TITLE_RE = re.compile(
+    r'<meta\s+(?=[^>]*\bname=["\']title["\'])[^>]*\bcontent=(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+DOWNLOAD_FUNCTION = 'function download'
+# Penutup URL wajib ada agar URL yang terpotong di batas chunk tidak ikut cocok
+DOWNLOAD_URL_RE = re.compile(r'window\.open\(["\'](https?://[^\s"\'\)]+)(?=[\s"\'\)])')
+
+READ_CHUNK_SIZE = 16 * 1024
+DRAIN_LIMIT = 64 * 1024 # Sisa halaman sekecil ini tetap dibaca agar koneksi bisa dipakai ulang
+DEFAULT_FILE_NAME = "default_file_name"
+
+
+class PageScanner:
+    """Mencari meta title dan URL `window.open(...)` di dalam `function download` pada potongan
+       halaman yang datang bertahap. Dipakai oleh extract_page_info dan engine asyncio.
+    """
+    def __init__(self, encoding=None):
+        self.decoder = _incremental_decoder(encoding)
+        self.text = ''
+        self.title = None
+        self.download_url = None
+        self.function_at = -1
+
+    def feed(self, chunk):
+        """Menambah satu potongan body. Mengembalikan True jika title dan URL sudah ditemukan."""
+        # Cari mulai sedikit sebelum chunk baru agar pola yang terpotong di batas chunk tetap ketemu
+        search_from = max(0, len(self.text) - 512)
+        self.text += self.decoder.decode(chunk)
+
+        if self.title is None:
+            match = META_TITLE_RE.search(self.text, search_from)
+            if match:
+                self.title = html.unescape(match.group(1) if match.group(1) is not None else match.group(2))
+        if self.function_at < 0:
+            self.function_at = self.text.find(DOWNLOAD_FUNCTION, max(0, search_from - len(DOWNLOAD_FUNCTION)))
+        if self.function_at >= 0 and self.download_url is None:
+            match = DOWNLOAD_URL_RE.search(self.text, self.function_at)
+            if match:
+                self.download_url = match.group(1)
+        return self.title is not None and self.download_url is not None
+
+    def finish(self):
+        """Dipanggil jika halaman habis sebelum feed() mengembalikan True: parse lengkap dengan BeautifulSoup.
+           Mengembalikan (file_name_raw, download_url).
+        """
+        self.text += self.decoder.decode(b'', final=True)
+        soup_title, soup_url = extract_with_soup(self.text)
+        return self.title or soup_title, self.download_url or soup_url
+
+
+def extract_page_info(response, chunk_size=READ_CHUNK_SIZE):
+    """Membaca halaman secara bertahap dan berhenti begitu meta title dan URL `window.open(...)`
+       di dalam `function download` sudah ditemukan. Jika halaman habis sebelum keduanya ketemu,
+       BeautifulSoup dipakai sebagai cadangan. `response` harus dibuka dengan `stream=True`.
+       Mengembalikan (file_name_raw, download_url); download_url None jika tidak ditemukan.
+    """
+    scanner = PageScanner(response.encoding)
+    try:
+        for chunk in response.iter_content(chunk_size):
+            if scanner.feed(chunk):
+                _drain(response)
+                return scanner.title, scanner.download_url
+    finally:
+        response.close()
+
+    # Jalur cepat gagal: parse lengkap dengan BeautifulSoup
+    return scanner.finish()
+
+
+def extract_with_soup(text):
+    """Cara lama: parse seluruh halaman dengan BeautifulSoup lalu cari script `function download`."""
+    from bs4 import BeautifulSoup # Import berat, hanya saat dibutuhkan
+
+    soup = BeautifulSoup(text, 'html.parser')
+    meta_title = soup.find('meta', attrs={'name': 'title'})
+    file_name_raw = meta_title['content'] if meta_title else DEFAULT_FILE_NAME
+
+    for script in soup.find_all('script'):
+        if DOWNLOAD_FUNCTION in script.text:
+            match = DOWNLOAD_URL_RE.search(script.text)
+            return file_name_raw, match.group(1) if match else None
+    return file_name_raw, None
+
+
+def _drain(response):
+    """Membuang sisa body yang kecil agar koneksi keep-alive kembali ke pool, bukan diputus."""
+    remaining = response.headers.get('content-length')
+    raw = response.raw
+    if remaining is None or raw is None:
+        return
+    try:
+        left = int(remaining) - raw.tell()
+        if 0 < left <= DRAIN_LIMIT:
+            raw.read(left, decode_content=False)
+    except Exception:
+        pass
+
+
+def _incremental_decoder(encoding):
+    """Decoder bertahap sesuai encoding respons, agar karakter multi-byte di batas chunk aman."""
+    encoding = encoding or 'utf-8'
+    try:
+        return codecs.getincrementaldecoder(encoding)(errors='replace')
+    except LookupError:
+        return codecs.getincrementaldecoder('utf-8')(errors='replace')
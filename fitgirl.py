@@ -0,0 +1,69 @@
+import html
+import re
+from urllib.parse import unquote, urlsplit
+
+# Halaman post FitGirl dan link fuckingfast.co di dalamnya
+POST_URL_RE = re.compile(r'^https?://(?:www\.)?fitgirl-repacks\.site/[^?#\s]+', re.IGNORECASE)
+FUCKINGFAST_LINK_RE = re.compile(r'https?://(?:www\.)?fuckingfast\.co/[A-Za-z0-9]+(?:#[^\s"\'<>]*)?', re.IGNORECASE)
+PART_RE = re.compile(r'^(.*?)\.part(\d+)\.rar$', re.IGNORECASE)
+EXTRA_PREFIX = 'fg-' # fg-optional-*, fg-selective-*: file opsional/pilihan bahasa
+
+
+def is_post_url(link):
+    """True jika `link` adalah halaman post fitgirl-repacks.site, bukan link file."""
+    return bool(POST_URL_RE.match(link))
+
+
+def link_key(link):
+    """Identitas file di balik link: tanpa fragment dan tanpa huruf besar di host (untuk dedup)."""
+    parts = urlsplit(link)
+    return f"{parts.netloc.lower()}{parts.path}"
+
+
+def link_file_name(link):
+    """Nama file dari fragment `#Game_--_fitgirl-repacks.site_--_.part01.rar`, atau '' jika tidak ada."""
+    return unquote(urlsplit(link).fragment)
+
+
+def parse_part_name(file_name):
+    """'Game.part07.rar' -> ('Game', 7). File tanpa nomor part -> (file_name, None)."""
+    match = PART_RE.match(file_name)
+    if match:
+        return match.group(1), int(match.group(2))
+    return file_name, None
+
+
+def archive_set(file_name):
+    """Nama set arsip multi-part ('Game.part03.rar' -> 'Game'), atau None untuk file tunggal."""
+    base, number = parse_part_name(file_name)
+    return base if number is not None else None
+
+
+def group_by_archive_set(links, file_names):
+    """Mengurutkan ulang `links` agar semua part satu set arsip berurutan (menurut nomor part) di posisi
+       part pertamanya, sehingga satu set selesai sebelum set berikutnya dimulai. File tunggal dan link
+       yang namanya belum diketahui tetap di tempatnya. `file_names`: link -> nama file.
+    """
+    groups = {}
+    for link in links:
+        name = file_names.get(link) or ''
+        key = archive_set(name)
+        groups.setdefault(key.lower() if key else ('', link), []).append((parse_part_name(name)[1] or 0, link))
+    return [link for group in groups.values() for _, link in sorted(group, key=lambda part: part[0])]
+
+
+def part_sort_key(link):
+    """Urutan link: arsip utama dulu, lalu file fg-optional/fg-selective; di dalam satu set menurut nomor part."""
+    name = link_file_name(link)
+    base, number = parse_part_name(name)
+    return name.lower().startswith(EXTRA_PREFIX), base.lower(), number or 0
+
+
+def extract_post_links(page_html):
+    """Semua link fuckingfast.co di halaman post (termasuk optional/selective), tanpa duplikat,
+       diurutkan menurut set arsip dan nomor part.
+    """
+    links = {}
+    for match in FUCKINGFAST_LINK_RE.finditer(html.unescape(page_html)):
+        links.setdefault(link_key(match.group(0)), match.group(0))
+    return sorted(links.values(), key=part_sort_key)
@@ -0,0 +1,260 @@
+import os
+import sqlite3
+import threading
+import time
+
+# Status link di job store
+PENDING = 'pending'
+RESOLVING = 'resolving'
+DOWNLOADING = 'downloading'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class JobStore:
+    """Job store SQLite: satu baris per link dengan status dan byte yang sudah didownload.
+       Setiap perubahan status adalah satu UPDATE ber-primary-key (O(1) dan atomik),
+       sedangkan input.txt hanya dipakai untuk impor/ekspor.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                link TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                state TEXT NOT NULL,
+                bytes_done INTEGER NOT NULL DEFAULT 0,
+                total INTEGER,
+                file_name TEXT,
+                error TEXT,
+                updated REAL NOT NULL,
+                priority REAL NOT NULL DEFAULT 1
+            )""")
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(jobs)")]
+        if 'priority' not in columns: # Database dari versi sebelum ada prioritas
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN priority REAL NOT NULL DEFAULT 1")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, position)")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        # Jumlah link yang belum selesai, dijaga di memori agar tidak perlu COUNT di setiap update
+        self.unfinished = self.conn.execute("SELECT COUNT(*) FROM jobs WHERE state != ?", (DONE,)).fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # --- Impor / Ekspor input.txt ---
+
+    def input_is_newer(self, input_path):
+        """True jika input.txt diubah di luar aplikasi sejak terakhir diimpor/diekspor."""
+        if not os.path.exists(input_path):
+            return False
+        return str(os.path.getmtime(input_path)) != self.get_meta('input_mtime')
+
+    def import_if_newer(self, input_path):
+        """Mengimpor input.txt jika berubah sejak terakhir diimpor/diekspor.
+           Mengembalikan jumlah link yang diimpor, atau None jika tidak ada yang diimpor.
+        """
+        if not self.input_is_newer(input_path):
+            return None
+        with open(input_path, 'r') as f:
+            links = [line.strip() for line in f if line.strip()]
+        self.import_links(links, input_path)
+        return len(links)
+
+    def import_links(self, links, input_path=None):
+        """Menjadikan `links` daftar link yang belum selesai, sesuai urutannya.
+           Semua link di daftar menjadi pending (link 'done' yang ditulis ulang akan didownload lagi),
+           dan link belum selesai yang dihapus dari daftar dibuang.
+        """
+        now = time.time()
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.execute("DELETE FROM jobs WHERE state != ?", (DONE,))
+                for position, link in enumerate(links):
+                    self.conn.execute("""
+                        INSERT INTO jobs (link, position, state, updated) VALUES (?, ?, ?, ?)
+                        ON CONFLICT(link) DO UPDATE SET position = excluded.position, state = excluded.state,
+                                                        bytes_done = 0, error = NULL, updated = excluded.updated
+                        """, (link, position, PENDING, now))
+                if input_path and os.path.exists(input_path):
+                    self._set_meta('input_mtime', str(os.path.getmtime(input_path)))
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.unfinished = len(set(links))
+
+    def append_links(self, links):
+        """Menambahkan `links` di akhir daftar tanpa mengubah link lain. Link yang sudah ada dilewati.
+           Mengembalikan daftar link yang ditambahkan.
+        """
+        now = time.time()
+        with self.lock:
+            position = self.conn.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM jobs").fetchone()[0]
+            added = []
+            for link in links:
+                cursor = self.conn.execute(
+                    "INSERT OR IGNORE INTO jobs (link, position, state, updated) VALUES (?, ?, ?, ?)",
+                    (link, position + len(added), PENDING, now))
+                if cursor.rowcount:
+                    added.append(link)
+            self.unfinished += len(added)
+        return added
+
+    def replace_link(self, link, new_links):
+        """Mengganti `link` (misalnya halaman post) dengan `new_links` di posisi yang sama.
+           Link yang sudah ada di job store dilewati. Mengembalikan daftar link yang ditambahkan.
+        """
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute("SELECT position, state FROM jobs WHERE link = ?", (link,)).fetchone()
+            if row is None:
+                return []
+            position, state = row
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.execute("DELETE FROM jobs WHERE link = ?", (link,))
+                self.conn.execute("UPDATE jobs SET position = position + ? WHERE position > ?",
+                                  (len(new_links), position))
+                added = []
+                for offset, new_link in enumerate(new_links):
+                    cursor = self.conn.execute(
+                        "INSERT OR IGNORE INTO jobs (link, position, state, updated) VALUES (?, ?, ?, ?)",
+                        (new_link, position + offset, PENDING, now))
+                    if cursor.rowcount:
+                        added.append(new_link)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.unfinished += len(added) - (state != DONE)
+        return added
+
+    def export_links(self, input_path):
+        """Menulis link yang belum selesai ke input.txt (lewat file sementara agar atomik)."""
+        links = self.unfinished_links()
+        tmp_path = input_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.writelines(link + '\n' for link in links)
+        os.replace(tmp_path, input_path)
+        with self.lock:
+            self._set_meta('input_mtime', str(os.path.getmtime(input_path)))
+        return len(links)
+
+    # --- Query ---
+
+    def unfinished_links(self):
+        """Link yang belum selesai (termasuk yang gagal) sesuai urutan daftar."""
+        with self.lock:
+            rows = self.conn.execute("SELECT link FROM jobs WHERE state != ? ORDER BY position", (DONE,)).fetchall()
+        return [row[0] for row in rows]
+
+    def all_links(self):
+        """Semua link di job store, termasuk yang sudah selesai."""
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT link FROM jobs ORDER BY position")]
+
+    def file_names(self):
+        """Nama file setiap link di job store sesuai urutan daftar (None jika belum di-resolve)."""
+        with self.lock:
+            return dict(self.conn.execute("SELECT link, file_name FROM jobs ORDER BY position").fetchall())
+
+    def totals(self):
+        """Ukuran file setiap link di job store yang ukurannya sudah diketahui (link -> byte)."""
+        with self.lock:
+            return dict(self.conn.execute("SELECT link, total FROM jobs WHERE total IS NOT NULL").fetchall())
+
+    def get(self, link):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT state, bytes_done, total, file_name, error, priority FROM jobs WHERE link = ?",
+                (link,)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('state', 'bytes_done', 'total', 'file_name', 'error', 'priority'), row))
+
+    def list_jobs(self, since=None):
+        """Semua link yang belum selesai, ditambah yang selesai setelah `since`, sesuai urutan daftar.
+           Mengembalikan list dict (link, state, bytes_done, total, file_name, priority) untuk daftar job GUI.
+        """
+        with self.lock:
+            rows = self.conn.execute("""
+                SELECT link, state, bytes_done, total, file_name, priority FROM jobs
+                WHERE state != ? OR updated >= ? ORDER BY position""", (DONE, since or time.time())).fetchall()
+        return [dict(zip(('link', 'state', 'bytes_done', 'total', 'file_name', 'priority'), row)) for row in rows]
+
+    def get_many(self, links):
+        """Seperti get() untuk beberapa link sekaligus (satu query). Mengembalikan dict link -> job."""
+        if not links:
+            return {}
+        with self.lock:
+            rows = self.conn.execute(f"""
+                SELECT link, state, bytes_done, total, file_name, error, priority FROM jobs
+                WHERE link IN ({','.join('?' * len(links))})""", list(links)).fetchall()
+        return {row[0]: dict(zip(('state', 'bytes_done', 'total', 'file_name', 'error', 'priority'), row[1:]))
+                for row in rows}
+
+    def progress_totals(self, since):
+        """(ukuran total, ukuran yang selesai) dalam byte untuk link di list_jobs(since). Ukuran yang belum
+           diketahui tidak dihitung.
+        """
+        with self.lock:
+            total, done = self.conn.execute("""
+                SELECT COALESCE(SUM(CASE WHEN state = ? THEN COALESCE(total, bytes_done) ELSE total END), 0),
+                       COALESCE(SUM(CASE WHEN state = ? THEN COALESCE(total, bytes_done) END), 0)
+                FROM jobs WHERE state != ? OR updated >= ?""", (DONE, DONE, DONE, since)).fetchone()
+        return total, done
+
+    def priority(self, link):
+        with self.lock:
+            row = self.conn.execute("SELECT priority FROM jobs WHERE link = ?", (link,)).fetchone()
+        return row[0] if row else 1.0
+
+    # --- Update status (O(1)) ---
+
+    def set_state(self, link, state, bytes_done=None, total=None, file_name=None, error=None):
+        """Mengubah status satu link. Kolom yang None tidak diubah (kecuali error, yang dikosongkan)."""
+        with self.lock:
+            row = self.conn.execute("SELECT state FROM jobs WHERE link = ?", (link,)).fetchone()
+            if row is None:
+                return
+            self.conn.execute("""
+                UPDATE jobs SET state = ?, bytes_done = COALESCE(?, bytes_done), total = COALESCE(?, total),
+                                file_name = COALESCE(?, file_name), error = ?, updated = ?
+                WHERE link = ?""", (state, bytes_done, total, file_name, error, time.time(), link))
+            if row[0] != DONE and state == DONE:
+                self.unfinished -= 1
+            elif row[0] == DONE and state != DONE:
+                self.unfinished += 1
+
+    def set_priority(self, link, priority):
+        """Bobot bandwidth link (1 = normal, lebih besar = dilayani lebih dulu saat ada batas kecepatan)."""
+        with self.lock:
+            self.conn.execute("UPDATE jobs SET priority = ? WHERE link = ?", (priority, link))
+
+    def requeue_files(self, file_names):
+        """Mengembalikan link dengan nama file di `file_names` menjadi pending (misalnya setelah
+           verifikasi checksum gagal). Mengembalikan daftar link yang di-requeue.
+        """
+        wanted = {name.lower() for name in file_names}
+        with self.lock:
+            rows = self.conn.execute("SELECT link, file_name FROM jobs WHERE file_name IS NOT NULL").fetchall()
+        links = [link for link, file_name in rows if file_name.lower() in wanted]
+        for link in links:
+            self.set_state(link, PENDING, bytes_done=0, error="Checksum mismatch")
+        return links
+
+    # --- Meta ---
+
+    def get_meta(self, key):
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
@@ -1,16 +1,27 @@
 import os
-import re
-import requests
+import queue
 import threading
+import time
 import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext
-from bs4 import BeautifulSoup
 from datetime import datetime
-import time
-
-# --- Kelas Inti Aplikasi GUI ---
-
-class DownloaderApp:
+from engine import (DownloadEngine, EngineListener, verify_download_folder, INPUT_FILE, JOBS_FILE,
+                    DEFAULT_WORKERS, MAX_WORKERS, DEFAULT_SEGMENTS, MAX_SEGMENTS, format_size, format_speed,
+                    format_eta)
+from jobstore import JobStore, PENDING, DONE
+from ratelimit import RateLimiter, parse_rate, parse_schedule
+
+LOAD_BATCH = 500 # Link per batch saat mengisi text box
+FRAME_RATE = 20 # Berapa kali per detik log dan progress digambar ulang
+FRAME_INTERVAL_MS = 1000 // FRAME_RATE
+LOG_MAX_LINES = 2000 # Baris log terlama dibuang setelah batas ini
+LIST_REFRESH_MS = 500 # Daftar job dan progress total diperbarui dengan tick tetap ini, bukan per chunk
+ROW_HEIGHT = 20 # Tinggi baris daftar job (piksel)
+PRIORITIES = (("High", 4.0), ("Normal", 1.0), ("Low", 0.25)) # Bobot bandwidth yang bisa dipilih per link
+JOB_COLUMNS = (('file', "File", 300), ('state', "State", 85), ('size', "Size", 80), ('percent', "%", 60),
+               ('speed', "Speed", 90), ('eta', "ETA", 70), ('priority', "Priority", 60))
+
+class DownloaderApp(EngineListener):
     def __init__(self, root):
         self.root = root
         self.root.title("Fitgirl FuckingFast Downloader")
@@ -20,10 +31,25 @@ class DownloaderApp:
         self.download_path_var = tk.StringVar(value=os.path.join(os.getcwd(), "Downloads"))
         self.links_changed = tk.BooleanVar(value=False)
         self.is_running = False
-        self.should_stop = False 
-        self.should_skip = False 
+        self.worker_count_var = tk.IntVar(value=DEFAULT_WORKERS)
+        self.segments_var = tk.IntVar(value=DEFAULT_SEGMENTS)
+        self.auto_workers_var = tk.BooleanVar(value=False) # Workers = batas atas, jumlah aktif diatur controller
+        self.row_links = {} # iid baris daftar job -> link
+        self.row_order = [] # iid sesuai urutan tampilan, untuk mencari baris yang terlihat
+        self.row_values = {} # iid -> nilai terakhir yang digambar (baris yang tidak berubah tidak disentuh)
+        self.list_since = time.time() # Link yang selesai setelah waktu ini tetap tampil di daftar job
+        self.list_dirty = True # Baris terlihat perlu digambar ulang walau tidak ada download
+        self.list_generation = 0 # Batch pengisian daftar job dari reload sebelumnya dibatalkan
+        self.jobs = JobStore(JOBS_FILE) # Status setiap link, input.txt hanya untuk impor/ekspor
+        self.engine = None # DownloadEngine yang sedang berjalan
+        self.limiter = RateLimiter() # Batas kecepatan global, tetap berlaku antar Start
+        self.limit_var = tk.StringVar(value="0")
+        self.schedule_var = tk.StringVar(value="")
+        self.post_command_var = tk.StringVar(value="") # Perintah untuk setiap set arsip yang lengkap
         self.progress_text_var = tk.StringVar(value="0.00%") # Untuk persentase
         self.speed_text_var = tk.StringVar(value="Speed: N/A") # Untuk kecepatan
+        self.eta_text_var = tk.StringVar(value="ETA: N/A") # Sisa waktu seluruh antrian
+        self.control_text_var = tk.StringVar(value="") # Keputusan controller worker otomatis
 
         # --- Konfigurasi Tema Dark Mode ---
         self.colors = {
@@ -59,6 +85,9 @@ class DownloaderApp:
         # Pantau perubahan pada kotak teks link
         self.link_text.bind("<KeyRelease>", self.on_links_changed)
 
+        # Daftar job digambar ulang dengan tick tetap
+        self.root.after(LIST_REFRESH_MS, self.refresh_view)
+
     def setup_style(self):
         """Mengkonfigurasi style ttk untuk dark mode."""
         style = ttk.Style()
@@ -112,6 +141,22 @@ class DownloaderApp:
         # Style Label
         style.configure('TLabel', font=('Helvetica', 10))
 
+        # Style Tab (Links / Jobs)
+        style.configure('TNotebook', background=self.colors['bg'])
+        style.configure('TNotebook.Tab', background=self.colors['button'], foreground=self.colors['button_fg'],
+                        padding=(10, 3))
+        style.map('TNotebook.Tab', background=[('selected', self.colors['accent'])])
+
+        # Style Daftar Job
+        style.configure('Treeview',
+                        background=self.colors['input_bg'],
+                        fieldbackground=self.colors['input_bg'],
+                        foreground=self.colors['fg'],
+                        rowheight=ROW_HEIGHT,
+                        font=('Consolas', 9))
+        style.map('Treeview', background=[('selected', self.colors['accent'])])
+        style.configure('Treeview.Heading', background=self.colors['button'], foreground=self.colors['button_fg'])
+
 
     def create_widgets(self):
         """Membuat dan menata semua widget di jendela."""
@@ -131,11 +176,14 @@ class DownloaderApp:
         self.browse_button = ttk.Button(path_frame, text="Browse", command=self.browse_folder)
         self.browse_button.pack(side='left', padx=(5, 0))
 
-        # --- 2. Frame Input Link ---
-        links_frame = ttk.Frame(main_frame)
-        links_frame.pack(fill='x', pady=5)
+        # --- 2. Tab Input Link dan Daftar Job ---
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.pack(fill='x', pady=5)
 
-        ttk.Label(links_frame, text="Input Links:").pack(anchor='w')
+        links_frame = ttk.Frame(self.notebook, padding=(0, 5, 0, 0))
+        self.notebook.add(links_frame, text="Links")
+
+        ttk.Label(links_frame, text="Input Links (fuckingfast.co links or a fitgirl-repacks.site game page):").pack(anchor='w')
         
         # Frame untuk Text Box dan Save Button
         text_button_frame = ttk.Frame(links_frame)
@@ -155,6 +203,10 @@ class DownloaderApp:
         self.save_button = ttk.Button(text_button_frame, text="Save", command=self.save_links, state='disabled')
         self.save_button.pack(side='right', anchor='n', padx=(10, 0))
 
+        self.jobs_frame = ttk.Frame(self.notebook, padding=(0, 5, 0, 0))
+        self.notebook.add(self.jobs_frame, text="Jobs")
+        self.create_job_list(self.jobs_frame)
+
         # --- 3. Tombol Kontrol ---
         control_frame = ttk.Frame(main_frame)
         control_frame.pack(fill='x', pady=10)
@@ -169,6 +221,50 @@ class DownloaderApp:
         self.stop_button = ttk.Button(control_frame, text="Stop All", command=self.stop_all_downloads, style='Stop.TButton', state='disabled')
         self.stop_button.pack(side='left', fill='x', expand=True)
 
+        self.verify_button = ttk.Button(control_frame, text="Verify", command=self.start_verify_thread)
+        self.verify_button.pack(side='left', padx=(10, 0))
+
+        # Jumlah worker (file yang didownload bersamaan)
+        ttk.Label(control_frame, text="Workers:").pack(side='left', padx=(10, 5))
+        self.workers_spinbox = ttk.Spinbox(control_frame, from_=1, to=MAX_WORKERS, width=3,
+                                           textvariable=self.worker_count_var, state='readonly')
+        self.workers_spinbox.pack(side='left')
+        self.auto_workers_check = ttk.Checkbutton(control_frame, text="Auto", variable=self.auto_workers_var)
+        self.auto_workers_check.pack(side='left', padx=(5, 0))
+
+        # Jumlah koneksi per file (download bersegmen)
+        ttk.Label(control_frame, text="Connections:").pack(side='left', padx=(10, 5))
+        self.segments_spinbox = ttk.Spinbox(control_frame, from_=1, to=MAX_SEGMENTS, width=3,
+                                            textvariable=self.segments_var, state='readonly')
+        self.segments_spinbox.pack(side='left')
+
+        # --- 3b. Batas Kecepatan (bisa diubah selama download) ---
+        limit_frame = ttk.Frame(main_frame)
+        limit_frame.pack(fill='x', pady=(0, 5))
+
+        ttk.Label(limit_frame, text="Limit MB/s (0 = off):").pack(side='left', padx=(0, 5))
+        self.limit_spinbox = ttk.Spinbox(limit_frame, from_=0, to=1000, increment=0.5, width=6,
+                                         textvariable=self.limit_var, command=self.apply_limit)
+        self.limit_spinbox.pack(side='left')
+        self.limit_spinbox.bind("<Return>", self.apply_limit)
+        self.limit_spinbox.bind("<FocusOut>", self.apply_limit)
+
+        ttk.Label(limit_frame, text="Schedule:").pack(side='left', padx=(10, 5))
+        self.schedule_entry = ttk.Entry(limit_frame, textvariable=self.schedule_var)
+        self.schedule_entry.pack(side='left', fill='x', expand=True)
+        self.schedule_entry.bind("<Return>", self.apply_schedule)
+        self.schedule_entry.bind("<FocusOut>", self.apply_schedule)
+        ttk.Label(limit_frame, text="e.g. 09:00-18:00=1M,18:00-09:00=0").pack(side='left', padx=(5, 0))
+
+        # --- 3c. Perintah setelah satu set arsip selesai (ekstrak, pindah ke NAS, ...) ---
+        post_frame = ttk.Frame(main_frame)
+        post_frame.pack(fill='x', pady=(0, 5))
+
+        ttk.Label(post_frame, text="After each set:").pack(side='left', padx=(0, 5))
+        self.post_command_entry = ttk.Entry(post_frame, textvariable=self.post_command_var)
+        self.post_command_entry.pack(side='left', fill='x', expand=True)
+        ttk.Label(post_frame, text="e.g. unrar x -o+ {first} D:\\Games\\").pack(side='left', padx=(5, 0))
+
         # --- 4. Progress Bar & Info ---
         progress_info_frame = ttk.Frame(main_frame)
         progress_info_frame.pack(fill='x', pady=(5, 0))
@@ -180,10 +276,17 @@ class DownloaderApp:
         self.percent_label = ttk.Label(progress_info_frame, textvariable=self.progress_text_var, width=6)
         self.percent_label.pack(side='right')
 
+        # Label Sisa Waktu
+        self.eta_label = ttk.Label(progress_info_frame, textvariable=self.eta_text_var, width=13)
+        self.eta_label.pack(side='right', padx=(10, 0))
+
         # Label Kecepatan
         self.speed_label = ttk.Label(progress_info_frame, textvariable=self.speed_text_var, width=15)
         self.speed_label.pack(side='right', padx=(10, 0))
 
+        # Keputusan controller worker otomatis dan alasannya
+        self.control_label = ttk.Label(progress_info_frame, textvariable=self.control_text_var)
+        self.control_label.pack(side='right', padx=(10, 0))
 
         # --- 5. Status Log ---
         log_frame = ttk.Frame(main_frame)
@@ -201,6 +304,49 @@ class DownloaderApp:
                                                  relief='solid')
         self.log_text.pack(fill='both', expand=True)
 
+    def create_job_list(self, parent):
+        """Daftar job (satu baris per link) dengan tombol dan menu klik kanan untuk skip, retry dan prioritas."""
+        list_frame = ttk.Frame(parent)
+        list_frame.pack(fill='both', expand=True)
+
+        self.job_scrollbar = ttk.Scrollbar(list_frame, orient='vertical')
+        self.job_tree = ttk.Treeview(list_frame, columns=[column for column, _, _ in JOB_COLUMNS], show='headings',
+                                     height=10, selectmode='extended', yscrollcommand=self.on_job_list_scrolled)
+        self.job_scrollbar.config(command=self.job_tree.yview)
+        for column, heading, width in JOB_COLUMNS:
+            self.job_tree.heading(column, text=heading)
+            self.job_tree.column(column, width=width, stretch=(column == 'file'),
+                                 anchor='w' if column == 'file' else 'e')
+        self.job_tree.tag_configure('done', foreground=self.colors['done'])
+        self.job_tree.tag_configure('failed', foreground=self.colors['error'])
+        self.job_tree.tag_configure('downloading', foreground=self.colors['info'])
+        self.job_tree.tag_configure('resolving', foreground=self.colors['warning'])
+        self.job_tree.pack(side='left', fill='both', expand=True)
+        self.job_scrollbar.pack(side='right', fill='y')
+        self.job_tree.bind("<Button-3>", self.show_job_menu)
+        self.job_tree.bind("<Configure>", self.mark_list_dirty)
+
+        # Aksi untuk baris yang dipilih
+        actions_frame = ttk.Frame(parent)
+        actions_frame.pack(fill='x', pady=(5, 0))
+        ttk.Button(actions_frame, text="Skip", style='Skip.TButton', command=self.skip_selected).pack(side='left')
+        ttk.Button(actions_frame, text="Retry", command=self.retry_selected).pack(side='left', padx=(5, 0))
+        ttk.Label(actions_frame, text="Priority:").pack(side='left', padx=(10, 5))
+        for label, weight in PRIORITIES:
+            ttk.Button(actions_frame, text=label, width=7,
+                       command=lambda w=weight: self.prioritize_selected(w)).pack(side='left', padx=(0, 5))
+
+        menu_colors = {'bg': self.colors['input_bg'], 'fg': self.colors['fg'],
+                       'activebackground': self.colors['accent'], 'activeforeground': self.colors['button_fg']}
+        self.job_menu = tk.Menu(self.root, tearoff=0, **menu_colors)
+        self.job_menu.add_command(label="Skip", command=self.skip_selected)
+        self.job_menu.add_command(label="Retry", command=self.retry_selected)
+        priority_menu = tk.Menu(self.job_menu, tearoff=0, **menu_colors)
+        for label, weight in PRIORITIES:
+            priority_menu.add_command(label=f"{label} ({weight:g})",
+                                      command=lambda w=weight: self.prioritize_selected(w))
+        self.job_menu.add_cascade(label="Priority", menu=priority_menu)
+
     # --- Fungsi Callback Widget ---
 
     def browse_folder(self):
@@ -212,19 +358,29 @@ class DownloaderApp:
             self.log.info("Download folder set to", folder)
 
     def load_links_from_file(self):
-        """Membaca input.txt dan mengisinya ke text box."""
+        """Mengimpor input.txt ke job store jika berubah, lalu mengisi text box secara bertahap."""
         try:
-            if os.path.exists('input.txt'):
-                with open('input.txt', 'r') as f:
-                    links = f.read()
-                    self.link_text.insert('1.0', links)
-                self.log.info("Loaded links from", 'input.txt')
-            else:
+            if self.jobs.import_if_newer(INPUT_FILE) is not None:
+                self.log.info("Imported links from", INPUT_FILE)
+            elif not os.path.exists(INPUT_FILE):
                 self.log.info("input.txt not found.", "Creating a new one on save.")
+
+            links = self.jobs.unfinished_links()
+            self.insert_links_in_batches(links, 0)
+            self.reload_job_list()
+            self.log.info(f"Loaded {len(links)} links from", JOBS_FILE)
             self.save_button.config(state='disabled')
             self.links_changed.set(False)
         except Exception as e:
-            self.log.error("Failed to read input.txt", str(e))
+            self.log.error("Failed to load links", str(e))
+
+    def insert_links_in_batches(self, links, start):
+        """Mengisi text box per LOAD_BATCH link agar daftar besar tidak membekukan GUI saat startup."""
+        batch = links[start:start + LOAD_BATCH]
+        if not batch:
+            return
+        self.link_text.insert('end-1c', "".join(link + '\n' for link in batch))
+        self.root.after(1, self.insert_links_in_batches, links, start + LOAD_BATCH)
 
     def on_links_changed(self, event=None):
         """Dipanggil setiap kali teks di kotak link berubah."""
@@ -233,28 +389,103 @@ class DownloaderApp:
             self.links_changed.set(True)
 
     def save_links(self):
-        """Menyimpan konten text box ke input.txt."""
+        """Mengimpor konten text box ke job store dan mengekspornya ke input.txt."""
         try:
-            links = self.link_text.get('1.0', 'end-1c') 
-            with open('input.txt', 'w') as f:
-                f.write(links)
-            self.log.done("Links saved to", 'input.txt')
+            links_raw = self.link_text.get('1.0', 'end-1c')
+            links = [line.strip() for line in links_raw.splitlines() if line.strip()]
+            self.jobs.import_links(links)
+            self.jobs.export_links(INPUT_FILE)
+            self.reload_job_list()
+            self.log.done("Links saved to", INPUT_FILE)
             self.save_button.config(state='disabled')
             self.links_changed.set(False)
         except Exception as e:
             self.log.error("Failed to save input.txt", str(e))
 
+    def apply_limit(self, event=None):
+        """Menerapkan batas kecepatan global dari spinbox (langsung berlaku untuk download yang berjalan)."""
+        try:
+            rate = parse_rate(self.limit_var.get())
+        except ValueError as e:
+            self.log.error("Invalid speed limit", str(e))
+            return
+        if rate != self.limiter.manual_rate:
+            self.limiter.set_rate(rate)
+            self.log.info("Speed limit set to", format_speed(rate) if rate else "unlimited")
+
+    def apply_schedule(self, event=None):
+        """Menerapkan jadwal batas kecepatan per jam dari kotak Schedule."""
+        try:
+            schedule = parse_schedule(self.schedule_var.get())
+        except ValueError as e:
+            self.log.error("Invalid speed schedule", str(e))
+            return
+        if schedule != self.limiter.schedule:
+            self.limiter.set_schedule(schedule)
+            self.log.info("Speed schedule set to", self.schedule_var.get().strip() or "none")
+
     def skip_current_download(self):
-        """Mengatur flag untuk melewati download saat ini."""
+        """Melewati download yang sedang berjalan di semua worker."""
         if self.is_running:
-            self.should_skip = True
+            self.engine.skip_all()
             self.log.warning("Skip requested.", "Moving to next link...")
-            self.skip_button.config(state='disabled') 
+
+    def selected_links(self):
+        return [self.row_links[iid] for iid in self.job_tree.selection() if iid in self.row_links]
+
+    def show_job_menu(self, event):
+        """Menu klik kanan; baris di bawah kursor ikut dipilih jika belum."""
+        iid = self.job_tree.identify_row(event.y)
+        if not iid:
+            return
+        if iid not in self.job_tree.selection():
+            self.job_tree.selection_set(iid)
+        try:
+            self.job_menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            self.job_menu.grab_release()
+
+    def skip_selected(self):
+        """Melewati link yang dipilih di run ini (yang sedang didownload dihentikan, .part disimpan)."""
+        links = self.selected_links()
+        if not links or not self.is_running:
+            return
+        for link in links:
+            self.engine.skip_link(link)
+        self.log.warning(f"Skip requested for {len(links)} link(s).", "They stay queued for the next run")
+        self.list_dirty = True
+
+    def retry_selected(self):
+        """Mengembalikan link yang dipilih (gagal, dilewati atau selesai) ke antrian."""
+        links = self.selected_links()
+        if not links:
+            return
+        if self.is_running:
+            queued = sum(1 for link in links if self.engine.retry_link(link))
+            self.log.info(f"Retry: {queued} link(s) queued in this run,", f"{len(links) - queued} on the next Start")
+        else:
+            for link in links:
+                self.jobs.set_state(link, PENDING)
+            self.reload_link_text()
+            self.log.info("Retry: queued for the next Start", f"{len(links)} link(s)")
+        self.list_dirty = True
+
+    def prioritize_selected(self, weight):
+        """Bobot bandwidth link yang dipilih, langsung berlaku untuk download yang berjalan."""
+        links = self.selected_links()
+        for link in links:
+            if self.is_running:
+                self.engine.set_priority(link, weight)
+            else:
+                self.jobs.set_priority(link, weight)
+        if links:
+            self.log.info(f"Priority {weight:g} set for", f"{len(links)} link(s)")
+            self.list_dirty = True
 
     def stop_all_downloads(self):
-        """Mengatur flag untuk menghentikan semua proses download."""
+        """Menghentikan semua proses download lewat engine."""
         if self.is_running:
-            self.should_stop = True
+            self.engine.stop()
             self.log.error("Stop requested.", "Stopping all downloads...")
             self.stop_button.config(state='disabled')
     
@@ -262,12 +493,15 @@ class DownloaderApp:
         """Mengaktifkan/menonaktifkan tombol selama proses download."""
         self.start_button.config(state=state)
         self.browse_button.config(state=state)
+        self.verify_button.config(state=state)
+        self.workers_spinbox.config(state='disabled' if state == 'disabled' else 'readonly')
+        self.segments_spinbox.config(state='disabled' if state == 'disabled' else 'readonly')
+        self.auto_workers_check.config(state=state)
+        self.post_command_entry.config(state=state)
         
         # Mengelola tombol Stop/Skip
         if state == 'disabled':
             self.is_running = True
-            self.should_stop = False # Reset flag stop saat start
-            self.should_skip = False # Reset flag skip saat start
             self.stop_button.config(state='normal')
             self.skip_button.config(state='normal')
             self.save_button.config(state='disabled')
@@ -278,252 +512,188 @@ class DownloaderApp:
             if self.links_changed.get():
                 self.save_button.config(state='normal')
 
-    # >> FUNGSI BARU: Menghapus Link dari GUI dan File <<
-    def remove_link_from_gui_and_file(self, processed_link):
-        """Menghapus tautan yang berhasil diunduh dari GUI dan input.txt.
-           Ini dipanggil dari thread download, sehingga pemrosesan file aman.
-           Pembaruan GUI dijadwalkan ke main thread.
-        """
-        input_file = 'input.txt'
-        try:
-            # 1. Update input.txt (Dilakukan di thread kerja)
-            with open(input_file, 'r') as file:
-                links = file.readlines()
-                
-            # Filter tautan yang berhasil diunduh
-            remaining_links = [line for line in links if line.strip() != processed_link.strip()]
-            
-            with open(input_file, 'w') as file:
-                file.writelines(remaining_links)
-                
-            # Hitung tautan non-kosong yang tersisa
-            remaining_count = len([link for link in remaining_links if link.strip()])
-
-            self.log.done("Link Removed From input.txt", f"Remaining links: {remaining_count}")
-            
-            # 2. Update GUI Text Box (Dijadwalkan di main thread)
-            def update_gui_text():
-                self.link_text.config(state='normal')
-                self.link_text.delete('1.0', 'end')
-                # Masukkan kembali tautan yang tersisa
-                self.link_text.insert('1.0', "".join(remaining_links))
-                self.link_text.config(state='normal') 
-                self.on_links_changed() # Reset status save button
-                
-            self.root.after(0, update_gui_text)
-
-        except Exception as e:
-            self.log.error(f"Failed to remove link {processed_link} from file/GUI", str(e))
-    # ----------------------------------------------------
-
-    # --- Logika Download (di-thread) ---
+    # --- Logika Download (engine berjalan di thread sendiri) ---
 
     def start_download_thread(self):
-        """Memulai proses download di thread baru."""
+        """Membuat DownloadEngine dengan pengaturan saat ini dan menjalankannya di thread baru."""
+        if self.links_changed.get():
+            self.save_links() # Link yang diedit tapi belum disimpan ikut didownload
         self.set_controls_state('disabled')
         self.log.info("Starting download process...", "")
         # Reset display
-        self.root.after(0, self.update_progress, 0, "N/A", "N/A")
-        # Buat thread baru
-        download_thread = threading.Thread(target=self.run_download_loop, daemon=True)
-        download_thread.start()
-
-    def run_download_loop(self,):
-        """Loop utama yang memproses setiap link. (Berjalan di thread)"""
-        
-        # Ambil link dari text box (Ini adalah daftar statis untuk sesi ini)
-        links_raw = self.link_text.get('1.0', 'end-1c')
-        links = [line.strip() for line in links_raw.splitlines() if line.strip()]
-
-        if not links:
-            self.log.warning("No links to process.", "")
-            self.root.after(0, self.set_controls_state, 'normal')
-            return
-
-        # Headers dari skrip asli
-        headers = {
-            'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
-            'accept-language': 'en-US,en;q=0.5',
-            'referer': 'https://fitgirl-repacks.site/',
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
-        }
-        
-        downloads_folder = self.download_path_var.get()
-        
-        # --- di run_download_loop (ganti bagian for link in links) ---
-        for link in links:
-            # Cek status Stop
-            if self.should_stop:
-                self.log.error("Global stop received.", "Stopping link processing.")
-                break
-
-            # Kalau skip ditekan, jangan reset di sini!
-            if self.should_skip:
-                self.log.warning("Skipping link", link)
-                continue  # lanjut ke link berikutnya
-            
-            self.root.after(0, self.skip_button.config, {'state': 'normal'}) 
-            self.log.info("Processing", link)
-            self.root.after(0, self.update_progress, 0, "0.00%", "Speed: N/A")
+        self.log.schedule('progress', self.update_progress, 0, "N/A", "N/A")
+        self.list_since = time.time() # Daftar job dan progress total hanya untuk run ini
+        self.reload_job_list()
+        self.notebook.select(self.jobs_frame)
+        self.engine = DownloadEngine(self.jobs, self.download_path_var.get(), self.log, listener=self,
+                                     workers=self.worker_count_var.get(), segments=self.segments_var.get(),
+                                     limiter=self.limiter, adaptive=self.auto_workers_var.get(),
+                                     post_command=self.post_command_var.get().strip() or None)
+        self.engine.start()
+
+    def start_verify_thread(self):
+        """Meng-hash file di folder download dengan checksum .md5 di sana (di thread baru).
+           File yang rusak dikembalikan ke daftar link.
+        """
+        self.set_controls_state('disabled')
+        self.stop_button.config(state='disabled')
+        self.skip_button.config(state='disabled')
 
+        def run():
             try:
-                response = requests.get(link, headers=headers, timeout=10)
-                if response.status_code != 200:
-                    self.log.error("Failed to fetch page", f"{link} (Status: {response.status_code})")
-                    continue
-
-                soup = BeautifulSoup(response.text, 'html.parser')
-                meta_title = soup.find('meta', attrs={'name': 'title'})
-                file_name_raw = meta_title['content'] if meta_title else "default_file_name"
-                file_name = re.sub(r'[<>:"/\\|?*]', '_', file_name_raw)
-
-                script_tags = soup.find_all('script')
-                download_function = None
-                for script in script_tags:
-                    if 'function download' in script.text:
-                        download_function = script.text
-                        break
-
-                if download_function:
-                    match = re.search(r'window\.open\(["\'](https?://[^\s"\'\)]+)', download_function)
-                    if match:
-                        download_url = match.group(1)
-                        self.log.info("Found URL", f"{download_url[:50]}...")
-                        output_path = os.path.join(downloads_folder, file_name)
-                        self.download_file(download_url, output_path, file_name_raw, link)
-                    else:
-                        self.log.error("No download URL found", link)
-                else:
-                    self.log.error("Download function not found", link)
-
+                verify_download_folder(self.jobs, self.download_path_var.get(), self.log)
+                self.jobs.export_links(INPUT_FILE)
             except Exception as e:
-                self.log.error(f"Failed processing link {link}", str(e))
-                continue
-
-        # Penanganan Akhir Loop Download
-        if self.should_stop:
-            self.log.done("Download process cancelled by user.", "")
-        else:
-            self.log.done("All download tasks finished.", "")
-            
-        self.root.after(0, self.update_progress, 0, "0.00%", "Speed: N/A") # Reset tampilan progress
+                self.log.error("Verification failed", str(e))
+            self.root.after(0, self.finish_verify)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def finish_verify(self):
+        """Memuat ulang daftar link (file rusak kembali ke daftar) dan mengaktifkan tombol."""
+        self.reload_links()
+        self.set_controls_state('normal')
+
+    def reload_links(self):
+        """Mengisi ulang text box dan daftar job dari job store."""
+        self.reload_link_text()
+        self.reload_job_list()
+
+    def reload_link_text(self):
+        self.link_text.delete('1.0', 'end')
+        self.insert_links_in_batches(self.jobs.unfinished_links(), 0)
+
+    # --- Callback Engine (dipanggil dari thread engine, diteruskan ke main thread) ---
+
+    def on_link_done(self, link):
+        """Menghapus baris link yang selesai dari text box."""
+        def remove_line():
+            index = self.link_text.search(link, '1.0', stopindex='end', exact=True)
+            if index:
+                self.link_text.delete(f"{index} linestart", f"{index} lineend + 1c")
+
+        self.log.schedule(('remove', link), remove_line)
+
+    def on_queue_changed(self):
+        """Halaman post FitGirl sudah diganti link-linknya: tampilkan daftar baru."""
+        self.log.schedule('queue', self.reload_links)
+
+    def on_finished(self, cancelled):
+        self.log.schedule('progress', self.update_progress, 0, "0.00%", "Speed: N/A") # Reset tampilan progress
+        self.log.schedule('control', self.control_text_var.set, "")
+        self.log.schedule('eta', self.eta_text_var.set, "ETA: N/A")
+        self.log.schedule('link_text', self.reload_link_text) # Link yang di-retry selama run kembali ke text box
+        self.list_dirty = True
         self.root.after(0, self.set_controls_state, 'normal') # Aktifkan kembali tombol
 
-    # >> FUNGSI DOWNLOAD DIMODIFIKASI untuk memanggil penghapusan link <<
-    def download_file(self, download_url, output_path, file_name_raw, link_to_remove):
-        """Mendownload file, memperbarui progress bar, dan menghapus link jika sukses."""
-        try:
-            start_time = time.time()
-            response = requests.get(download_url, stream=True, timeout=30)
-            response.raise_for_status()
-            
-            total_size = int(response.headers.get('content-length', 0))
-            
-            total_size_human = self.format_size(total_size)
-            self.log.info(f"Downloading {file_name_raw} ({total_size_human})", f"{download_url[:0]}...")
-
-            block_size = 8192
-            downloaded_size = 0
-            last_time = start_time
-            last_downloaded = 0
-
-            with open(output_path, 'wb') as f:
-                for data in response.iter_content(block_size):
-                    # Cek Status Stop/Skip
-                    if self.should_stop or self.should_skip: 
-                        raise StopIteration("Download cancelled.") 
-
-                    f.write(data)
-                    downloaded_size += len(data)
-                    
-                    current_time = time.time()
-                    
-                    if current_time - last_time >= 0.5: # Update speed setiap 0.5 detik
-                        delta_t = current_time - last_time
-                        delta_bytes = downloaded_size - last_downloaded
-                        
-                        speed_bps = delta_bytes / delta_t
-                        speed_human = self.format_speed(speed_bps)
-                        
-                        progress = (downloaded_size / total_size) * 100 if total_size > 0 else 0
-                        percent_human = f"{progress:.2f}%"
-                        
-                        # Jadwalkan update UI di main thread
-                        self.root.after(0, self.update_progress, progress, percent_human, f"Speed: {speed_human}")
-                        
-                        last_time = current_time
-                        last_downloaded = downloaded_size
-            
-            # JIKA SUKSES: Panggil fungsi penghapusan link
-            self.remove_link_from_gui_and_file(link_to_remove)
-            
-            # Final logging
-            end_time = time.time()
-            total_duration = end_time - start_time
-            avg_speed_bps = downloaded_size / total_duration if total_duration > 0 else 0
-            avg_speed_human = self.format_speed(avg_speed_bps)
-            
-            self.log.success(f"Downloaded in {total_duration:.2f}s (Avg. {avg_speed_human})", f"{output_path}")
-            self.root.after(0, self.update_progress, 100, "100.00%", f"Done! ({avg_speed_human})")
-            
-        except requests.exceptions.RequestException as e:
-            self.log.error(f"Download failed for {file_name_raw}", str(e))
-            self.root.after(0, self.update_progress, 0, "0.00%", "Speed: N/A")
-            if os.path.exists(output_path):
-                 try:
-                    os.remove(output_path)
-                    self.log.info("Removed partial file", output_path)
-                 except Exception:
-                    self.log.warning("Could not remove partial file", output_path)
-        except StopIteration:
-            if os.path.exists(output_path):
-                try:
-                    os.remove(output_path)
-                    self.log.info("Removed partial file", output_path)
-                except Exception:
-                    self.log.warning("Could not remove partial file", output_path)
-            
-            if self.should_stop:
-                self.log.error("Download stopped by user.", f"Cancelled: {file_name_raw}")
-            elif self.should_skip:
-                self.log.warning("Download skipped by user.", f"Skipped: {file_name_raw}. Moving to next link...")
-                self.should_skip = False  # reset di sini, bukan di run_download_loop
-
-        except Exception as e:
-            self.log.error(f"Error writing file {file_name_raw}", str(e))
-            self.root.after(0, self.update_progress, 0, "0.00%", "Speed: N/A")
-    # --------------------------------------------------------------------------
+    # --- Fungsi Tampilan Progress ---
 
-    # --- Fungsi Utilitas ---
-    
-    def format_size(self, size_bytes):
-        """Mengkonversi bytes menjadi string yang mudah dibaca (KB, MB, GB)."""
-        if size_bytes == 0:
-            return "0B"
-        units = ['B', 'KB', 'MB', 'GB', 'TB']
-        i = 0
-        while size_bytes >= 1024 and i < len(units) - 1:
-            size_bytes /= 1024
-            i += 1
-        return f"{size_bytes:.2f}{units[i]}"
-
-    def format_speed(self, speed_bps):
-        """Mengkonversi bytes/second menjadi string yang mudah dibaca (KB/s, MB/s)."""
-        return self.format_size(speed_bps).replace('B', 'B/s')
-        
     def update_progress(self, value, percent_str, speed_str):
-        """Memperbarui nilai progress bar, persentase, dan kecepatan. (Dipanggil via root.after)"""
+        """Memperbarui nilai progress bar, persentase, dan kecepatan. (Dipanggil via log.schedule)"""
         self.progress_bar['value'] = value
         self.progress_text_var.set(percent_str)
         self.speed_text_var.set(speed_str)
 
+    # --- Daftar Job ---
+
+    def reload_job_list(self):
+        """Mengisi ulang daftar job dari job store secara bertahap (LOAD_BATCH baris per callback)."""
+        self.job_tree.delete(*self.job_tree.get_children())
+        self.row_links, self.row_order, self.row_values = {}, [], {}
+        self.list_generation += 1
+        self.insert_jobs_in_batches(self.jobs.list_jobs(self.list_since), 0, self.list_generation)
+
+    def insert_jobs_in_batches(self, jobs, start, generation):
+        if generation != self.list_generation:
+            return
+        for index, job in enumerate(jobs[start:start + LOAD_BATCH], start):
+            iid = f"job{index}"
+            values = self.job_values(job['link'], job, None)
+            self.job_tree.insert('', 'end', iid=iid, values=values, tags=(job['state'],))
+            self.row_links[iid] = job['link']
+            self.row_order.append(iid)
+            self.row_values[iid] = values
+        if start + LOAD_BATCH < len(jobs):
+            self.root.after(1, self.insert_jobs_in_batches, jobs, start + LOAD_BATCH, generation)
+
+    def on_job_list_scrolled(self, first, last):
+        self.job_scrollbar.set(first, last)
+        self.list_dirty = True
+
+    def mark_list_dirty(self, event=None):
+        self.list_dirty = True
+
+    def job_values(self, link, job, active):
+        """Nilai kolom satu baris dari data job store, ditimpa progress worker jika link sedang didownload."""
+        total = job['total'] or 0
+        downloaded = total if job['state'] == DONE else job['bytes_done']
+        speed = 0
+        if active:
+            total = active['total'] or total
+            downloaded, speed = active['downloaded'], active['speed']
+        percent = f"{min(downloaded / total, 1) * 100:.1f}%" if total else ""
+        eta = format_eta((total - downloaded) / speed) if speed > 0 and total else ""
+        return (job['file_name'] or link, job['state'], format_size(total) if total else "", percent,
+                format_speed(speed) if speed > 0 else "", eta, f"{job['priority']:g}")
+
+    def refresh_view(self):
+        """Tick tetap di main thread: baris yang terlihat dan progress total dari satu snapshot engine.
+           Baris di luar layar tidak disentuh sampai di-scroll ke dalam tampilan.
+        """
+        try:
+            engine = self.engine if self.is_running else None
+            if engine is not None or self.list_dirty:
+                self.list_dirty = False
+                active, total_speed = {}, 0
+                if engine is not None:
+                    states, total_speed, _, _ = engine.progress()
+                    active = {state['link']: state for state in states if state['file'] is not None}
+                self.update_visible_rows(active)
+                if engine is not None:
+                    self.update_totals(engine, active, total_speed)
+        finally:
+            self.root.after(LIST_REFRESH_MS, self.refresh_view)
+
+    def update_visible_rows(self, active):
+        """Memperbarui baris daftar job yang sedang terlihat (satu query job store untuk semuanya)."""
+        first, last = self.job_tree.yview()
+        count = len(self.row_order)
+        visible = self.row_order[int(first * count):min(count, int(last * count) + 1)]
+        jobs = self.jobs.get_many([self.row_links[iid] for iid in visible])
+        for iid in visible:
+            link = self.row_links[iid]
+            job = jobs.get(link)
+            if job is None: # Dihapus dari job store (misalnya halaman post yang sudah diganti)
+                continue
+            values = self.job_values(link, job, active.get(link))
+            if values != self.row_values.get(iid):
+                self.row_values[iid] = values
+                self.job_tree.item(iid, values=values, tags=(job['state'],))
+
+    def update_totals(self, engine, active, total_speed):
+        """Progress total dalam byte untuk link di daftar job, dan sisa waktu dari kecepatan total."""
+        total, done = self.jobs.progress_totals(self.list_since)
+        done = min(total, done + sum(state['downloaded'] for state in active.values()))
+        overall = (done / total) * 100 if total > 0 else 0
+        eta = format_eta((total - done) / total_speed) if total_speed > 0 else ""
+        self.update_progress(overall, f"{overall:.2f}%", f"Speed: {format_speed(total_speed)}")
+        self.eta_text_var.set(f"ETA: {eta or 'N/A'}")
+        if engine.controller:
+            self.control_text_var.set(engine.controller.status())
 
 # --- Kelas Logger GUI (Pengganti 'console') ---
 class GuiConsole:
-    """Kelas untuk logging ke widget Teks Tkinter secara thread-safe."""
-    def __init__(self, log_widget, root, colors):
+    """Kelas untuk logging ke widget Teks Tkinter secara thread-safe.
+       Pesan log dan update progress dari thread lain diantrikan, lalu satu callback Tk
+       menulisnya sekaligus FRAME_RATE kali per detik.
+    """
+    def __init__(self, log_widget, root, colors, max_lines=LOG_MAX_LINES):
         self.log_widget = log_widget
         self.root = root
+        self.max_lines = max_lines
+        self.pending_logs = queue.SimpleQueue()
+        self.pending_calls = {} # key -> (fungsi, argumen), hanya nilai terbaru per key
+        self.calls_lock = threading.Lock()
         
         # Tentukan tag warna di widget Teks
         self.log_widget.tag_config('TIMESTAMP', foreground='#AAAAAA')
@@ -534,21 +704,55 @@ class GuiConsole:
         self.log_widget.tag_config('INFO', foreground=colors['info'])
         self.log_widget.tag_config('MSG', foreground=colors['fg'])
 
+        self.root.after(FRAME_INTERVAL_MS, self._drain)
+
+    def schedule(self, key, func, *args):
+        """Menjadwalkan pemanggilan GUI di frame berikutnya. Pemanggilan dengan key yang sama
+           digabung, hanya yang terakhir dijalankan (dipakai untuk update progress).
+        """
+        with self.calls_lock:
+            self.pending_calls[key] = (func, args)
+
+    def _drain(self):
+        """Callback periodik di main thread: jalankan update progress lalu tulis semua log yang antre."""
+        try:
+            with self.calls_lock:
+                calls = list(self.pending_calls.values())
+                self.pending_calls.clear()
+            for func, args in calls:
+                func(*args)
+
+            parts = []
+            while True:
+                try:
+                    parts.extend(self.pending_logs.get_nowait())
+                except queue.Empty:
+                    break
+            if parts:
+                self._write_log(parts)
+        finally:
+            self.root.after(FRAME_INTERVAL_MS, self._drain)
+
     def _write_log(self, parts):
         """Fungsi internal untuk menulis ke log. HARUS dijalankan di main thread."""
         self.log_widget.config(state='normal')
-        
-        self.log_widget.insert('end', parts[0][0], parts[0][1]) # Timestamp
-        self.log_widget.insert('end', parts[1][0], parts[1][1]) # Tipe log
-        self.log_widget.insert('end', parts[2][0], parts[2][1]) # Pesan
-        self.log_widget.insert('end', parts[3][0], parts[3][1]) # Objek
-        self.log_widget.insert('end', '\n')
-        
+
+        # Satu insert untuk semua pasangan (teks, tag) di frame ini
+        args = []
+        for text, tag in parts:
+            args.extend((text, tag))
+        self.log_widget.insert('end', *args)
+
+        # Batasi jumlah baris agar widget tidak tumbuh tanpa batas
+        line_count = int(self.log_widget.index('end-1c').split('.')[0])
+        if line_count > self.max_lines:
+            self.log_widget.delete('1.0', f"{line_count - self.max_lines + 1}.0")
+
         self.log_widget.see('end') # Auto-scroll
         self.log_widget.config(state='disabled')
 
     def _log(self, tag, message, obj):
-        """Memformat pesan dan menjadwalkannya untuk ditulis di main thread."""
+        """Memformat pesan dan mengantrikannya untuk ditulis di main thread."""
         timestamp = f"{datetime.now().strftime('%H:%M:%S')} » "
         tag_str = f"{tag.upper():<5} • "
         msg_str = f"{message} : "
@@ -559,11 +763,12 @@ class GuiConsole:
             (timestamp, 'TIMESTAMP'),
             (tag_str, tag.upper()),
             (msg_str, 'MSG'),
-            (obj_str, tag.upper())
+            (obj_str, tag.upper()),
+            ('\n', ())
         ]
         
-        # Jadwalkan penulisan log di main thread
-        self.root.after(0, self._write_log, parts)
+        # Antrikan, ditulis oleh _drain di main thread
+        self.pending_logs.put(parts)
 
     # --- Metode logging publik ---
     def success(self, message, obj):
@@ -0,0 +1,150 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_PREFIX = 'ffdl' # Prefix nama metrik Prometheus
+
+
+class JobMetrics:
+    """Metrik satu percobaan download: diisi oleh resolver, transport, copy_to_file dan progress_ticker."""
+    def __init__(self, link, attempt=1):
+        self.lock = threading.Lock()
+        self.link = link
+        self.attempt = attempt
+        self.file_name = None
+        self.page_latency = None # Detik sampai header halaman diterima (None jika dari cache)
+        self.parse_time = None # Detik membaca halaman sampai URL ketemu
+        self.ttfb = None # Detik dari request file sampai header respons
+        self.retries = 0
+        self.started = None
+        self.start_bytes = 0 # Byte yang sudah ada di disk saat mulai (resume)
+        self.bytes_written = 0
+        self.write_blocked = 0.0 # Detik pembaca jaringan menunggu disk
+        self.samples = [] # [detik sejak mulai, byte/detik]
+        self.stalls = [] # Lama tiap periode tanpa data (detik)
+        self.stall_started = None
+        self.seen_data = False
+
+    def add_retry(self):
+        with self.lock:
+            self.retries += 1
+
+    def add_write_blocked(self, seconds):
+        with self.lock:
+            self.write_blocked += seconds
+
+    def add_sample(self, now, speed):
+        """Dipanggil progress_ticker: menambah titik throughput dan mendeteksi stall."""
+        if self.started is None:
+            return
+        self.samples.append([round(now - self.started, 2), round(speed)])
+        if speed > 0:
+            self.seen_data = True
+            self.end_stall(now)
+        elif self.seen_data and self.stall_started is None:
+            self.stall_started = now
+
+    def end_stall(self, now):
+        if self.stall_started is not None:
+            self.stalls.append(round(now - self.stall_started, 2))
+            self.stall_started = None
+
+    def to_dict(self, result):
+        duration = time.time() - self.started if self.started else None
+        return {
+            'time': time.time(),
+            'link': self.link,
+            'file': self.file_name,
+            'attempt': self.attempt,
+            'result': result,
+            'page_latency_s': self.page_latency,
+            'parse_s': self.parse_time,
+            'ttfb_s': self.ttfb,
+            'duration_s': duration,
+            'bytes_written': self.bytes_written,
+            'write_blocked_s': round(self.write_blocked, 3),
+            'retries': self.retries,
+            'stalls_s': self.stalls,
+            'throughput': self.samples,
+        }
+
+
+class MetricsRecorder:
+    """Menulis metrik job ke file JSONL (satu baris per percobaan download) dan menjumlahkannya
+       untuk endpoint Prometheus opsional di 127.0.0.1:`port`.
+    """
+    def __init__(self, path=None, port=None):
+        self.path = path
+        self.lock = threading.Lock()
+        self.totals = {'bytes_written': 0, 'write_blocked_seconds': 0.0, 'retries': 0, 'stall_seconds': 0.0,
+                       'page_latency_seconds_sum': 0.0, 'page_latency_seconds_count': 0,
+                       'parse_seconds_sum': 0.0, 'parse_seconds_count': 0,
+                       'ttfb_seconds_sum': 0.0, 'ttfb_seconds_count': 0}
+        self.results = {} # result -> jumlah job
+        self.speed = 0.0
+        self.server = None
+        if port:
+            self.server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+            self.server.daemon_threads = True
+            threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def record(self, metrics, result):
+        entry = metrics.to_dict(result)
+        with self.lock:
+            self.results[result] = self.results.get(result, 0) + 1
+            self.totals['bytes_written'] += entry['bytes_written']
+            self.totals['write_blocked_seconds'] += metrics.write_blocked
+            self.totals['retries'] += metrics.retries
+            self.totals['stall_seconds'] += sum(metrics.stalls)
+            for name, value in (('page_latency_seconds', metrics.page_latency), ('parse_seconds', metrics.parse_time),
+                                ('ttfb_seconds', metrics.ttfb)):
+                if value is not None:
+                    self.totals[name + '_sum'] += value
+                    self.totals[name + '_count'] += 1
+            if self.path:
+                with open(self.path, 'a') as f:
+                    f.write(json.dumps(entry) + '\n')
+
+    def set_speed(self, speed):
+        self.speed = speed
+
+    def close(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def prometheus_text(self):
+        """Metrik dalam format teks Prometheus."""
+        with self.lock:
+            totals = dict(self.totals)
+            results = dict(self.results)
+        lines = [f"# TYPE {METRICS_PREFIX}_jobs_total counter"]
+        lines += [f'{METRICS_PREFIX}_jobs_total{{result="{result}"}} {count}' for result, count in sorted(results.items())]
+        for name in ('bytes_written', 'write_blocked_seconds', 'retries', 'stall_seconds'):
+            lines.append(f"# TYPE {METRICS_PREFIX}_{name}_total counter")
+            lines.append(f"{METRICS_PREFIX}_{name}_total {totals[name]}")
+        for name in ('page_latency_seconds', 'parse_seconds', 'ttfb_seconds'):
+            lines.append(f"# TYPE {METRICS_PREFIX}_{name} summary")
+            lines.append(f"{METRICS_PREFIX}_{name}_sum {totals[name + '_sum']}")
+            lines.append(f"{METRICS_PREFIX}_{name}_count {totals[name + '_count']}")
+        lines.append(f"# TYPE {METRICS_PREFIX}_speed_bytes_per_second gauge")
+        lines.append(f"{METRICS_PREFIX}_speed_bytes_per_second {self.speed}")
+        return '\n'.join(lines) + '\n'
+
+    def _handler(self):
+        recorder = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                body = recorder.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
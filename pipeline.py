@@ -0,0 +1,59 @@
+import os
+import shlex
+import subprocess
+
+from checksum import hash_file
+
+OUTPUT_TAIL_LINES = 5 # Baris terakhir output perintah yang dicatat di log jika perintah gagal
+PLACEHOLDERS = ('set', 'first', 'files', 'folder')
+
+
+def quote_arg(value):
+    """Meng-quote satu argumen untuk shell sistem ini (cmd.exe di Windows, sh di tempat lain)."""
+    if os.name == 'nt':
+        return subprocess.list2cmdline([value])
+    return shlex.quote(value)
+
+
+def format_command(template, set_name, paths, folder):
+    """Mengisi {set}, {first} (part pertama), {files} (semua part) dan {folder} di perintah.
+       Nilainya sudah di-quote; kurung kurawal lain (misalnya ${VAR}) dibiarkan apa adanya.
+    """
+    values = {'set': quote_arg(set_name), 'first': quote_arg(paths[0]),
+              'files': ' '.join(quote_arg(path) for path in paths), 'folder': quote_arg(folder)}
+    for name in PLACEHOLDERS:
+        template = template.replace('{' + name + '}', values[name])
+    return template
+
+
+def verify_set(folder, files, checksums, verified):
+    """Memastikan semua part satu set ada di `folder` dengan ukuran yang diharapkan dan MD5 yang benar.
+       `files` berisi (nama file, ukuran atau None). Part yang MD5-nya sudah dicek selama download
+       (nama huruf kecil di `verified`) tidak di-hash lagi. Mengembalikan nama file yang rusak atau hilang.
+    """
+    broken = []
+    for name, size in files:
+        path = os.path.join(folder, name)
+        if not os.path.isfile(path) or (size and os.path.getsize(path) != size):
+            broken.append(name)
+            continue
+        expected = checksums.get(name.lower())
+        if expected and name.lower() not in verified and hash_file(path).hexdigest() != expected:
+            broken.append(name)
+    return broken
+
+
+def run_command(template, set_name, paths, folder):
+    """Menjalankan perintah pasca-download untuk satu set di `folder` (blocking, di worker hook).
+       Variabel lingkungan FFDL_SET, FFDL_FIRST, FFDL_FILES (dipisah os.pathsep) dan FFDL_FOLDER ikut diisi.
+       Path dijadikan absolut karena perintah berjalan dengan `folder` sebagai direktori kerja.
+       Mengembalikan (exit code, beberapa baris terakhir output).
+    """
+    folder = os.path.abspath(folder)
+    paths = [os.path.abspath(path) for path in paths]
+    env = dict(os.environ, FFDL_SET=set_name, FFDL_FIRST=paths[0], FFDL_FILES=os.pathsep.join(paths),
+               FFDL_FOLDER=folder)
+    result = subprocess.run(format_command(template, set_name, paths, folder), shell=True, cwd=folder, env=env,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors='replace')
+    tail = [line for line in result.stdout.splitlines() if line.strip()][-OUTPUT_TAIL_LINES:]
+    return result.returncode, " | ".join(tail)
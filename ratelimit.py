@@ -0,0 +1,156 @@
+import re
+import threading
+import time
+from datetime import datetime
+
+BURST_SECONDS = 0.25 # Token maksimal yang boleh terkumpul, dalam detik bandwidth
+MIN_BURST = 16 * 1024 # Batas kecil = baca kecil, agar Stop/Skip tetap cepat dan aliran tetap rata
+MIN_WEIGHT = 0.1
+
+RATE_RE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([kmg]?)\s*(?:i?b(?:/s)?)?\s*$', re.IGNORECASE)
+SCHEDULE_RE = re.compile(r'^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*=\s*(.+?)\s*$')
+RATE_UNITS = {'': 1024 * 1024, 'k': 1024, 'm': 1024 * 1024, 'g': 1024 * 1024 * 1024}
+
+
+def parse_rate(text):
+    """'0' atau '' = tanpa batas, '2.5' = 2.5 MB/s, '500K' / '2M' / '1G' = KB/s, MB/s, GB/s.
+       Mengembalikan byte/detik. Melempar ValueError jika formatnya salah.
+    """
+    if text is None or not str(text).strip():
+        return 0
+    match = RATE_RE.match(str(text))
+    if not match:
+        raise ValueError(f"Invalid rate: {text!r}")
+    return int(float(match.group(1)) * RATE_UNITS[match.group(2).lower()])
+
+
+def parse_schedule(text):
+    """'09:00-18:00=1M, 18:00-09:00=0' -> [(menit mulai, menit akhir, byte/detik), ...].
+       Rentang boleh melewati tengah malam. Melempar ValueError jika formatnya salah.
+    """
+    schedule = []
+    for part in filter(None, (part.strip() for part in (text or '').split(','))):
+        match = SCHEDULE_RE.match(part)
+        if not match:
+            raise ValueError(f"Invalid schedule entry: {part!r} (expected HH:MM-HH:MM=RATE)")
+        start_h, start_m, end_h, end_m = (int(value) for value in match.group(1, 2, 3, 4))
+        if start_h > 23 or end_h > 24 or start_m > 59 or end_m > 59:
+            raise ValueError(f"Invalid time in schedule entry: {part!r}")
+        schedule.append((start_h * 60 + start_m, end_h * 60 + end_m, parse_rate(match.group(5))))
+    return schedule
+
+
+class Share:
+    """Bagian satu job dari RateLimiter. `weight` lebih besar = dilayani lebih dulu saat bandwidth kurang."""
+    def __init__(self, limiter, weight=1.0):
+        self.limiter = limiter
+        self.weight = weight
+        self.finish = 0.0 # Waktu virtual selesainya permintaan terakhir (weighted fair queueing)
+
+    def acquire(self, size):
+        return self.limiter.acquire(self, size)
+
+    def refund(self, size):
+        self.limiter.refund(size)
+
+    def consume(self, size):
+        """Menunggu sampai seluruh `size` byte (yang sudah diterima) terbayar."""
+        while size > 0:
+            size -= self.limiter.acquire(self, size)
+
+
+class RateLimiter:
+    """Token bucket global untuk semua download. Saat beberapa job menunggu token, urutannya ditentukan
+       weighted fair queueing: bandwidth dibagi sebanding `weight` tiap Share, dan job yang sendirian
+       tetap memakai seluruh batas. Batas bisa diubah kapan saja (set_rate / set_schedule).
+       Tanpa batas, acquire() hanya membaca satu atribut.
+    """
+    def __init__(self, rate=0, schedule=None):
+        self.cond = threading.Condition()
+        self.manual_rate = rate
+        self.schedule = schedule or []
+        self.rate = 0
+        self.burst = MIN_BURST
+        self.tokens = float(MIN_BURST)
+        self.updated = time.monotonic()
+        self.waiting = [] # (finish virtual, urutan) tiap permintaan yang menunggu
+        self.sequence = 0
+        self.virtual_time = 0.0
+        self.apply_schedule()
+
+    def share(self, weight=1.0):
+        return Share(self, weight)
+
+    # --- Konfigurasi ---
+
+    def set_rate(self, rate):
+        """Batas manual dalam byte/detik (0 = tanpa batas), dipakai di luar jam jadwal."""
+        self.manual_rate = rate
+        self.apply_schedule()
+
+    def set_schedule(self, schedule):
+        self.schedule = schedule
+        self.apply_schedule()
+
+    def scheduled_rate(self, now=None):
+        """Batas yang berlaku pada `now`: entri jadwal pertama yang cocok, selain itu batas manual."""
+        now = now or datetime.now()
+        minute = now.hour * 60 + now.minute
+        for start, end, rate in self.schedule:
+            if start <= minute < end if start <= end else (minute >= start or minute < end):
+                return rate
+        return self.manual_rate
+
+    def apply_schedule(self):
+        """Dipanggil progress_ticker secara berkala agar pergantian jam jadwal ikut berlaku."""
+        rate = self.scheduled_rate()
+        if rate != self.rate:
+            with self.cond:
+                self._refill()
+                self.rate = rate
+                self.burst = max(rate * BURST_SECONDS, MIN_BURST)
+                self.tokens = min(self.tokens, self.burst)
+                self.cond.notify_all()
+
+    # --- Token ---
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, share, size):
+        """Menunggu giliran lalu mengembalikan jumlah byte yang boleh dibaca (<= `size`, paling banyak
+           satu burst). Tanpa batas langsung mengembalikan `size`.
+        """
+        if self.rate <= 0:
+            return size
+        with self.cond:
+            size = min(size, self.burst)
+            share.finish = max(share.finish, self.virtual_time) + size / max(share.weight, MIN_WEIGHT)
+            self.sequence += 1
+            entry = (share.finish, self.sequence)
+            self.waiting.append(entry)
+            try:
+                while self.rate > 0:
+                    self._refill()
+                    if entry != min(self.waiting):
+                        self.cond.wait() # Dibangunkan saat permintaan di depannya selesai
+                        continue
+                    size = min(size, self.burst) # Batas bisa turun selagi menunggu
+                    if self.tokens >= size:
+                        self.tokens -= size
+                        self.virtual_time = entry[0]
+                        return size
+                    self.cond.wait((size - self.tokens) / self.rate)
+                return size
+            finally:
+                self.waiting.remove(entry)
+                self.cond.notify_all()
+
+    def refund(self, size):
+        """Mengembalikan token yang tidak terpakai (baca menerima lebih sedikit dari yang diminta)."""
+        if self.rate <= 0 or size <= 0:
+            return
+        with self.cond:
+            self.tokens = min(self.burst, self.tokens + size)
@@ -0,0 +1,96 @@
+import json
+import os
+import threading
+import time
+
+RESOLVE_CACHE_FILE = 'resolve_cache.json'
+RESOLVE_CACHE_TTL = 60 * 60 # Detik sebelum URL download yang di-cache dianggap kedaluwarsa
+# Detik sebelum resolver mengambil URL download baru walaupun entry masih berlaku (nama dan ukuran tetap dipakai)
+RESOLVE_URL_MAX_AGE = 10 * 60
+RESOLVE_CACHE_SAVE_INTERVAL = 5.0 # Detik minimal antara dua penulisan file cache selama run
+
+
+class ResolveCache:
+    """Cache di disk: link fuckingfast.co -> URL download, nama file, ukuran dan waktu resolve.
+       Perubahan dikumpulkan di memori dan ditulis paling sering sekali per `save_interval` detik;
+       sisanya ditulis oleh flush() di akhir run.
+    """
+    def __init__(self, path, ttl, save_interval=RESOLVE_CACHE_SAVE_INTERVAL):
+        self.path = path
+        self.ttl = ttl
+        self.save_interval = save_interval
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock() # Satu penulisan file sekaligus
+        self.entries = self._load()
+        self.dirty = False # Ada perubahan yang belum ditulis
+        self.saved = 0.0 # Waktu penulisan terakhir
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def flush(self):
+        """Menulis cache ke file sementara lalu menggantinya agar file tidak rusak jika crash.
+           Tidak melakukan apa-apa jika tidak ada perubahan.
+        """
+        with self.save_lock:
+            with self.lock:
+                if not self.dirty:
+                    return
+                entries = dict(self.entries)
+                self.dirty = False
+                self.saved = time.time()
+            tmp_path = self.path + '.tmp'
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, self.path)
+            except OSError:
+                with self.lock:
+                    self.dirty = True # Dicoba lagi di flush berikutnya
+                raise
+
+    def _flush_if_due(self):
+        """Menulis cache jika penulisan terakhir sudah lebih dari `save_interval` detik yang lalu."""
+        if time.time() - self.saved < self.save_interval:
+            return
+        try:
+            self.flush()
+        except OSError:
+            pass # Kesalahan tulis dilaporkan oleh flush() di akhir run
+
+    def get(self, link, max_age=None):
+        """Mengembalikan entry yang masih berlaku, atau None jika tidak ada/kedaluwarsa.
+           Entry yang lebih tua dari `max_age` detik juga tidak dikembalikan, tetapi tetap disimpan.
+        """
+        with self.lock:
+            entry = self.entries.get(link)
+            if entry and time.time() - entry['time'] > self.ttl:
+                del self.entries[link]
+                self.dirty = True
+                return None
+            if entry and max_age is not None and time.time() - entry['time'] > max_age:
+                return None
+            return entry
+
+    def put(self, job):
+        with self.lock:
+            self.entries[job.link] = {
+                'download_url': job.download_url,
+                'file_name_raw': job.file_name_raw,
+                'file_name': job.file_name,
+                'size': job.size,
+                'time': time.time(),
+            }
+            self.dirty = True
+        self._flush_if_due()
+
+    def invalidate(self, link):
+        """Menghapus entry, misalnya saat URL download sudah tidak berlaku (403/404/410)."""
+        with self.lock:
+            if self.entries.pop(link, None) is not None:
+                self.dirty = True
+        self._flush_if_due()
@@ -0,0 +1,113 @@
+import json
+import os
+import re
+
+PART_SUFFIX = '.part' # Download yang belum selesai
+RESUME_SUFFIX = '.json' # Sidecar berisi URL, ukuran dan ETag untuk resume
+MIN_SEGMENT_SIZE = 16 * 1024 * 1024 # File kecil tidak perlu dipecah
+
+
+def load_resume_info(meta_path):
+    """Membaca sidecar resume. Mengembalikan None jika tidak ada atau rusak."""
+    try:
+        with open(meta_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_resume_info(meta_path, url, size, etag, segments=None):
+    """Menyimpan URL, ukuran total, ETag (dan posisi segmen) di samping file .part."""
+    info = {'url': url, 'size': size, 'etag': etag}
+    if segments:
+        info['segments'] = segments
+    with open(meta_path, 'w') as f:
+        json.dump(info, f)
+
+
+def save_segment_progress(meta_path, url, size, etag, segments, counters):
+    """Menyalin byte yang sudah ditulis tiap segmen (`counters`) ke `segments` lalu menyimpan sidecar."""
+    for segment, done in zip(segments, counters):
+        segment[2] = done
+    save_resume_info(meta_path, url, size, etag, segments)
+
+
+def partial_size(part_path):
+    """Byte yang sudah didownload di file .part (download bersegmen dihitung dari sidecar)."""
+    resume_info = load_resume_info(part_path + RESUME_SUFFIX)
+    if resume_info and resume_info.get('segments'):
+        return sum(segment[2] for segment in resume_info['segments'])
+    try:
+        return os.path.getsize(part_path)
+    except OSError:
+        return 0
+
+
+def remove_resume_info(meta_path):
+    """Menghapus sidecar resume setelah download selesai."""
+    try:
+        os.remove(meta_path)
+    except OSError:
+        pass
+
+
+def segmented_resume(resume_info, resume_from):
+    """True jika file .part adalah download bersegmen yang bisa dilanjutkan (sudah dialokasikan penuh,
+       progress tiap segmen ada di sidecar).
+    """
+    return bool(resume_info and resume_info.get('segments')) and resume_from == resume_info.get('size')
+
+
+def resume_headers(resume_info, resume_from, segmented):
+    """Header Range/If-Range untuk request pertama sebuah file: lanjut dari `resume_from` jika ada sidecar,
+       atau seluruh file sebagai Range jika `segmented` (agar tahu apakah server mendukung segmen).
+    """
+    if resume_info and resume_from > 0:
+        headers = {'Range': f"bytes={resume_from}-"}
+        if resume_info.get('etag'):
+            headers['If-Range'] = resume_info['etag']
+        return headers
+    if segmented:
+        return {'Range': "bytes=0-"}
+    return {}
+
+
+def segment_headers(segment, done, etag):
+    """Header Range/If-Range untuk sisa satu segmen [start, end, done] mulai dari byte ke-`done`."""
+    start, end, _ = segment
+    headers = {'Range': f"bytes={start + done}-{end}"}
+    if etag:
+        headers['If-Range'] = etag
+    return headers
+
+
+def part_complete(status, resume_info, resume_from):
+    """True jika server menjawab 416 untuk file .part yang sudah sebesar ukuran di sidecar (tinggal diganti nama)."""
+    return status == 416 and bool(resume_info) and resume_from == resume_info.get('size')
+
+
+def parse_resume_response(status, headers, resume_info, resume_from):
+    """Menentukan ukuran total dan offset awal dari status dan header respons server.
+       Jika server mengabaikan Range (200), download diulang dari 0.
+       Mengembalikan None jika Content-Range tidak cocok dengan file .part.
+    """
+    if status == 206:
+        match = re.match(r'bytes (\d+)-\d+/(\d+)', headers.get('content-range', ''))
+        if match and int(match.group(1)) == resume_from:
+            total_size = int(match.group(2))
+            if not resume_info or resume_info.get('size') in (None, 0, total_size):
+                return total_size, resume_from
+        return None
+    return int(headers.get('content-length', 0)), 0
+
+
+def plan_segments(total_size, count):
+    """Membagi file menjadi daftar [start, end, done] dengan ukuran minimal MIN_SEGMENT_SIZE."""
+    count = max(1, min(count, total_size // MIN_SEGMENT_SIZE))
+    segment_size = total_size // count
+    segments = []
+    for index in range(count):
+        start = index * segment_size
+        end = total_size - 1 if index == count - 1 else start + segment_size - 1
+        segments.append([start, end, 0])
+    return segments
@@ -0,0 +1,56 @@
+import hashlib
+import os
+
+from fitgirl import archive_set, group_by_archive_set, parse_part_name
+from pipeline import format_command, quote_arg, verify_set
+
+
+def test_parse_part_name_and_archive_set():
+    assert parse_part_name('Game.part07.rar') == ('Game', 7)
+    assert parse_part_name('Game.PART1.RAR') == ('Game', 1)
+    assert parse_part_name('setup.exe') == ('setup.exe', None)
+    assert archive_set('My.Game.part001.rar') == 'My.Game'
+    assert archive_set('fg-optional-bonus.bin') is None
+    assert archive_set('') is None
+
+
+def test_group_by_archive_set_keeps_sets_together_at_first_part():
+    names = {'a2': 'A.part02.rar', 'b1': 'B.part01.rar', 'a1': 'A.part01.rar', 'x': 'single.bin',
+             'b2': 'b.part02.rar', 'a3': 'A.part03.rar'}
+    links = ['a2', 'b1', 'x', 'a1', 'unknown', 'b2', 'a3']
+    assert group_by_archive_set(links, names) == ['a1', 'a2', 'a3', 'b1', 'b2', 'x', 'unknown']
+
+
+def test_group_by_archive_set_without_names_keeps_order():
+    assert group_by_archive_set(['c', 'a', 'b'], {}) == ['c', 'a', 'b']
+
+
+def test_format_command_quotes_values_and_keeps_other_braces():
+    paths = ['/d/My Game.part01.rar', '/d/My Game.part02.rar']
+    command = format_command('unrar x {first} {folder} # {set} ${HOME} {files}', 'My Game', paths, '/d')
+    assert command == (f"unrar x {quote_arg(paths[0])} {quote_arg('/d')} # {quote_arg('My Game')} ${{HOME}} "
+                       f"{quote_arg(paths[0])} {quote_arg(paths[1])}")
+
+
+def write(folder, name, data):
+    with open(os.path.join(folder, name), 'wb') as f:
+        f.write(data)
+    return hashlib.md5(data).hexdigest()
+
+
+def test_verify_set_reports_missing_short_and_corrupt_parts(tmp_path):
+    folder = str(tmp_path)
+    good = write(folder, 'G.part1.rar', b'one')
+    write(folder, 'G.part2.rar', b'tw')
+    write(folder, 'G.part3.rar', b'bad')
+    checksums = {'g.part1.rar': good, 'g.part3.rar': hashlib.md5(b'three').hexdigest()}
+    files = [('G.part1.rar', 3), ('G.part2.rar', 3), ('G.part3.rar', None), ('G.part4.rar', None)]
+    assert verify_set(folder, files, checksums, set()) == ['G.part2.rar', 'G.part3.rar', 'G.part4.rar']
+
+
+def test_verify_set_skips_parts_checked_during_download(tmp_path):
+    folder = str(tmp_path)
+    write(folder, 'G.part1.rar', b'changed')
+    checksums = {'g.part1.rar': hashlib.md5(b'original').hexdigest()}
+    assert verify_set(folder, [('G.part1.rar', None)], checksums, {'g.part1.rar'}) == []
+    assert verify_set(folder, [('G.part1.rar', None)], checksums, set()) == ['G.part1.rar']
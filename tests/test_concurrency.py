@@ -0,0 +1,52 @@
+from concurrency import DECREASE, HOLD, HOLD_INTERVALS, INCREASE, AdaptiveController
+
+MIB = 1024 * 1024
+
+
+def test_slow_start_doubles_until_maximum():
+    controller = AdaptiveController(1, 8)
+    assert [controller.update(speed * MIB, 0) for speed in (10, 20, 40)] == [2, 4, 8]
+    assert controller.decision == INCREASE
+    assert controller.update(80 * MIB, 0) == 8
+    assert controller.decision == HOLD and controller.reason.startswith("at maximum")
+
+
+def test_errors_halve_limit_and_end_slow_start():
+    controller = AdaptiveController(2, 16)
+    controller.update(10 * MIB, 0)
+    controller.update(20 * MIB, 0)
+    assert controller.limit == 8
+    assert controller.update(20 * MIB, 3) == 4
+    assert controller.decision == DECREASE and "3 HTTP error(s)" in controller.reason
+    assert controller.update(20 * MIB, 0) == 5 # Additive increase setelah slow start selesai
+    assert controller.update(30 * MIB, 1) == 2
+    assert controller.update(30 * MIB, 1) == 2 # Tidak turun di bawah minimum
+
+
+def test_increase_without_gain_is_undone_then_held():
+    controller = AdaptiveController(1, 16)
+    controller.update(10 * MIB, 0)
+    assert controller.limit == 2
+    assert controller.update(10.2 * MIB, 0) == 1 # Naik < 5%: tambahan dikembalikan
+    assert controller.decision == DECREASE
+    for _ in range(HOLD_INTERVALS):
+        assert controller.update(10 * MIB, 0) == 1
+        assert controller.decision == HOLD
+    assert controller.update(10 * MIB, 0) == 2 # Setelah ditahan, dicoba +1 lagi
+    assert controller.decision == INCREASE
+
+
+def test_holds_at_speed_limit():
+    controller = AdaptiveController(1, 16)
+    assert controller.update(9.5 * MIB, 0, rate_limit=10 * MIB) == 1
+    assert controller.decision == HOLD and controller.reason.startswith("at speed limit")
+    assert controller.update(5 * MIB, 0, rate_limit=10 * MIB) == 2
+
+
+def test_bounds_and_status():
+    controller = AdaptiveController(0, 0)
+    assert (controller.minimum, controller.maximum, controller.limit) == (1, 1, 1)
+    controller = AdaptiveController(4, 8)
+    assert controller.status() == "Auto 4/8: hold (starting)"
+    controller.update(1 * MIB, 0)
+    assert controller.status() == "Auto 8/8: increase (throughput 1.0 MB/s)"
@@ -0,0 +1,70 @@
+from extractor import PageScanner, extract_page_info
+
+PAGE = ('<html><head><meta name="title" content="Game &amp; DLC.part01.rar">\n'
+        '<meta property="og:title" content="ignored"></head><body>' + 'x' * 3000 +
+        '<script>function other() { window.open("https://wrong.example/a") }\n'
+        'function download() { window.open("https://dl.example/file#Game.part01.rar", "_blank"); }</script>'
+        '</body></html>').encode('utf-8')
+
+
+def feed_in_chunks(scanner, data, size):
+    for start in range(0, len(data), size):
+        if scanner.feed(data[start:start + size]):
+            return start + size
+    return None
+
+
+def test_scanner_finds_title_and_url():
+    scanner = PageScanner('utf-8')
+    assert feed_in_chunks(scanner, PAGE, len(PAGE)) is not None
+    assert scanner.title == 'Game & DLC.part01.rar'
+    assert scanner.download_url == 'https://dl.example/file#Game.part01.rar'
+
+
+def test_scanner_handles_patterns_split_across_chunks():
+    for size in (1, 7, 64, 1000):
+        scanner = PageScanner('utf-8')
+        assert feed_in_chunks(scanner, PAGE, size) is not None, size
+        assert scanner.title == 'Game & DLC.part01.rar'
+        assert scanner.download_url == 'https://dl.example/file#Game.part01.rar'
+
+
+def test_scanner_decodes_multibyte_characters_split_across_chunks():
+    page = '<meta content=\'Gêmé – ü.rar\' name="title"><script>function download() { window.open(\'https://dl.example/x\') }'
+    scanner = PageScanner(None)
+    feed_in_chunks(scanner, page.encode('utf-8'), 1)
+    assert scanner.title == 'Gêmé – ü.rar'
+    assert scanner.download_url == 'https://dl.example/x'
+
+
+def test_scanner_stops_early_before_end_of_page():
+    data = PAGE + b'<!--' + b'y' * 100000 + b'-->'
+    assert feed_in_chunks(PageScanner('utf-8'), data, 4096) < len(PAGE) + 4096
+
+
+def test_scanner_ignores_window_open_outside_download_function():
+    scanner = PageScanner('utf-8')
+    assert not scanner.feed(b'<meta name="title" content="a"><script>window.open("https://wrong.example/")</script>')
+    assert scanner.title == 'a' and scanner.download_url is None
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+        self.encoding = 'utf-8'
+        self.headers = {}
+        self.raw = None
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.data), chunk_size):
+            yield self.data[start:start + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+def test_extract_page_info_closes_response():
+    response = FakeResponse(PAGE)
+    assert extract_page_info(response, 100) == ('Game & DLC.part01.rar', 'https://dl.example/file#Game.part01.rar')
+    assert response.closed
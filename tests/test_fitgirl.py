@@ -0,0 +1,44 @@
+from fitgirl import extract_post_links, is_post_url, link_file_name, link_key
+
+POST_PAGE = """
+<div class="entry-content">
+  <p><a href="https://fuckingfast.co/aaa111#fg-optional-bonus.bin">fg-optional-bonus.bin</a></p>
+  <p><a href="https://fuckingfast.co/ccc333#Game_--_fitgirl-repacks.site_--_.part10.rar">part10</a></p>
+  <p><a href="https://FuckingFast.co/bbb222#Game_--_fitgirl-repacks.site_--_.part02.rar">part02</a></p>
+  <p><a href="https://fuckingfast.co/ddd444#Game_--_fitgirl-repacks.site_--_.part01.rar">part01</a></p>
+  <p><a href="https://fuckingfast.co/bbb222#Game_--_fitgirl-repacks.site_--_.part02.rar">same file again</a></p>
+  <p>https://fuckingfast.co/eee555#Extra%20Sounds.part01.rar</p>
+  <p><a href="https://example.com/zzz999">not a file host</a></p>
+</div>
+"""
+
+
+def test_is_post_url():
+    assert is_post_url('https://fitgirl-repacks.site/some-game/')
+    assert is_post_url('http://www.FitGirl-Repacks.site/some-game')
+    assert not is_post_url('https://fitgirl-repacks.site/')
+    assert not is_post_url('https://fuckingfast.co/abc#Game.part01.rar')
+
+
+def test_link_key_ignores_fragment_and_host_case():
+    assert link_key('https://FuckingFast.co/abc#a.rar') == link_key('https://fuckingfast.co/abc#b.rar')
+    assert link_key('https://fuckingfast.co/abc') != link_key('https://fuckingfast.co/ABC')
+
+
+def test_link_file_name():
+    assert link_file_name('https://fuckingfast.co/abc#Game%20Setup.part03.rar') == 'Game Setup.part03.rar'
+    assert link_file_name('https://fuckingfast.co/abc') == ''
+
+
+def test_extract_post_links_dedupes_and_orders_parts():
+    assert extract_post_links(POST_PAGE) == [
+        'https://fuckingfast.co/eee555#Extra%20Sounds.part01.rar',
+        'https://fuckingfast.co/ddd444#Game_--_fitgirl-repacks.site_--_.part01.rar',
+        'https://FuckingFast.co/bbb222#Game_--_fitgirl-repacks.site_--_.part02.rar',
+        'https://fuckingfast.co/ccc333#Game_--_fitgirl-repacks.site_--_.part10.rar',
+        'https://fuckingfast.co/aaa111#fg-optional-bonus.bin',
+    ]
+
+
+def test_extract_post_links_without_links():
+    assert extract_post_links('<html><body>No links here</body></html>') == []
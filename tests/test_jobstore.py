@@ -0,0 +1,115 @@
+import time
+
+import pytest
+
+from jobstore import DONE, DOWNLOADING, FAILED, PENDING, RESOLVING, JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / 'jobs.db'))
+    yield store
+    store.close()
+
+
+def count_unfinished(store):
+    return len(store.unfinished_links())
+
+
+def test_import_makes_links_pending_in_order(store):
+    store.import_links(['a', 'b', 'c'])
+    assert store.unfinished_links() == ['a', 'b', 'c']
+    assert store.get('a')['state'] == PENDING
+    assert store.unfinished == 3
+
+
+def test_state_transitions_keep_unfinished_counter(store):
+    store.import_links(['a', 'b'])
+    store.set_state('a', RESOLVING)
+    store.set_state('a', DOWNLOADING, bytes_done=10, total=100, file_name='A.rar')
+    assert store.unfinished == 2
+
+    store.set_state('a', DONE, bytes_done=100)
+    assert store.get('a') == {'state': DONE, 'bytes_done': 100, 'total': 100, 'file_name': 'A.rar',
+                              'error': None, 'priority': 1.0}
+    assert store.unfinished == 1 == count_unfinished(store)
+
+    store.set_state('a', DONE) # Tidak dihitung dua kali
+    assert store.unfinished == 1
+
+    store.set_state('b', FAILED, error="HTTP 404")
+    assert store.get('b')['error'] == "HTTP 404"
+    assert store.unfinished == 1 == count_unfinished(store)
+
+    store.set_state('a', PENDING, bytes_done=0)
+    assert store.unfinished == 2 == count_unfinished(store)
+
+
+def test_set_state_ignores_unknown_link(store):
+    store.set_state('missing', DONE)
+    assert store.get('missing') is None
+    assert store.unfinished == 0
+
+
+def test_reimport_keeps_done_links_and_drops_removed(store):
+    store.import_links(['a', 'b', 'c'])
+    store.set_state('a', DONE)
+    store.import_links(['c', 'd'])
+    assert store.unfinished_links() == ['c', 'd']
+    assert store.get('a')['state'] == DONE
+    assert store.get('b') is None
+    assert store.unfinished == 2
+
+
+def test_append_and_replace_link(store):
+    store.import_links(['post', 'z'])
+    assert store.append_links(['z', 'y']) == ['y']
+    assert store.replace_link('post', ['p1', 'p2', 'z']) == ['p1', 'p2']
+    assert store.all_links() == ['p1', 'p2', 'z', 'y']
+    assert store.unfinished == 4 == count_unfinished(store)
+    assert store.replace_link('missing', ['q']) == []
+
+
+def test_replacing_done_link_only_counts_new_links(store):
+    store.import_links(['post'])
+    store.set_state('post', DONE)
+    store.replace_link('post', ['p1'])
+    assert store.unfinished == 1 == count_unfinished(store)
+
+
+def test_requeue_files_matches_names_case_insensitively(store):
+    store.import_links(['a', 'b'])
+    store.set_state('a', DONE, bytes_done=5, total=5, file_name='Game.part1.rar')
+    store.set_state('b', DONE, bytes_done=5, total=5, file_name='Game.part2.rar')
+    assert store.requeue_files(['game.PART1.rar']) == ['a']
+    assert store.get('a')['state'] == PENDING and store.get('a')['bytes_done'] == 0
+    assert store.unfinished == 1
+
+
+def test_totals_and_progress(store):
+    since = time.time() - 1
+    store.import_links(['a', 'b', 'c'])
+    store.set_state('a', DONE, total=100, bytes_done=100)
+    store.set_state('b', DOWNLOADING, total=50, bytes_done=20)
+    assert store.totals() == {'a': 100, 'b': 50}
+    assert store.progress_totals(since) == (150, 100)
+    assert [job['link'] for job in store.list_jobs(since)] == ['a', 'b', 'c']
+
+
+def test_priority(store):
+    store.import_links(['a'])
+    assert store.priority('a') == 1.0
+    store.set_priority('a', 3)
+    assert store.priority('a') == 3
+    assert store.priority('missing') == 1.0
+
+
+def test_counter_survives_reopen(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    store = JobStore(path)
+    store.import_links(['a', 'b'])
+    store.set_state('a', DONE)
+    store.close()
+    store = JobStore(path)
+    assert store.unfinished == 1
+    store.close()
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import pytest
+
+from ratelimit import RateLimiter, parse_rate, parse_schedule
+
+MIB = 1024 * 1024
+
+
+@pytest.mark.parametrize('text, expected', [
+    (None, 0), ('', 0), ('0', 0), ('2.5', int(2.5 * MIB)), ('500K', 500 * 1024), ('2M', 2 * MIB),
+    ('1G', 1024 * MIB), (' 3 mb/s ', 3 * MIB), ('100KiB', 100 * 1024), (4, 4 * MIB),
+])
+def test_parse_rate(text, expected):
+    assert parse_rate(text) == expected
+
+
+@pytest.mark.parametrize('text', ['abc', '-1', '5T', '1.2.3', 'M'])
+def test_parse_rate_rejects_bad_input(text):
+    with pytest.raises(ValueError):
+        parse_rate(text)
+
+
+def test_parse_schedule():
+    assert parse_schedule('09:00-18:00=1M, 18:00-09:00=0') == [(540, 1080, MIB), (1080, 540, 0)]
+    assert parse_schedule('') == []
+    assert parse_schedule(None) == []
+    assert parse_schedule('0:00-24:00=500K,') == [(0, 1440, 500 * 1024)]
+
+
+@pytest.mark.parametrize('text', ['09:00-18:00', '9-18=1M', '25:00-26:00=1M', '09:60-10:00=1M', '09:00-10:00=x'])
+def test_parse_schedule_rejects_bad_entries(text):
+    with pytest.raises(ValueError):
+        parse_schedule(text)
+
+
+def at(hour, minute=0):
+    return datetime(2024, 1, 1, hour, minute)
+
+
+def test_scheduled_rate_uses_first_matching_entry_or_manual_rate():
+    limiter = RateLimiter(7, parse_schedule('09:00-18:00=1M, 12:00-13:00=2M'))
+    assert limiter.scheduled_rate(at(8, 59)) == 7
+    assert limiter.scheduled_rate(at(9)) == MIB
+    assert limiter.scheduled_rate(at(12, 30)) == MIB
+    assert limiter.scheduled_rate(at(18)) == 7
+
+
+def test_scheduled_rate_wraps_past_midnight():
+    limiter = RateLimiter(0, parse_schedule('22:00-06:00=0, 06:00-22:00=1M'))
+    assert limiter.scheduled_rate(at(23, 30)) == 0
+    assert limiter.scheduled_rate(at(3)) == 0
+    assert limiter.scheduled_rate(at(6)) == MIB
+    assert limiter.scheduled_rate(at(21, 59)) == MIB
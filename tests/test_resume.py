@@ -0,0 +1,78 @@
+from resume import (MIN_SEGMENT_SIZE, RESUME_SUFFIX, load_resume_info, parse_resume_response, part_complete,
+                    partial_size, plan_segments, resume_headers, save_resume_info, save_segment_progress,
+                    segment_headers, segmented_resume)
+
+
+def test_parse_resume_response_continues_at_offset():
+    headers = {'content-range': 'bytes 100-999/1000', 'content-length': '900'}
+    assert parse_resume_response(206, headers, {'size': 1000}, 100) == (1000, 100)
+
+
+def test_parse_resume_response_without_sidecar_size():
+    assert parse_resume_response(206, {'content-range': 'bytes 0-499/500'}, None, 0) == (500, 0)
+
+
+def test_parse_resume_response_rejects_other_offset_or_size():
+    assert parse_resume_response(206, {'content-range': 'bytes 200-999/1000'}, {'size': 1000}, 100) is None
+    assert parse_resume_response(206, {'content-range': 'bytes 100-1999/2000'}, {'size': 1000}, 100) is None
+    assert parse_resume_response(206, {}, {'size': 1000}, 100) is None
+
+
+def test_parse_resume_response_restarts_when_range_ignored():
+    assert parse_resume_response(200, {'content-length': '1000'}, {'size': 1000}, 100) == (1000, 0)
+
+
+def test_plan_segments_covers_file_without_gaps():
+    total = 5 * MIN_SEGMENT_SIZE + 7
+    segments = plan_segments(total, 4)
+    assert len(segments) == 4
+    assert segments[0][0] == 0 and segments[-1][1] == total - 1
+    for previous, current in zip(segments, segments[1:]):
+        assert current[0] == previous[1] + 1
+    assert all(done == 0 for _, _, done in segments)
+
+
+def test_plan_segments_keeps_small_files_whole():
+    assert plan_segments(MIN_SEGMENT_SIZE - 1, 8) == [[0, MIN_SEGMENT_SIZE - 2, 0]]
+    assert len(plan_segments(3 * MIN_SEGMENT_SIZE, 8)) == 3
+
+
+def test_resume_headers():
+    assert resume_headers({'size': 10, 'etag': '"x"'}, 4, True) == {'Range': 'bytes=4-', 'If-Range': '"x"'}
+    assert resume_headers({'size': 10}, 4, False) == {'Range': 'bytes=4-'}
+    assert resume_headers(None, 0, True) == {'Range': 'bytes=0-'}
+    assert resume_headers(None, 0, False) == {}
+
+
+def test_segment_headers():
+    assert segment_headers([100, 199, 0], 30, None) == {'Range': 'bytes=130-199'}
+    assert segment_headers([0, 99, 0], 0, '"e"') == {'Range': 'bytes=0-99', 'If-Range': '"e"'}
+
+
+def test_segmented_resume_and_part_complete():
+    info = {'size': 10, 'segments': [[0, 9, 3]]}
+    assert segmented_resume(info, 10)
+    assert not segmented_resume(info, 4) # File belum dialokasikan penuh
+    assert not segmented_resume({'size': 10}, 10)
+    assert not segmented_resume(None, 0)
+    assert part_complete(416, {'size': 10}, 10)
+    assert not part_complete(416, {'size': 10}, 9)
+    assert not part_complete(200, {'size': 10}, 10)
+
+
+def test_segment_progress_and_partial_size(tmp_path):
+    part_path = str(tmp_path / 'a.rar.part')
+    meta_path = part_path + RESUME_SUFFIX
+    with open(part_path, 'wb') as f:
+        f.write(b'x' * 20)
+    assert partial_size(part_path) == 20
+
+    segments = [[0, 9, 0], [10, 19, 0]]
+    save_segment_progress(meta_path, 'http://u', 20, '"e"', segments, [4, 6])
+    assert segments == [[0, 9, 4], [10, 19, 6]]
+    assert load_resume_info(meta_path) == {'url': 'http://u', 'size': 20, 'etag': '"e"', 'segments': segments}
+    assert partial_size(part_path) == 10
+
+    save_resume_info(meta_path, 'http://u', 20, None)
+    assert partial_size(part_path) == 20
+    assert partial_size(str(tmp_path / 'missing.part')) == 0
@@ -0,0 +1,172 @@
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Headers dari skrip asli, dikirim di setiap request (halaman maupun file)
+HEADERS = {
+    'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
+    'accept-language': 'en-US,en;q=0.5',
+    'referer': 'https://fitgirl-repacks.site/',
+    'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36',
+}
+
+FILE_HEADERS = {'accept-encoding': 'identity'} # Body file mentah, agar bisa dibaca langsung dengan readinto
+
+DEFAULT_TIMEOUT = (10, 30) # (connect, read) dalam detik
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0 # Detik, dikali 2 setiap percobaan ulang
+BACKOFF_MAX = 30.0
+PER_HOST_LIMIT = 16 # Koneksi bersamaan maksimal per host
+POOL_SIZE = 32
+
+
+class RangeNotSupported(requests.exceptions.RequestException):
+    """Server mengabaikan header Range."""
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Detik menunggu sebelum percobaan ulang ke-`attempt` (mulai 0). Retry-After dari server diutamakan,
+       selain itu exponential backoff + jitter, maksimal BACKOFF_MAX.
+    """
+    try:
+        delay = float(retry_after)
+    except (TypeError, ValueError):
+        delay = BACKOFF_BASE * (2 ** attempt) + random.uniform(0, BACKOFF_BASE)
+    return min(delay, BACKOFF_MAX)
+
+
+class RequestStats:
+    """Penghitung request HTTP (jumlah, retry, gagal, latensi), dipakai HttpTransport dan engine asyncio."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {'requests': 0, 'responses': 0, 'retries': 0, 'failures': 0, 'latency_total': 0.0}
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.counters[name] += value
+
+    def summary(self):
+        """Ringkasan penghitung: jumlah request, retry, gagal dan rata-rata latensi (ms)."""
+        with self.lock:
+            counters = dict(self.counters)
+        responses = counters.pop('responses')
+        latency_total = counters.pop('latency_total')
+        counters['avg_latency_ms'] = (latency_total / responses) * 1000 if responses > 0 else 0.0
+        return counters
+
+
+def raise_for_status(response):
+    """Seperti response.raise_for_status(), tapi menutup respons stream dulu agar koneksinya dilepas."""
+    if response.status_code >= 400:
+        response.close()
+        response.raise_for_status()
+
+
+class HttpTransport:
+    """Satu lapisan HTTP untuk semua request: session dengan koneksi keep-alive,
+       headers yang sama, retry dengan exponential backoff + jitter, dan batas koneksi per host.
+    """
+    def __init__(self, per_host_limit=PER_HOST_LIMIT, max_retries=MAX_RETRIES, timeout=DEFAULT_TIMEOUT):
+        self.per_host_limit = per_host_limit
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.lock = threading.Lock()
+        self.host_slots = {} # host -> Semaphore
+        self.request_stats = RequestStats()
+
+    def _host_slot(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            if host not in self.host_slots:
+                self.host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self.host_slots[host]
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url, **kwargs):
+        kwargs.setdefault('allow_redirects', True)
+        return self.request('HEAD', url, **kwargs)
+
+    def request(self, method, url, headers=None, stream=False, timeout=None, metrics=None, **kwargs):
+        """Mengirim request dengan retry untuk 429/5xx dan koneksi yang terputus.
+           Untuk `stream=True`, slot host baru dilepas saat respons ditutup, jadi pemanggil
+           harus selalu memanggil `response.close()`. Retry juga dihitung di `metrics` (JobMetrics) jika ada.
+        """
+        slot = self._host_slot(url)
+        timeout = timeout or self.timeout
+        attempt = 0
+        while True:
+            slot.acquire()
+            started = time.time()
+            try:
+                response = self.session.request(method, url, headers=headers, stream=stream,
+                                                timeout=timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                slot.release()
+                self.request_stats.count('requests')
+                if attempt >= self.max_retries:
+                    self.request_stats.count('failures')
+                    raise
+                self._backoff(attempt, None, metrics)
+                attempt += 1
+                continue
+
+            self.request_stats.count('requests')
+            self.request_stats.count('responses')
+            self.request_stats.count('latency_total', time.time() - started)
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                retry_after = response.headers.get('retry-after')
+                response.close()
+                slot.release()
+                self._backoff(attempt, retry_after, metrics)
+                attempt += 1
+                continue
+
+            if response.status_code >= 400:
+                self.request_stats.count('failures')
+
+            if stream:
+                self._release_on_close(response, slot)
+            else:
+                slot.release()
+            return response
+
+    def _backoff(self, attempt, retry_after, metrics=None):
+        """Menunggu sebelum percobaan ulang (lihat backoff_delay)."""
+        self.request_stats.count('retries')
+        if metrics:
+            metrics.add_retry()
+        time.sleep(backoff_delay(attempt, retry_after))
+
+    def _release_on_close(self, response, slot):
+        """Melepas slot host tepat satu kali saat respons stream ditutup."""
+        original_close = response.close
+        released = []
+
+        def close():
+            try:
+                original_close()
+            finally:
+                if not released:
+                    released.append(True)
+                    slot.release()
+
+        response.close = close
+
+    def stats(self):
+        """Ringkasan penghitung request (lihat RequestStats.summary)."""
+        return self.request_stats.summary()
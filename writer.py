@@ -0,0 +1,203 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import queue
+import sys
+import threading
+import time
+
+import requests
+from urllib3.exceptions import HTTPError as Urllib3Error
+
+READ_SIZE_MIN = 64 * 1024 # Ukuran baca awal, digandakan selama tiap baca terisi penuh
+READ_SIZE_MAX = 1024 * 1024
+WRITE_BEHIND = True # Tulis ke disk di thread terpisah agar baca jaringan tidak menunggu disk
+WRITE_BEHIND_BUFFERS = 4
+FALLOC_FL_KEEP_SIZE = 1 # fallocate(2) Linux: pesan blok disk tanpa mengubah ukuran file
+
+
+def _load_fallocate():
+    """fallocate(2) dari libc (hanya Linux), atau None jika tidak tersedia."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fallocate = libc.fallocate
+    except (OSError, AttributeError):
+        return None
+    fallocate.argtypes = (ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64)
+    fallocate.restype = ctypes.c_int
+    return fallocate
+
+
+_fallocate = _load_fallocate()
+
+
+def preallocate(f, offset, length, keep_size=False):
+    """Memesan `length` byte disk mulai `offset` untuk file yang terbuka, agar file tidak terfragmentasi
+       dan disk penuh (ENOSPC) ketahuan sebelum download, bukan di tengahnya.
+       `keep_size=True` tidak mengubah ukuran file (untuk file yang ditulis dengan append; hanya Linux).
+       Tanpa keep_size, ukuran file menjadi offset + length (posix_fallocate, atau truncate jika tidak ada).
+       Melempar OSError ENOSPC jika ruang tidak cukup; mengembalikan True jika ruang benar-benar dipesan.
+    """
+    if length <= 0:
+        return False
+    f.flush()
+    if keep_size:
+        if _fallocate is None:
+            return False
+        if _fallocate(f.fileno(), FALLOC_FL_KEEP_SIZE, offset, length) == 0:
+            return True
+        error = ctypes.get_errno()
+        if error == errno.ENOSPC:
+            raise OSError(error, os.strerror(error), getattr(f, 'name', None))
+        return False # Filesystem tidak mendukung fallocate
+
+    if hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(f.fileno(), offset, length)
+            return True
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                raise
+    f.truncate(offset + length) # Cadangan: file sparse, tidak memesan blok
+    return False
+
+
+class WriteBehind:
+    """Thread penulis: buffer dari jaringan diantrikan lalu ditulis ke disk di thread lain.
+       Jumlah buffer terbatas, jadi pembaca otomatis menunggu jika disk tertinggal.
+    """
+    def __init__(self, f, counters, index, hasher=None, buffers=WRITE_BEHIND_BUFFERS):
+        self.f = f
+        self.counters = counters
+        self.index = index
+        self.hasher = hasher
+        self.error = None
+        self.free = queue.Queue()
+        for _ in range(buffers):
+            self.free.put(bytearray(READ_SIZE_MAX))
+        self.pending = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def take(self):
+        """Mengambil buffer kosong. Error tulis dari thread penulis dilempar di sini.
+           Mengembalikan (buffer, detik menunggu disk).
+        """
+        try:
+            buffer = self.free.get_nowait()
+            blocked = 0.0
+        except queue.Empty:
+            # Semua buffer masih antre ke disk: pembaca jaringan terblokir oleh disk
+            started = time.perf_counter()
+            buffer = self.free.get()
+            blocked = time.perf_counter() - started
+        if self.error:
+            raise self.error
+        return buffer, blocked
+
+    def submit(self, buffer, size):
+        self.pending.put((buffer, size))
+
+    def _run(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            buffer, size = item
+            if self.error is None:
+                try:
+                    view = memoryview(buffer)[:size]
+                    self.f.write(view)
+                    if self.hasher:
+                        self.hasher.update(view) # Di thread penulis, tidak memperlambat baca jaringan
+                    self.counters[self.index] += size # Dihitung setelah benar-benar ditulis
+                except Exception as e:
+                    self.error = e
+            self.free.put(buffer)
+
+    def close(self):
+        """Menunggu semua buffer tertulis."""
+        self.pending.put(None)
+        self.thread.join()
+        if self.error:
+            raise self.error
+
+
+def copy_to_file(response, f, counters, index, state, limit=None, write_behind=WRITE_BEHIND, hasher=None,
+                 metrics=None, share=None):
+    """Menyalin body respons ke file dengan `readinto` ke buffer yang dipakai ulang.
+       Ukuran baca bertambah dari READ_SIZE_MIN ke READ_SIZE_MAX selama tiap baca terisi penuh.
+       `counters[index]` bertambah setelah data ditulis; berhenti setelah `limit` byte (untuk segmen).
+       Jika `hasher` diberikan, data yang ditulis ikut di-hash tanpa dibaca ulang dari disk.
+       Waktu pembaca menunggu disk ditambahkan ke `metrics` (JobMetrics) jika ada.
+       Jika `share` (ratelimit.Share) diberikan, setiap baca menunggu token dari rate limiter global.
+       Melempar StopIteration jika progress_ticker menandai `state['abort']`.
+    """
+    if response.headers.get('content-encoding', 'identity') != 'identity':
+        # Body terkompresi: biarkan requests yang men-decode
+        for data in response.iter_content(READ_SIZE_MAX):
+            if state['abort']:
+                raise StopIteration("Download cancelled.")
+            if limit is not None:
+                data = data[:limit]
+                limit -= len(data)
+            if share:
+                share.consume(len(data))
+            f.write(data)
+            if hasher:
+                hasher.update(data)
+            counters[index] += len(data)
+            if limit == 0:
+                break
+        return
+
+    raw = response.raw
+    read_size = READ_SIZE_MIN
+    writer = WriteBehind(f, counters, index, hasher) if write_behind else None
+    buffer = None if writer else bytearray(READ_SIZE_MAX)
+    blocked_total = 0.0
+    try:
+        while limit is None or limit > 0:
+            if state['abort']:
+                raise StopIteration("Download cancelled.")
+            if writer:
+                buffer, blocked = writer.take()
+                blocked_total += blocked
+            wanted = read_size if limit is None else min(read_size, limit)
+            if share:
+                wanted = share.acquire(wanted)
+            try:
+                size = raw.readinto(memoryview(buffer)[:wanted])
+            except (Urllib3Error, OSError) as e:
+                raise requests.exceptions.ConnectionError(e) # Samakan dengan error dari iter_content
+            if share and size < wanted:
+                share.refund(wanted - size)
+            if not size:
+                if writer:
+                    writer.free.put(buffer)
+                break
+
+            if writer:
+                writer.submit(buffer, size)
+            else:
+                view = memoryview(buffer)[:size]
+                started = time.perf_counter()
+                f.write(view)
+                blocked_total += time.perf_counter() - started
+                if hasher:
+                    hasher.update(view)
+                counters[index] += size
+            if limit is not None:
+                limit -= size
+            if size == wanted and read_size < READ_SIZE_MAX:
+                read_size *= 2
+    finally:
+        if writer:
+            started = time.perf_counter()
+            writer.close()
+            blocked_total += time.perf_counter() - started
+        if metrics:
+            metrics.add_write_blocked(blocked_total)